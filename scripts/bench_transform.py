@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Benchmark the transform pipeline on synthetic data.
+
+For each size, generates a synthetic benchmark_final_25 directory and
+times the load, transform, aggregate and serialize stages of both
+transform scripts with codeblue_data.instrument (wall/CPU time, peak
+traced memory and rollout read counters).
+
+Usage:
+    python scripts/bench_transform.py --sizes 10,50,200 --report bench.json
+"""
+
+import argparse
+import json
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+import transform_final25
+import transform_to_benchmark_format
+from codeblue_data.columns import RolloutColumns
+from codeblue_data.encoding import encode
+from codeblue_data.ingest import ingest, load_results, load_task_records, set_benchmark_dir
+from codeblue_data.instrument import Instrumentation
+from codeblue_data.synthetic import generate
+
+STAGES = ("load", "transform", "aggregate", "serialize")
+
+
+def run_size(root, jobs):
+    """Run every stage against the data under root."""
+    set_benchmark_dir(root)
+    instr = Instrumentation(trace_memory=True)
+
+    with instr.stage("load"):
+        results = load_results()
+        task_records = load_task_records()
+        ingested = ingest(results, jobs=jobs)
+
+    with instr.stage("transform"):
+        f25_tasks = transform_final25.load_tasks(task_records)
+        f25_models = transform_final25.transform_models(results, ingested)
+        bench_tasks = transform_to_benchmark_format.load_tasks(task_records)
+        bench_models = transform_to_benchmark_format.build_models(results, bench_tasks, ingested)
+
+    with instr.stage("aggregate"):
+        columns = RolloutColumns.from_models(f25_models, f25_tasks)
+        final25 = {
+            "models": f25_models,
+            "tasks": f25_tasks,
+            "templateStats": transform_final25.compute_template_stats(f25_tasks, f25_models, columns),
+            "anomalies": transform_final25.compute_anomalies(f25_models),
+            "aggregates": transform_final25.compute_aggregates(
+                f25_models, f25_tasks,
+                RolloutColumns.from_ingested([m["model"] for m in f25_models],
+                                             [t["id"] for t in f25_tasks], ingested)),
+        }
+        transform_final25.compute_task_performance(f25_models, f25_tasks, columns)
+        benchmark = {
+            "models": bench_models,
+            "aggregates": transform_to_benchmark_format.compute_aggregates(bench_models),
+        }
+
+    with instr.stage("serialize"):
+        output_bytes = len(encode(final25)) + len(encode(benchmark))
+
+    input_bytes = sum(p.stat().st_size for p in Path(root).rglob("*.json*") if p.is_file())
+    return {
+        "stages": {s.pop("stage"): s for s in instr.stages},
+        "total_seconds": round(sum(s["wall_seconds"] for s in instr.stages), 4),
+        "input_bytes": input_bytes,
+        "output_bytes": output_bytes,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the transform pipeline on synthetic data.")
+    parser.add_argument("--sizes", default="5,20,50",
+                        help="comma-separated model counts to benchmark (default: 5,20,50)")
+    parser.add_argument("--rollouts-per-task", type=int, default=5)
+    parser.add_argument("--noise-tasks", type=int, default=20,
+                        help="non-benchmark task ids per log")
+    parser.add_argument("--prompt-chars", type=int, default=400)
+    parser.add_argument("--turns", type=int, default=4)
+    parser.add_argument("--turn-chars", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--jobs", "-j", type=int, default=1)
+    parser.add_argument("--data-dir",
+                        help="keep generated data under this directory instead of a temp dir")
+    parser.add_argument("--report", help="write the JSON report to this file")
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(",")]
+    params = {
+        "rollouts_per_task": args.rollouts_per_task,
+        "noise_tasks": args.noise_tasks,
+        "prompt_chars": args.prompt_chars,
+        "turns": args.turns,
+        "turn_chars": args.turn_chars,
+        "seed": args.seed,
+    }
+
+    tracemalloc.start()
+    runs = []
+    with tempfile.TemporaryDirectory() as tmp:
+        base = Path(args.data_dir or tmp)
+        for models in sizes:
+            root = base / f"models-{models}"
+            print(f"Generating {models} models under {root}...")
+            tracemalloc.stop()
+            generate(root, models=models, **params)
+            tracemalloc.start()
+
+            run = run_size(root, args.jobs)
+            run["models"] = models
+            runs.append(run)
+
+            stage_text = ", ".join(
+                f"{name} {run['stages'][name]['wall_seconds']:.3f}s/{run['stages'][name]['traced_peak_mb']:.1f}MB"
+                for name in STAGES)
+            print(f"  {models} models: {run['total_seconds']:.3f}s total ({stage_text})")
+
+    report = {"params": dict(params, jobs=args.jobs), "runs": runs}
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Wrote report to {args.report}")
+
+
+if __name__ == "__main__":
+    main()
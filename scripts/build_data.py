@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Build final25-data.json and benchmark-data.json from one ingestion pass.
+
+Every rollout log under benchmark_final_25 is read once and both outputs
+are generated from the same in-memory records, for every suite selected
+with --suite (see scripts/suites.json).
+
+With --watch the outputs are kept up to date while an eval sweep is still
+appending to the logs: only the new bytes of each log are parsed, only the
+models whose samples changed are re-transformed, and only the trajectory
+shards whose content changed are rewritten.
+
+Outputs:
+- src/data/final25-data.json
+- src/data/benchmark-data.json
+"""
+
+import time
+from datetime import datetime
+
+import transform_final25
+import transform_to_benchmark_format
+from codeblue_data.cli import (
+    apply_benchmark_dir, apply_strict, cache_from_args, instrumentation_from_args, make_parser,
+    print_cache_stats, print_malformed_stats, print_rescore_stats, rescorer_from_args, suites_from_args,
+)
+from codeblue_data.ingest import ingest_suites, load_results, load_task_records
+from codeblue_data.instrument import Instrumentation, profiled
+from codeblue_data.rescore import rescore_ingested
+from codeblue_data.watch import RolloutWatcher
+
+
+class SuiteBuild:
+    """Per-model outputs of one suite, kept between watch-mode rebuilds."""
+
+    def __init__(self, suite, task_records):
+        self.suite = suite
+        self.final25_tasks = transform_final25.load_tasks(task_records, suite)
+        self.benchmark_tasks = transform_to_benchmark_format.load_tasks(task_records)
+        self.final25_models = {}
+        # model key -> (first example id, benchmark entry)
+        self.benchmark_models = {}
+        self.shards = {}
+
+    def rebuild(self, results, ingested, changed, results_changed, compact):
+        """Re-transform the changed models and rewrite the suite's outputs."""
+        suite = self.suite
+        results = suite.select(results)
+        instr = Instrumentation()
+
+        models = []
+        for r in results:
+            key = r["model"]
+            if results_changed or key in changed or key not in self.final25_models:
+                self.final25_models[key] = transform_final25.transform_model(r, ingested[key], suite)
+            models.append(self.final25_models[key])
+        final25 = transform_final25.build_payload(models, results, self.final25_tasks, ingested, instr)
+        transform_final25.write_output(final25, compact, suite)
+
+        # Example ids run across models, so a later model is renumbered
+        # whenever an earlier one gains examples
+        models = []
+        example_id = 1
+        for r in results:
+            key = r["model"]
+            cached = self.benchmark_models.get(key)
+            if key in changed or cached is None or cached[0] != example_id:
+                cached = (example_id, transform_to_benchmark_format.build_model(
+                    key, ingested[key], self.benchmark_tasks, example_id))
+                self.benchmark_models[key] = cached
+            example_id += len(cached[1]["examples"])
+            models.append(cached[1])
+        benchmark = transform_to_benchmark_format.build_payload(
+            transform_to_benchmark_format.rank_models(models), instr)
+
+        _, shards = transform_to_benchmark_format.split_transcripts(benchmark)
+        only = {slug for slug, shard in shards.items() if self.shards.get(slug) != shard}
+        transform_to_benchmark_format.write_output(benchmark, compact, suite, only)
+        self.shards = shards
+
+
+def watch(suites, compact=False, interval=2.0, rescorer=None):
+    """
+    Rebuild the outputs of every suite as rollout logs grow, until interrupted.
+
+    With a rescorer the samples are regraded before every rebuild; answers
+    already graded are served from its memo.
+    """
+    watcher = RolloutWatcher(suites)
+    task_records = load_task_records()
+    builds = [SuiteBuild(suite, task_records) for suite in suites]
+
+    print(f"Watching rollout logs every {interval:g}s (Ctrl+C to stop)...")
+    try:
+        while True:
+            results_changed, changed = watcher.poll()
+            if results_changed or changed:
+                stamp = datetime.now().strftime("%H:%M:%S")
+                names = ", ".join(sorted(changed)) if changed else "none"
+                print(f"\n[{stamp}] {len(watcher.results)} models, changed: {names}")
+                ingested = watcher.ingested()
+                if rescorer is not None:
+                    rescore_ingested(ingested, rescorer)
+                for build in builds:
+                    build.rebuild(watcher.results, ingested[build.suite.name], changed,
+                                  results_changed, compact)
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        print("\nStopped watching.")
+        print_malformed_stats()
+
+
+def main():
+    parser = make_parser("Build final25-data.json and benchmark-data.json in one pass.")
+    parser.add_argument("--watch", action="store_true",
+                        help="keep running and rebuild as rollout logs are appended to")
+    parser.add_argument("--interval", type=float, default=2.0,
+                        help="seconds between polls in --watch mode (default: 2)")
+    args = parser.parse_args()
+    apply_benchmark_dir(args)
+    apply_strict(args)
+    if args.watch and args.snapshot:
+        parser.error("--snapshot records finished builds and cannot be combined with --watch")
+    suites = suites_from_args(args)
+    if args.watch:
+        watch(suites, args.compact, args.interval, rescorer_from_args(args, load_task_records()))
+        return
+
+    cache = cache_from_args(args)
+    instr = instrumentation_from_args(args)
+
+    with profiled(args.profile):
+        print("Loading source data...")
+        with instr.stage("load_results"):
+            results = load_results()
+        with instr.stage("load_tasks"):
+            task_records = load_task_records()
+
+        print(f"Found {len(results)} models, {len(task_records)} tasks")
+
+        print("Ingesting rollouts...")
+        with instr.stage("ingest"):
+            ingested = ingest_suites(results, suites, cache, args.jobs)
+        print_cache_stats(cache)
+        print_malformed_stats()
+
+        rescorer = rescorer_from_args(args, task_records)
+        if rescorer is not None:
+            with instr.stage("rescore"):
+                rescore_ingested(ingested, rescorer)
+            print_rescore_stats(rescorer)
+
+        outputs = []
+        for suite in suites:
+            if len(suites) > 1:
+                print(f"\nSuite {suite.name}:")
+            suite_results = suite.select(results)
+
+            final25 = transform_final25.build_output(
+                suite_results, transform_final25.load_tasks(task_records, suite),
+                ingested[suite.name], instr, suite)
+            with instr.stage("dump_final25"):
+                transform_final25.write_output(final25, args.compact, suite)
+            if args.snapshot:
+                with instr.stage("snapshot"):
+                    transform_final25.record_snapshot(final25, ingested[suite.name], args.snapshot,
+                                                      args.compact, suite)
+
+            benchmark = transform_to_benchmark_format.build_output(
+                suite_results, transform_to_benchmark_format.load_tasks(task_records),
+                ingested[suite.name], instr, suite)
+            with instr.stage("dump_benchmark"):
+                transform_to_benchmark_format.write_output(benchmark, args.compact, suite)
+
+            outputs.append((suite, final25, benchmark))
+
+    print("Done!")
+    for suite, final25, benchmark in outputs:
+        if len(suites) > 1:
+            print(f"\nSuite {suite.name}:")
+        transform_final25.print_summary(final25)
+        transform_to_benchmark_format.print_summary(benchmark)
+    if args.report:
+        instr.write_report(args.report)
+
+
+if __name__ == "__main__":
+    main()
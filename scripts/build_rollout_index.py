@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Write byte-offset sidecar indexes for benchmark_final_25 rollout logs.
+
+For every model in final_25_results.json, indexes:
+- benchmark_final_25/bank_rescored_c1/<model>.jsonl
+- benchmark_final_25/eval_logs/codeblue_env--<model>/results.jsonl
+
+Each log gets a <name>.idx.json sidecar next to it. The transform scripts
+use a fresh sidecar automatically; a stale one is ignored until rebuilt.
+Compressed (.gz/.zst) logs are skipped: offsets need an uncompressed file.
+"""
+
+import argparse
+
+from codeblue_data.cli import (
+    add_benchmark_dir_argument, add_strict_argument, apply_benchmark_dir, apply_strict, print_malformed_stats,
+)
+from codeblue_data.compressed import is_compressed
+from codeblue_data.ingest import bank_path, load_results, road_path
+from codeblue_data.offsets import build_offsets, load_offsets
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Index rollout logs by task and byte offset.")
+    add_benchmark_dir_argument(parser)
+    add_strict_argument(parser)
+    parser.add_argument("--force", action="store_true",
+                        help="rebuild indexes that are already fresh")
+    args = parser.parse_args()
+    apply_benchmark_dir(args)
+    apply_strict(args)
+
+    built = fresh = compressed = 0
+    for r in load_results():
+        for filepath in (bank_path(r["model"]), road_path(r["model"])):
+            if not filepath.exists():
+                continue
+            if is_compressed(filepath):
+                compressed += 1
+                continue
+            if not args.force and load_offsets(filepath) is not None:
+                fresh += 1
+                continue
+            index = build_offsets(filepath)
+            built += 1
+            records = sum(len(v) for v in index["tasks"].values())
+            print(f"  {filepath.name}: {records} records, {len(index['tasks'])} tasks")
+
+    print_malformed_stats()
+    print(f"Done! {built} indexed, {fresh} already fresh, {compressed} compressed (skipped)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+"""
+Shared data layer for the CodeBlue transform scripts.
+
+The transform scripts in ``scripts/`` import from this package so that
+rollout logs are read through one code path. ``codeblue_data.dataset``
+exposes the same data to notebooks as a lazily loaded ``Benchmark``.
+"""
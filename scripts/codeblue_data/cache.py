@@ -0,0 +1,127 @@
+"""
+Persistent build cache for ingested rollout samples.
+
+One entry is kept per source rollout file and set of sampling parameters,
+validated against the file's size, mtime and content hash. A rebuild only
+rescans files whose fingerprint changed; everything else is merged back
+from the cache.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+CACHE_DIR = Path(__file__).parent.parent.parent / ".cache" / "ingest"
+
+# Bump when the cached entry layout changes
+CACHE_VERSION = 4
+
+HASH_CHUNK = 1 << 20
+
+
+def file_hash(filepath):
+    """SHA-256 of a file's contents, read in chunks."""
+    h = hashlib.sha256()
+    with open(filepath, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def fingerprint(filepath, content_hash=None):
+    """Size, mtime and content hash of a source file."""
+    st = os.stat(filepath)
+    return {
+        "size": st.st_size,
+        "mtime_ns": st.st_mtime_ns,
+        "sha256": content_hash or file_hash(filepath),
+    }
+
+
+class BuildCache:
+    """Per-source-file cache of sampled rollouts stored as JSON entries."""
+
+    def __init__(self, cache_dir=CACHE_DIR):
+        self.cache_dir = Path(cache_dir)
+        self.hits = 0
+        self.misses = 0
+
+    def _entry_path(self, filepath, params):
+        key = json.dumps([str(Path(filepath).resolve()), params], sort_keys=True)
+        return self.cache_dir / f"{hashlib.sha1(key.encode()).hexdigest()}.json"
+
+    def _load_entry(self, filepath, params):
+        try:
+            with open(self._entry_path(filepath, params)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _store_entry(self, filepath, entry):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self._entry_path(filepath, entry["params"])
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, "w") as f:
+            json.dump(entry, f)
+        os.replace(tmp, path)
+
+    def lookup(self, filepath, params):
+        """
+        Return cached records for filepath, or None if the entry is stale.
+
+        A matching size and mtime is trusted as-is. If only the mtime moved,
+        the content hash decides, and a match refreshes the stored mtime.
+        """
+        entry = self._load_entry(filepath, params)
+        if not entry or entry.get("version") != CACHE_VERSION or entry.get("params") != params:
+            return None
+
+        st = os.stat(filepath)
+        cached = entry["fingerprint"]
+        if cached["size"] != st.st_size:
+            return None
+        if cached["mtime_ns"] != st.st_mtime_ns:
+            if file_hash(filepath) != cached["sha256"]:
+                return None
+            cached["mtime_ns"] = st.st_mtime_ns
+            self._store_entry(filepath, entry)
+        return entry["records"]
+
+    def store(self, filepath, params, records, fp=None):
+        """Store freshly read records for filepath."""
+        self._store_entry(filepath, {
+            "version": CACHE_VERSION,
+            "params": params,
+            "fingerprint": fp or fingerprint(filepath),
+            "records": records,
+        })
+
+    def fetch(self, filepath, params, read):
+        """Return cached records for filepath, calling read() on a miss."""
+        return self.fetch_many(filepath, [params], lambda missing: [read()])[0]
+
+    def fetch_many(self, filepath, params_list, read):
+        """
+        Cached records for each params in params_list.
+
+        On any miss, read(missing_params) is called once with every params
+        that was not cached and must return one list of records for each.
+        """
+        sampled = [self.lookup(filepath, params) for params in params_list]
+        missing = [params for params, records in zip(params_list, sampled) if records is None]
+        self.hits += len(params_list) - len(missing)
+        if not missing:
+            return sampled
+
+        self.misses += len(missing)
+        before = os.stat(filepath)
+        fresh = read(missing)
+        fp = fingerprint(filepath)
+        # Skip storing if the file changed while it was being read
+        if (fp["size"], fp["mtime_ns"]) == (before.st_size, before.st_mtime_ns):
+            for params, records in zip(missing, fresh):
+                self.store(filepath, params, records, fp)
+
+        fresh = iter(fresh)
+        return [records if records is not None else next(fresh) for records in sampled]
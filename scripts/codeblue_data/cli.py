@@ -0,0 +1,129 @@
+"""Command-line options shared by the transform scripts."""
+
+import argparse
+import sys
+
+from .cache import CACHE_DIR, BuildCache
+from .ingest import set_benchmark_dir
+from .instrument import Instrumentation
+from .records import MALFORMED, set_strict
+from .rescore import VERDICTS, Rescorer
+from .snapshots import SNAPSHOT_DIR
+from .store import STORE_FILE, RolloutStore
+from .suites import MANIFEST_FILE, load_suites
+
+
+def add_benchmark_dir_argument(parser):
+    """Add --benchmark-dir to parser."""
+    parser.add_argument("--benchmark-dir",
+                        help="benchmark_final_25 directory to read "
+                             "(default: $CODEBLUE_BENCHMARK_DIR or ../benchmark_final_25)")
+
+
+def add_strict_argument(parser):
+    """Add --strict to parser."""
+    parser.add_argument("--strict", action="store_true",
+                        help="stop at the first malformed rollout record instead of skipping it")
+
+
+def apply_benchmark_dir(args):
+    """Point the loaders at --benchmark-dir if it was given."""
+    if args.benchmark_dir:
+        set_benchmark_dir(args.benchmark_dir)
+
+
+def apply_strict(args):
+    """Make malformed rollout records fatal if --strict was given."""
+    set_strict(args.strict)
+
+
+def make_parser(description):
+    """Argument parser with the shared ingestion options."""
+    parser = argparse.ArgumentParser(description=description)
+    add_benchmark_dir_argument(parser)
+    add_strict_argument(parser)
+    parser.add_argument("--manifest", default=str(MANIFEST_FILE),
+                        help=f"suite manifest to read (default: {MANIFEST_FILE})")
+    parser.add_argument("--suite", action="append",
+                        help="suite to build; repeat to build several from one ingestion pass "
+                             "(default: the manifest's default suite)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="ignore the build cache and rescan every rollout log")
+    parser.add_argument("--cache-dir", default=str(CACHE_DIR),
+                        help=f"build cache location (default: {CACHE_DIR})")
+    parser.add_argument("--store", nargs="?", const=str(STORE_FILE),
+                        help="load rollout logs into a SQLite store and sample from it instead of "
+                             f"using the build cache (default path: {STORE_FILE})")
+    parser.add_argument("--rescore", action="store_true",
+                        help="regrade score_correctness of the sampled rollouts against the tasks' "
+                             "golden values instead of using the logged scores")
+    parser.add_argument("--snapshot", nargs="?", const=str(SNAPSHOT_DIR),
+                        help="record a snapshot of each built final25 payload for run-to-run diffs "
+                             f"(see scripts/compare_runs.py; default dir: {SNAPSHOT_DIR})")
+    parser.add_argument("--jobs", "-j", type=int, default=1,
+                        help="load models on N worker processes (default: 1)")
+    parser.add_argument("--compact", action="store_true",
+                        help="write minified JSON with .gz/.br siblings")
+    parser.add_argument("--report",
+                        help="write a per-stage timing/memory report as JSON to this file")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="record tracemalloc peaks per stage (slower)")
+    parser.add_argument("--profile",
+                        help="profile the run to this file (.html uses pyinstrument if installed, "
+                             "otherwise cProfile stats)")
+    return parser
+
+
+def parse_args(description):
+    """Parse the shared options and apply --benchmark-dir and --strict."""
+    args = make_parser(description).parse_args()
+    apply_benchmark_dir(args)
+    apply_strict(args)
+    return args
+
+
+def suites_from_args(args):
+    """Suites selected by the parsed arguments; exits on an unknown suite."""
+    try:
+        return load_suites(args.suite, args.manifest)
+    except (OSError, ValueError) as e:
+        sys.exit(f"error: {e}")
+
+
+def cache_from_args(args):
+    """RolloutStore or BuildCache selected by the parsed arguments, or None."""
+    if args.store:
+        return RolloutStore(args.store)
+    if args.no_cache:
+        return None
+    return BuildCache(args.cache_dir)
+
+
+def rescorer_from_args(args, task_records):
+    """Rescorer for the tasks if --rescore was given, else None."""
+    return Rescorer(task_records) if args.rescore else None
+
+
+def instrumentation_from_args(args):
+    """Instrumentation configured by the parsed arguments."""
+    return Instrumentation(trace_memory=args.trace_memory)
+
+
+def print_cache_stats(cache):
+    """Report how many rollout logs were reused from the cache."""
+    if cache is not None:
+        print(f"Cache: {cache.hits} reused, {cache.misses} rescanned")
+
+
+def print_malformed_stats(file=None):
+    """Report the malformed rollout records skipped in each log."""
+    for path, count in sorted(MALFORMED.items()):
+        print(f"Skipped {count} malformed record{'s' if count != 1 else ''} in {path}", file=file)
+
+
+def print_rescore_stats(rescorer):
+    """Report how the rescored rollouts were graded."""
+    if rescorer is not None:
+        counts = ", ".join(f"{rescorer.verdicts[v]} {v.replace('_', ' ')}" for v in VERDICTS)
+        print(f"Rescored {sum(rescorer.verdicts.values())} rollouts: {counts} "
+              f"({rescorer.misses} distinct answers graded)")
@@ -0,0 +1,166 @@
+"""
+Columnar store of rollout scores.
+
+Rollouts are held as parallel ``array`` columns (model index, task index,
+correctness, efficiency, reward) instead of lists of dicts. Per-task,
+per-template and per-level aggregates are then single-pass group-bys over
+the columns, linear in the number of rollouts rather than
+tasks x models x rollouts. With NumPy installed each group-by is one
+``np.bincount`` over the combined (model, task, outcome) index of every
+row; otherwise an equivalent pure-Python loop runs.
+"""
+
+from array import array
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Correctness thresholds shared by every aggregate
+CORRECT_THRESHOLD = 0.80
+PARTIAL_THRESHOLD = 0.20
+
+# Outcome codes
+WRONG, PARTIAL, CORRECT = 0, 1, 2
+
+
+def outcome(score):
+    """Outcome code for a correctness score."""
+    if score >= CORRECT_THRESHOLD:
+        return CORRECT
+    if score >= PARTIAL_THRESHOLD:
+        return PARTIAL
+    return WRONG
+
+
+class RolloutColumns:
+    """Parallel score columns for the rollouts of many models."""
+
+    def __init__(self, model_keys, task_ids):
+        self.model_keys = list(model_keys)
+        self.task_ids = list(task_ids)
+        self.model_pos = {key: i for i, key in enumerate(self.model_keys)}
+        self.task_pos = {task_id: i for i, task_id in enumerate(self.task_ids)}
+
+        self.model = array("l")
+        self.task = array("l")
+        self.correctness = array("d")
+        self.efficiency = array("d")
+        self.reward = array("d")
+        self.outcome = array("b")
+
+    def __len__(self):
+        return len(self.model)
+
+    def append(self, model_i, task_i, correctness, efficiency=0, reward=0):
+        """Add one rollout row."""
+        self.model.append(model_i)
+        self.task.append(task_i)
+        self.correctness.append(correctness)
+        self.efficiency.append(efficiency)
+        self.reward.append(reward)
+        self.outcome.append(outcome(correctness))
+
+    @classmethod
+    def from_models(cls, models, tasks):
+        """Build columns from transformed models; unknown task ids are dropped."""
+        columns = cls((m["model"] for m in models), (t["id"] for t in tasks))
+        for model_i, model in enumerate(models):
+            for r in model["rollouts"]:
+                task_i = columns.task_pos.get(r["task_id"])
+                if task_i is None:
+                    continue
+                columns.append(model_i, task_i, r["score_correctness"],
+                               r.get("score_efficiency", 0), r.get("reward", 0))
+        return columns
+
+    @classmethod
+    def from_ingested(cls, model_keys, task_ids, ingested):
+        """Build columns from every ingested bank and road record of each model."""
+        columns = cls(model_keys, task_ids)
+        for model_i, key in enumerate(columns.model_keys):
+            rollouts = ingested.get(key, {})
+            for record in rollouts.get("bank", []) + rollouts.get("road", []):
+                task_i = columns.task_pos.get(record["info"].get("task_id"))
+                if task_i is None:
+                    continue
+                columns.append(model_i, task_i, record.get("score_correctness", 0),
+                               record.get("score_efficiency", 0), record.get("reward", 0))
+        return columns
+
+    def success_counts(self):
+        """
+        Correct and total rollouts per (model, task).
+
+        Returns ``(correct, total)``, each a list per model of per-task
+        counts, the layout codeblue_data.confidence works on.
+        """
+        n_tasks = len(self.task_ids)
+        if np is not None:
+            n_cells = len(self.model_keys) * n_tasks
+            cell = self._index(self.model) * n_tasks + self._index(self.task)
+            correct = np.bincount(cell[self._index(self.outcome) == CORRECT], minlength=n_cells)
+            total = np.bincount(cell, minlength=n_cells)
+            shape = (len(self.model_keys), n_tasks)
+            return correct.reshape(shape).tolist(), total.reshape(shape).tolist()
+
+        correct = [[0] * n_tasks for _ in self.model_keys]
+        total = [[0] * n_tasks for _ in self.model_keys]
+        for model_i, task_i, code in zip(self.model, self.task, self.outcome):
+            total[model_i][task_i] += 1
+            if code == CORRECT:
+                correct[model_i][task_i] += 1
+        return correct, total
+
+    def task_model_counts(self):
+        """
+        Outcome counts per (task, model) cell.
+
+        Returns a flat list indexed by ``task_i * n_models + model_i`` whose
+        entries are ``[wrong, partial, correct]``.
+        """
+        n_models = len(self.model_keys)
+        n_cells = len(self.task_ids) * n_models
+        if np is not None:
+            cell = self._index(self.task) * n_models + self._index(self.model)
+            counts = np.bincount(cell * 3 + self._index(self.outcome), minlength=n_cells * 3)
+            return counts.reshape(n_cells, 3).tolist()
+
+        counts = [[0, 0, 0] for _ in range(n_cells)]
+        for model_i, task_i, code in zip(self.model, self.task, self.outcome):
+            counts[task_i * n_models + model_i][code] += 1
+        return counts
+
+    def group_counts(self, task_groups, model_mask=None):
+        """
+        Outcome counts per task group.
+
+        task_groups maps each task index to a group key (e.g. its template or
+        level). model_mask, if given, is a sequence of booleans per model
+        selecting which models contribute. Returns ``{group: [wrong,
+        partial, correct]}`` with groups in first-seen task order.
+        """
+        counts = {}
+        for group in task_groups:
+            counts.setdefault(group, [0, 0, 0])
+        if np is not None:
+            group_pos = {group: i for i, group in enumerate(counts)}
+            task_group = np.asarray([group_pos[group] for group in task_groups], dtype=np.int64)
+            keep = slice(None)
+            if model_mask is not None:
+                keep = np.asarray(model_mask, dtype=bool)[self._index(self.model)]
+            key = task_group[self._index(self.task)[keep]] * 3 + self._index(self.outcome)[keep]
+            flat = np.bincount(key, minlength=len(counts) * 3).reshape(len(counts), 3).tolist()
+            return dict(zip(counts, flat))
+
+        for model_i, task_i, code in zip(self.model, self.task, self.outcome):
+            if model_mask is not None and not model_mask[model_i]:
+                continue
+            counts[task_groups[task_i]][code] += 1
+        return counts
+
+    @staticmethod
+    def _index(column):
+        """An array column as an int64 NumPy array."""
+        return np.asarray(column, dtype=np.int64)
@@ -0,0 +1,143 @@
+"""
+Transparent reading of compressed rollout logs.
+
+Archived logs may be stored as ``<name>.jsonl.gz`` or ``<name>.jsonl.zst``
+instead of ``<name>.jsonl``. ``find_log`` picks whichever variant exists
+and ``LineReader`` yields its lines either way, so no reader has to
+decompress anything to disk first.
+
+A compressed log is decompressed in ``READ_CHUNK`` pieces on a producer
+thread of its reader while the caller parses the lines of earlier pieces;
+at most ``PREFETCH_CHUNKS`` pieces are held ahead of the parser, so memory
+stays bounded however large the file is. zlib and zstandard release the
+GIL while decompressing, so this overlaps with JSON parsing. Only files
+that are read at the same time decompress concurrently: the serial
+ingestion path reads one log after another, and ``--jobs N`` spreads logs
+over processes.
+
+``.zst`` needs the ``zstandard`` package; ``.gz`` only needs the standard
+library. Byte positions reported for compressed logs are offsets into the
+decompressed stream.
+"""
+
+import gzip
+import queue
+import threading
+from pathlib import Path
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+COMPRESSED_SUFFIXES = (".gz", ".zst")
+
+READ_CHUNK = 1 << 20
+PREFETCH_CHUNKS = 8
+
+
+def is_compressed(filepath):
+    """Whether filepath names a compressed log."""
+    return Path(filepath).suffix in COMPRESSED_SUFFIXES
+
+
+def find_log(filepath):
+    """filepath if it exists, else its first existing compressed variant, else filepath."""
+    filepath = Path(filepath)
+    if filepath.exists():
+        return filepath
+    for suffix in COMPRESSED_SUFFIXES:
+        candidate = filepath.with_name(filepath.name + suffix)
+        if candidate.exists():
+            return candidate
+    return filepath
+
+
+def open_log(filepath):
+    """Binary stream of a log's decompressed contents."""
+    filepath = Path(filepath)
+    if filepath.suffix == ".gz":
+        return gzip.open(filepath, "rb")
+    if filepath.suffix == ".zst":
+        if zstandard is None:
+            raise ImportError(f"reading {filepath} needs the zstandard package (pip install zstandard)")
+        return zstandard.ZstdDecompressor().stream_reader(open(filepath, "rb"), closefd=True)
+    return open(filepath, "rb")
+
+
+class LineReader:
+    """
+    Lines of a rollout log, as bytes with their newline.
+
+    Use as a context manager, or exhaust it, so that a compressed log's
+    decompression thread stops when reading stops early. Each reader has
+    its own thread, so any number of readers can be open at once.
+    """
+
+    def __init__(self, filepath):
+        self.filepath = Path(filepath)
+        self._queue = None
+        self._stop = threading.Event()
+        if is_compressed(self.filepath):
+            self._queue = queue.Queue(PREFETCH_CHUNKS)
+            threading.Thread(target=self._produce, name=f"decompress {self.filepath.name}",
+                             daemon=True).start()
+
+    def _put(self, item):
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def _produce(self):
+        try:
+            with open_log(self.filepath) as f:
+                while not self._stop.is_set():
+                    chunk = f.read(READ_CHUNK)
+                    # An empty chunk marks the end
+                    self._put(chunk)
+                    if not chunk:
+                        return
+        except BaseException as e:
+            self._put(e)
+
+    def __iter__(self):
+        if self._queue is None:
+            with open(self.filepath, "rb") as f:
+                yield from f
+            return
+
+        # Pieces of the unfinished last line, joined once its newline arrives
+        pieces = []
+        try:
+            while True:
+                chunk = self._queue.get()
+                if isinstance(chunk, BaseException):
+                    raise chunk
+                if not chunk:
+                    break
+                lines = chunk.split(b"\n")
+                pieces.append(lines[0])
+                if len(lines) == 1:
+                    continue
+                lines[0] = b"".join(pieces)
+                pieces = [lines.pop()]
+                for line in lines:
+                    yield line + b"\n"
+            pending = b"".join(pieces)
+            if pending:
+                yield pending
+        finally:
+            self.close()
+
+    def close(self):
+        """Stop decompressing ahead."""
+        self._stop.set()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
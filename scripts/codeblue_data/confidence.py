@@ -0,0 +1,244 @@
+"""
+Confidence intervals and pairwise significance for accuracy tables.
+
+Leaderboard accuracies come from a few sampled rollouts per task, so every
+rate here comes with two 95% intervals:
+
+- ``wilson``: the Wilson score interval over the rollouts in the cell.
+  It is closed-form and needs nothing beyond the standard library.
+- ``bootstrap``: a two-stage bootstrap that resamples tasks with
+  replacement and then rollouts within each task. This also covers the
+  uncertainty from which tasks happen to be in the suite. The rollout
+  stage draws Binomial(copies x n, p) per (model, task) cell, which is
+  the same as resampling the cell's 0/1 outcomes. Every model shares the
+  same task resamples, so differences between models are paired. The
+  pairwise table reports the bootstrap interval of the accuracy gap and a
+  two-sided bootstrap p-value.
+
+The bootstrap is vectorized with NumPy, in batches of models sized so a
+batch holds at most ``BATCH_DRAWS`` draws, and handles hundreds of models
+x thousands of resamples in seconds. Without NumPy only the Wilson
+intervals are produced, and ``bootstrap``/``pairwise`` are None. The
+pairwise table is quadratic in the number of models, so callers that
+don't show it can skip it.
+"""
+
+import math
+import warnings
+from statistics import NormalDist
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+CONFIDENCE = 0.95
+RESAMPLES = 2000
+SEED = 0
+
+# Upper bound on binomial draws held in memory per batch of models
+BATCH_DRAWS = 1 << 23
+
+
+def wilson_interval(successes, n, confidence=CONFIDENCE):
+    """Wilson score interval for successes out of n, as fractions."""
+    if not n:
+        return (0.0, 0.0)
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    p = successes / n
+    denom = 1 + z * z / n
+    center = (p + z * z / (2 * n)) / denom
+    half = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denom
+    return (max(0.0, center - half), min(1.0, center + half))
+
+
+def bootstrap_rates(correct, total, task_indices, resamples=RESAMPLES, rng=None):
+    """
+    Resampled accuracy per model over the tasks in task_indices.
+
+    correct and total are (models x tasks) arrays of counts. Returns a
+    (models x resamples) float array; resamples in which a model has no
+    rollouts on the drawn tasks are NaN.
+    """
+    if rng is None:
+        rng = np.random.default_rng(SEED)
+    correct = correct[:, task_indices]
+    total = total[:, task_indices]
+    n_models, n_tasks = total.shape
+
+    # Copies of each task per resample, shared by every model
+    weights = rng.multinomial(n_tasks, np.full(n_tasks, 1 / n_tasks), size=resamples)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        p = np.where(total > 0, correct / np.maximum(total, 1), 0.0)
+
+    # Cells that are all right or all wrong need no draws
+    mixed = (p > 0) & (p < 1)
+
+    rates = np.empty((n_models, resamples))
+    batch = max(1, BATCH_DRAWS // max(1, resamples * n_tasks))
+    for start in range(0, n_models, batch):
+        stop = min(start + batch, n_models)
+        # (models, resamples, tasks) rollouts per drawn task copy
+        n = weights[None, :, :] * total[start:stop, None, :]
+        hits = n * (p[start:stop, None, :] == 1)
+        draw = np.broadcast_to(mixed[start:stop, None, :], n.shape) & (n > 0)
+        hits[draw] = rng.binomial(n[draw], np.broadcast_to(p[start:stop, None, :], n.shape)[draw])
+        attempts = n.sum(axis=2)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            rates[start:stop] = np.where(attempts > 0, hits.sum(axis=2) / attempts, np.nan)
+    return rates
+
+
+def _percent(value):
+    return round(100 * float(value), 2)
+
+
+def _interval(values, confidence):
+    """Percentile interval of the finite values, or None if there are none."""
+    values = values[np.isfinite(values)]
+    if not len(values):
+        return None
+    tail = 100 * (1 - confidence) / 2
+    low, high = np.percentile(values, [tail, 100 - tail])
+    return [_percent(low), _percent(high)]
+
+
+def _cell(correct, total, confidence, rates=None):
+    """Accuracy cell: pct, counts and its intervals."""
+    low, high = wilson_interval(correct, total, confidence)
+    return {
+        "pct": _percent(correct / total) if total else 0,
+        "correct": correct,
+        "total": total,
+        "wilson": [_percent(low), _percent(high)],
+        "bootstrap": _interval(rates, confidence) if rates is not None else None,
+    }
+
+
+def pairwise_significance(model_keys, observed, rates, confidence=CONFIDENCE):
+    """
+    Paired bootstrap comparison of every pair of models.
+
+    observed holds each model's accuracy as a fraction and rates is the
+    (models x resamples) output of bootstrap_rates() over the same task
+    resamples. Returns matrices indexed [a][b] of the accuracy gap a - b in
+    percentage points, its interval, and the two-sided p-value.
+    """
+    n_models = len(model_keys)
+    observed = np.asarray(observed, dtype=float)
+    tail = 100 * (1 - confidence) / 2
+    low = np.zeros((n_models, n_models))
+    high = np.zeros((n_models, n_models))
+    p_value = np.ones((n_models, n_models))
+
+    # Only a < b is resampled; the lower triangle mirrors it
+    for a in range(n_models - 1):
+        gaps = rates[a][None, :] - rates[a + 1:]
+        valid = np.isfinite(gaps)
+        counts = valid.sum(axis=1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            below = np.where(counts > 0, (valid & (gaps <= 0)).sum(axis=1) / counts, 1)
+            above = np.where(counts > 0, (valid & (gaps >= 0)).sum(axis=1) / counts, 1)
+
+        bounds = np.percentile(gaps, [tail, 100 - tail], axis=1)
+        # Rows with NaN resamples (a model missing every drawn task) are rare
+        partial = counts < gaps.shape[1]
+        if partial.any():
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", RuntimeWarning)
+                bounds[:, partial] = np.nan_to_num(
+                    np.nanpercentile(gaps[partial], [tail, 100 - tail], axis=1))
+        low[a, a + 1:], high[a, a + 1:] = bounds
+        p_value[a, a + 1:] = np.minimum(1.0, 2 * np.minimum(below, above))
+
+    low, high = low - high.T, high - low.T
+    p_value = np.minimum(p_value, p_value.T)
+    diff = observed[:, None] - observed[None, :]
+
+    return {
+        "models": list(model_keys),
+        "diff": np.round(100 * diff, 2).tolist(),
+        "low": np.round(100 * low, 2).tolist(),
+        "high": np.round(100 * high, 2).tolist(),
+        "pValue": np.round(p_value, 4).tolist(),
+    }
+
+
+def confidence_tables(model_keys, correct, total, groups=None, confidence=CONFIDENCE,
+                      resamples=RESAMPLES, seed=SEED, pairwise=True):
+    """
+    Accuracy with confidence intervals per model, overall and per task group.
+
+    correct and total are per-model lists of per-task counts (models x
+    tasks). groups maps a grouping name (e.g. "domains") to
+    ``{group key: [task index, ...]}``. Returns::
+
+        {
+          "method": {...},
+          "models": {model: {"overall": cell, <grouping>: {key: cell}}},
+          "pairwise": {...} or None,   # only with pairwise=True
+        }
+
+    where each cell is ``{"pct", "correct", "total", "wilson", "bootstrap"}``
+    in percent. Cells a model has no rollouts for are left out. The
+    pairwise table is O(models^2) in size and time; with pairwise=False it
+    is skipped and the "pairwise" key is left out.
+    """
+    groups = groups or {}
+    n_tasks = len(correct[0]) if correct else 0
+    bootstrap = np is not None and n_tasks > 0
+
+    if bootstrap:
+        rng = np.random.default_rng(seed)
+        correct_arr = np.asarray(correct, dtype=np.int64)
+        total_arr = np.asarray(total, dtype=np.int64)
+
+    def table(task_indices):
+        rates = None
+        if bootstrap and task_indices:
+            rates = bootstrap_rates(correct_arr, total_arr, task_indices, resamples, rng)
+        cells = []
+        for model_i in range(len(model_keys)):
+            c = sum(correct[model_i][t] for t in task_indices)
+            n = sum(total[model_i][t] for t in task_indices)
+            cells.append(_cell(c, n, confidence, rates[model_i] if rates is not None else None) if n else None)
+        return cells, rates
+
+    overall, overall_rates = table(list(range(n_tasks)))
+    models = {}
+    for model_i, key in enumerate(model_keys):
+        if overall[model_i] is not None:
+            models[key] = {"overall": overall[model_i]}
+
+    for name, members in groups.items():
+        for group, task_indices in members.items():
+            cells, _ = table(list(task_indices))
+            for model_i, key in enumerate(model_keys):
+                if key in models and cells[model_i] is not None:
+                    models[key].setdefault(name, {})[group] = cells[model_i]
+
+    tables = {
+        "method": {
+            "confidence": confidence,
+            "resamples": resamples if bootstrap else 0,
+            "seed": seed,
+            "bootstrap": "tasks+rollouts" if bootstrap else None,
+        },
+        "models": models,
+    }
+    if pairwise:
+        tables["pairwise"] = None
+        if bootstrap:
+            keep = [i for i, key in enumerate(model_keys) if key in models]
+            observed = [overall[i]["correct"] / overall[i]["total"] for i in keep]
+            tables["pairwise"] = pairwise_significance([model_keys[i] for i in keep], observed,
+                                                       overall_rates[keep], confidence)
+    return tables
+
+
+def task_groups(keys):
+    """``{key: [task index, ...]}`` for a per-task list of group keys, in first-seen order."""
+    groups = {}
+    for task_i, key in enumerate(keys):
+        groups.setdefault(key, []).append(task_i)
+    return groups
@@ -0,0 +1,181 @@
+"""
+Lazy, importable view of a benchmark_final_25 directory.
+
+``Benchmark`` gives scripts and notebooks the same data the transforms
+report on without running them:
+
+    from codeblue_data.dataset import Benchmark
+
+    bench = Benchmark()                      # default suite, default paths
+    bench.models                             # model keys in the suite
+    bench.results["openai--gpt-5"]           # final_25_results.json entry
+    for task in bench.iter_tasks(template="a", level="L4"):
+        ...
+    for model_key, record in bench.iter_rollouts(provider="openai", level="L5"):
+        ...
+
+Nothing is read until it is first used, and results, tasks and sampled
+rollouts are memoized per instance. Iteration is generator-based, and
+filters are pushed down into the readers: model and provider filters
+decide which logs are opened, dataset picks the bank or road log, and
+task, template and level filters narrow the task ids handed to the
+samplers, so records of other tasks are skipped before they are decoded.
+Narrowing the tasks does not change which rollouts a task gets, because
+every sampling policy samples each task independently.
+"""
+
+from pathlib import Path
+
+from . import ingest
+from .columns import RolloutColumns
+from .ingest import bank_path, iter_log, load_results, load_task_records, read_rollouts, road_path
+from .suites import load_suite
+
+DATASETS = ("bank", "road")
+
+
+def _log_path(model_key, dataset, benchmark_dir=None):
+    if dataset == "bank":
+        return bank_path(model_key, benchmark_dir)
+    return road_path(model_key, benchmark_dir)
+
+
+class Benchmark:
+    """Lazily loaded models, tasks and rollouts of one suite."""
+
+    def __init__(self, benchmark_dir=None, suite=None, cache=None):
+        """
+        benchmark_dir is the directory this instance reads (default: the
+        current ingest.BENCHMARK_DIR); it is kept on the instance, so other
+        instances and later set_benchmark_dir calls don't change it.
+        suite is a Suite or a suite name (default: the manifest's default).
+        cache is an optional BuildCache or RolloutStore for sampled reads.
+        """
+        self.benchmark_dir = Path(benchmark_dir) if benchmark_dir is not None else ingest.BENCHMARK_DIR
+        self._suite = suite
+        self.cache = cache
+        self._results = None
+        self._tasks = None
+        self._sampled = {}
+
+    @property
+    def suite(self):
+        if self._suite is None or isinstance(self._suite, str):
+            self._suite = load_suite(self._suite)
+        return self._suite
+
+    @property
+    def results(self):
+        """final_25_results.json entries of the suite's models, by model key."""
+        if self._results is None:
+            results = load_results(self.benchmark_dir)
+            self._results = {r["model"]: r for r in self.suite.select(results)}
+        return self._results
+
+    @property
+    def models(self):
+        """Model keys in results order."""
+        return list(self.results)
+
+    @property
+    def tasks(self):
+        """The suite's task records by task id, in final_25_tasks.jsonl order."""
+        if self._tasks is None:
+            task_ids = self.suite.task_ids
+            records = load_task_records(self.benchmark_dir)
+            self._tasks = {t["id"]: t for t in records if t["id"] in task_ids}
+        return self._tasks
+
+    def iter_models(self, models=None, provider=None):
+        """Yield model keys, optionally only those in models or from provider."""
+        for key in self.results:
+            if models is not None and key not in models:
+                continue
+            if provider is not None and key.split("--")[0] != provider:
+                continue
+            yield key
+
+    def iter_tasks(self, dataset=None, template=None, level=None, task_ids=None):
+        """Yield task records matching every given filter."""
+        for task_id, task in self.tasks.items():
+            if task_ids is not None and task_id not in task_ids:
+                continue
+            if dataset is not None and task["dataset"] != dataset:
+                continue
+            if template is not None and task["template"] != template:
+                continue
+            if level is not None and task["level"] != level:
+                continue
+            yield task
+
+    def _task_filter(self, dataset, template, level, task_ids):
+        """Task ids per dataset for the filters, or None per dataset if unfiltered."""
+        filtered = template is not None or level is not None or task_ids is not None
+        selected = {name: None for name in DATASETS if dataset in (None, name)}
+        if filtered:
+            for name in selected:
+                selected[name] = set()
+            for task in self.iter_tasks(dataset, template, level, task_ids):
+                if task["dataset"] in selected:
+                    selected[task["dataset"]].add(task["id"])
+        return selected
+
+    def sampled(self, model_key, dataset, task_ids=None):
+        """
+        A model's sampled records from one log, as the transforms see them.
+
+        task_ids narrows the sample to those tasks; each distinct request is
+        read once and memoized, and a narrower request is served from an
+        already loaded full sample.
+        """
+        key = (model_key, dataset, frozenset(task_ids) if task_ids is not None else None)
+        if key in self._sampled:
+            return self._sampled[key]
+        full = self._sampled.get((model_key, dataset, None))
+        if full is not None:
+            records = [r for r in full if r["info"].get("task_id") in task_ids]
+        else:
+            params = self.suite.sampling_params(dataset)
+            if task_ids is not None:
+                params = dict(params, task_ids=sorted(set(params["task_ids"]) & set(task_ids)))
+            path = _log_path(model_key, dataset, self.benchmark_dir)
+            records = read_rollouts(path, [params], self.cache)[0]
+        self._sampled[key] = records
+        return records
+
+    def iter_rollouts(self, models=None, provider=None, dataset=None, template=None, level=None,
+                      task_ids=None, sampled=True):
+        """
+        Yield (model key, record) for rollouts matching every given filter.
+
+        By default these are the sampled rollouts the reports use. With
+        sampled=False every record in the logs is streamed instead; those
+        are not memoized.
+        """
+        selected = self._task_filter(dataset, template, level, task_ids)
+        for key in self.iter_models(models, provider):
+            for name, ids in selected.items():
+                if ids is not None and not ids:
+                    continue
+                if sampled:
+                    records = self.sampled(key, name, ids)
+                else:
+                    if ids is None:
+                        ids = (self.suite.bank_ids if name == "bank" else self.suite.road_ids)
+                    records = iter_log(_log_path(key, name, self.benchmark_dir), ids)
+                for record in records:
+                    yield key, record
+
+    def columns(self, models=None, provider=None, dataset=None, template=None, level=None,
+                task_ids=None, sampled=True):
+        """RolloutColumns over the matching rollouts, for the columnar aggregates."""
+        model_keys = list(self.iter_models(models, provider))
+        tasks = list(self.iter_tasks(dataset, template, level, task_ids))
+        columns = RolloutColumns(model_keys, (t["id"] for t in tasks))
+        for key, record in self.iter_rollouts(model_keys, None, dataset, template, level,
+                                              task_ids, sampled):
+            task_i = columns.task_pos.get(record["info"].get("task_id"))
+            if task_i is not None:
+                columns.append(columns.model_pos[key], task_i, record.get("score_correctness", 0),
+                               record.get("score_efficiency", 0), record.get("reward", 0))
+        return columns
@@ -0,0 +1,326 @@
+"""
+Output encodings for the generated data files.
+
+The default is the repo's long-standing ``indent=2`` JSON. Compact mode
+writes minified JSON and precompressed ``.gz``/``.br`` siblings next to
+each file (``.br`` only when the optional ``brotli`` module is installed).
+Payloads fetched at runtime can also have repeated strings interned into
+a lookup table; ``src/lib/interned.ts`` reverses that in the browser.
+
+Transcript messages and rollout entries, which repeat across samples, are
+stored once per payload in a content-addressed ``content`` table keyed by
+a hash of their JSON, and referenced as ``{"$c": key}``; a reference may
+carry extra fields such as a multiplicity ``count``. ``src/lib/content.ts``
+resolves the references in the browser. A payload streamed with
+``write_json_stream`` can use a ``SpilledContentTable``, which keeps only
+the keys in memory and writes the bodies to a file as they are added.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+from collections import Counter
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Marks a payload produced by intern_strings()
+INTERNED_ENCODING = "interned-v1"
+
+# Strings shorter than this cost less inline than as a reference
+MIN_INTERN_LENGTH = 24
+
+# Hex digits of the SHA-1 of a body's canonical JSON used as its content key
+CONTENT_KEY_LENGTH = 16
+
+
+def _count_strings(obj, counts):
+    if isinstance(obj, str):
+        if len(obj) >= MIN_INTERN_LENGTH:
+            counts[obj] += 1
+    elif isinstance(obj, dict):
+        for value in obj.values():
+            _count_strings(value, counts)
+    elif isinstance(obj, list):
+        for value in obj:
+            _count_strings(value, counts)
+
+
+def _replace_strings(obj, ids):
+    if isinstance(obj, str):
+        i = ids.get(obj)
+        return obj if i is None else {"$s": i}
+    if isinstance(obj, dict):
+        return {key: _replace_strings(value, ids) for key, value in obj.items()}
+    if isinstance(obj, list):
+        return [_replace_strings(value, ids) for value in obj]
+    return obj
+
+
+def intern_strings(obj):
+    """
+    Move repeated string values into a lookup table.
+
+    Every string value of at least MIN_INTERN_LENGTH characters that occurs
+    more than once is replaced by ``{"$s": id}``. Object keys are left
+    alone. The table is ordered by first occurrence so output is stable.
+    """
+    counts = Counter()
+    _count_strings(obj, counts)
+    strings = [s for s, n in counts.items() if n > 1]
+    ids = {s: i for i, s in enumerate(strings)}
+    return {
+        "encoding": INTERNED_ENCODING,
+        "strings": strings,
+        "data": _replace_strings(obj, ids),
+    }
+
+
+def content_key(value):
+    """Content key of a JSON value: independent of key order and formatting."""
+    canonical = json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha1(canonical.encode()).hexdigest()[:CONTENT_KEY_LENGTH]
+
+
+class ContentTable:
+    """Content-addressed bodies of one payload, in order of first reference."""
+
+    def __init__(self):
+        self.bodies = {}
+
+    def ref(self, value, **fields):
+        """Store value once and return a ``{"$c": key}`` reference to it, plus fields."""
+        key = content_key(value)
+        self.bodies.setdefault(key, value)
+        return dict({"$c": key}, **fields)
+
+    def ref_counted(self, values):
+        """
+        One reference per distinct value, with its multiplicity as ``count``.
+
+        References are in order of each value's first occurrence.
+        """
+        counts = Counter()
+        order = {}
+        for value in values:
+            key = content_key(value)
+            counts[key] += 1
+            order.setdefault(key, value)
+        return [self.ref(value, count=counts[key]) for key, value in order.items()]
+
+
+class SpilledContentTable(ContentTable):
+    """
+    ContentTable whose bodies go to a JSON-lines file instead of memory.
+
+    Only the keys seen so far are held. ``items()`` reads the bodies back
+    in order of first reference, ready for a StreamedDict; no references
+    can be added after that.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.keys = set()
+        self._file = open(path, "w", encoding="utf-8")
+
+    def ref(self, value, **fields):
+        key = content_key(value)
+        if key not in self.keys:
+            self.keys.add(key)
+            self._file.write(json.dumps([key, value], ensure_ascii=False) + "\n")
+        return dict({"$c": key}, **fields)
+
+    def items(self):
+        """(key, body) pairs, in order of first reference."""
+        self._file.close()
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                key, value = json.loads(line)
+                yield key, value
+
+
+def resolve_content(obj, bodies):
+    """Inverse of ContentTable references: obj with every ``{"$c": key}`` replaced by its body."""
+    if isinstance(obj, dict):
+        if "$c" in obj:
+            body = bodies[obj["$c"]]
+            extra = {key: value for key, value in obj.items() if key != "$c"}
+            return dict(body, **extra) if extra else body
+        return {key: resolve_content(value, bodies) for key, value in obj.items()}
+    if isinstance(obj, list):
+        return [resolve_content(value, bodies) for value in obj]
+    return obj
+
+
+def encode(obj, compact=False):
+    """Serialize obj as UTF-8 JSON bytes."""
+    if compact:
+        text = json.dumps(obj, separators=(",", ":"))
+    else:
+        text = json.dumps(obj, indent=2)
+    return text.encode()
+
+
+def write_json(path, obj, compact=False):
+    """
+    Write obj to path as JSON.
+
+    In compact mode the JSON is minified and ``.gz``/``.br`` siblings are
+    written alongside it so static hosting can serve them directly. Any
+    sibling this write did not produce (all of them in the default mode,
+    ``.br`` in a compact build without brotli) is removed as stale.
+    Every file is replaced atomically, so readers never see a partial one.
+    """
+    data = encode(obj, compact)
+    _atomic_write(path, data)
+
+    written = []
+    if compact:
+        # mtime=0 keeps the gzip bytes identical across rebuilds
+        _atomic_write(f"{path}.gz", gzip.compress(data, compresslevel=9, mtime=0))
+        written.append(".gz")
+        if brotli is not None:
+            _atomic_write(f"{path}.br", brotli.compress(data))
+            written.append(".br")
+    _remove_siblings(path, keep=written)
+
+
+def _temp_path(path):
+    return f"{path}.{os.getpid()}.tmp"
+
+
+def _atomic_write(path, data):
+    tmp = _temp_path(path)
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def _remove_siblings(path, keep=()):
+    # Don't leave precompressed copies of an older build behind
+    for suffix in (".gz", ".br"):
+        if suffix not in keep and os.path.exists(f"{path}{suffix}"):
+            os.remove(f"{path}{suffix}")
+
+
+class StreamedList:
+    """A list field of write_json_stream() whose items are produced lazily."""
+
+    def __init__(self, items):
+        self.items = items
+
+
+class StreamedDict:
+    """A dict field of write_json_stream() whose (key, value) items are produced lazily."""
+
+    def __init__(self, items):
+        self.items = items
+
+
+class _Sink:
+    """
+    Writes bytes to a file and, in compact mode, to its .gz/.br siblings.
+
+    Output goes to temporary files that replace the targets on close; any
+    sibling not written is then removed as stale, as in write_json().
+    """
+
+    def __init__(self, path, compact):
+        self.paths = [str(path)]
+        self.suffixes = []
+        self.gzip = self.brotli = None
+        if compact:
+            self.suffixes.append(".gz")
+            if brotli is not None:
+                self.suffixes.append(".br")
+                self.brotli = brotli.Compressor()
+        self.paths.extend(f"{path}{suffix}" for suffix in self.suffixes)
+
+        self.files = [open(_temp_path(p), "wb") for p in self.paths]
+        if compact:
+            self.gzip = gzip.GzipFile(filename="", mode="wb", fileobj=self.files[1],
+                                      compresslevel=9, mtime=0)
+
+    def write(self, text):
+        data = text.encode()
+        self.files[0].write(data)
+        if self.gzip is not None:
+            self.gzip.write(data)
+        if self.brotli is not None:
+            self.files[2].write(self.brotli.process(data))
+
+    def close(self, commit=True):
+        """Finish the files and move them into place, or discard them."""
+        if self.gzip is not None:
+            self.gzip.close()
+        if self.brotli is not None:
+            self.files[2].write(self.brotli.finish())
+        for f in self.files:
+            f.close()
+        for p in self.paths:
+            if commit:
+                os.replace(_temp_path(p), p)
+            else:
+                os.remove(_temp_path(p))
+        if commit:
+            _remove_siblings(self.paths[0], keep=self.suffixes)
+
+
+def _dumps(value, compact, level):
+    if compact:
+        return json.dumps(value, separators=(",", ":"))
+    # json.dumps escapes newlines inside strings, so every raw newline is
+    # layout and can be re-indented to the value's nesting level
+    return json.dumps(value, indent=2).replace("\n", "\n" + "  " * level)
+
+
+def _write_items(sink, items, brackets, compact, keyed=False):
+    """Write a streamed list, or a dict from (key, value) items, as a top-level field's value."""
+    empty = True
+    item_sep = "," if compact else ",\n    "
+    for item in items:
+        sink.write((brackets[0] if compact else brackets[0] + "\n    ") if empty else item_sep)
+        if keyed:
+            key, item = item
+            sink.write(f"{json.dumps(key)}:" if compact else f"{json.dumps(key)}: ")
+        sink.write(_dumps(item, compact, 2))
+        empty = False
+    sink.write(brackets if empty else (brackets[1] if compact else "\n  " + brackets[1]))
+
+
+def write_json_stream(path, fields, compact=False):
+    """
+    Write a top-level JSON object to path one field at a time.
+
+    fields is a sequence of (key, value) pairs. A callable value is called
+    when its turn comes, so it can depend on what was streamed before it;
+    a StreamedList or StreamedDict is written one item at a time so only
+    that item needs to be in memory. The bytes match write_json() of the equivalent dict,
+    and the files only replace their targets once fully written.
+    """
+    sink = _Sink(path, compact)
+    done = False
+    try:
+        sink.write("{")
+        for i, (key, value) in enumerate(fields):
+            sep = "," if i else ""
+            if compact:
+                sink.write(f"{sep}{json.dumps(key)}:")
+            else:
+                sink.write(f"{sep}\n  {json.dumps(key)}: ")
+
+            if callable(value):
+                value = value()
+            if isinstance(value, StreamedList):
+                _write_items(sink, value.items, "[]", compact)
+            elif isinstance(value, StreamedDict):
+                _write_items(sink, value.items, "{}", compact, keyed=True)
+            else:
+                sink.write(_dumps(value, compact, 1))
+        sink.write("}" if compact or not fields else "\n}")
+        done = True
+    finally:
+        sink.close(commit=done)
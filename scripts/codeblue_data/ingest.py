@@ -0,0 +1,395 @@
+"""
+Single-pass ingestion of benchmark_final_25 rollout logs.
+
+Each model's bank and road rollout files are scanned exactly once, however
+many suites (see ``codeblue_data.suites``) are sampled from them, and the
+``info`` field of every kept record is decoded once, in place. Both
+``transform_final25.py`` and ``transform_to_benchmark_format.py`` build
+their outputs from the records returned here.
+"""
+
+import os
+import re
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+from .compressed import LineReader, find_log
+from .offsets import iter_indexed, load_offsets
+from .records import (
+    MALFORMED, MalformedRecord, decode_results, decode_rollout, decode_task, is_strict, set_strict,
+    skip_malformed,
+)
+from .sampling import TaskSampler
+from .suites import load_suite
+
+# Paths (override with CODEBLUE_BENCHMARK_DIR or set_benchmark_dir)
+BENCHMARK_DIR = Path(os.environ.get(
+    "CODEBLUE_BENCHMARK_DIR",
+    Path(__file__).parent.parent.parent.parent / "benchmark_final_25",
+))
+
+# "task_id": "..." as raw bytes, also when info is an embedded JSON string
+# (\"task_id\": \"...\"); anchored on the key's opening quote so keys
+# like "parent_task_id" or "subtask_id" don't match
+TASK_ID_PATTERN = re.compile(rb'"task_id\\?"\s*:\s*\\?"([^"\\]*)')
+
+
+class ReadStats:
+    """Counters for rollout log reads done in this process."""
+
+    FIELDS = ("records_read", "records_decoded", "records_skipped", "bytes_read")
+
+    def __init__(self):
+        for field in self.FIELDS:
+            setattr(self, field, 0)
+
+    def as_dict(self):
+        return {field: getattr(self, field) for field in self.FIELDS}
+
+    def add(self, counts):
+        for field in self.FIELDS:
+            setattr(self, field, getattr(self, field) + counts.get(field, 0))
+
+
+# Process-wide read counters, reported by codeblue_data.instrument
+READ_STATS = ReadStats()
+
+
+def set_benchmark_dir(path):
+    """Point every loader at a different benchmark_final_25-shaped directory."""
+    global BENCHMARK_DIR
+    BENCHMARK_DIR = Path(path)
+
+
+def _root(benchmark_dir):
+    return BENCHMARK_DIR if benchmark_dir is None else Path(benchmark_dir)
+
+
+def results_path(benchmark_dir=None):
+    """Path of final_25_results.json (in BENCHMARK_DIR unless benchmark_dir is given)."""
+    return _root(benchmark_dir) / "final_25_results.json"
+
+
+def load_results(benchmark_dir=None):
+    """Load model results from final_25_results.json."""
+    path = results_path(benchmark_dir)
+    with open(path, "rb") as f:
+        try:
+            return decode_results(f.read())
+        except MalformedRecord as e:
+            raise MalformedRecord(f"{path}: {e}") from None
+
+
+def load_task_records(benchmark_dir=None):
+    """Load raw task definitions from final_25_tasks.jsonl."""
+    tasks = []
+    path = _root(benchmark_dir) / "final_25_tasks.jsonl"
+    with open(path, "rb") as f:
+        for number, line in enumerate(f, 1):
+            try:
+                tasks.append(decode_task(line))
+            except MalformedRecord as e:
+                raise MalformedRecord(f"{path}, line {number}: {e}") from None
+    return tasks
+
+
+def bank_path(model_key, benchmark_dir=None):
+    """Path of a model's bank rollout log, or of its .gz/.zst variant if only that exists."""
+    return find_log(_root(benchmark_dir) / "bank_rescored_c1" / f"{model_key}.jsonl")
+
+
+def road_path(model_key, benchmark_dir=None):
+    """Path of a model's road rollout log, or of its .gz/.zst variant if only that exists."""
+    return find_log(_root(benchmark_dir) / "eval_logs" / f"codeblue_env--{model_key}" / "results.jsonl")
+
+
+def log_owner(filepath):
+    """(model key, "bank" or "road") of a path built by bank_path() or road_path()."""
+    filepath = Path(filepath)
+    prefix = "codeblue_env--"
+    if filepath.parent.name.startswith(prefix):
+        return filepath.parent.name[len(prefix):], "road"
+    return filepath.name.split(".jsonl")[0], "bank"
+
+
+def quick_task_id(line):
+    """
+    Task id read straight from a raw JSONL line, or None if unsure.
+
+    Only an unambiguous answer is returned: a line that mentions several
+    different task ids (say, in a prompt) needs a full decode.
+    """
+    found = set(TASK_ID_PATTERN.findall(line))
+    if len(found) == 1:
+        return found.pop().decode()
+    return None
+
+
+def scan_log(filepath, samplers):
+    """
+    Feed every record of a rollout log to samplers in a single pass.
+
+    Each record is offered to every sampler; it is decoded only if some
+    sampler keeps it, and lines whose task id can be read from the raw
+    bytes are offered before decoding. Reading stops as soon as no sampler
+    can change its sample, so long logs are not read to the end. When the
+    log has a fresh offset index the samplers choose from the index and
+    only the kept records are read. The ``info`` field of each kept record
+    is replaced by its decoded dict.
+    """
+    if all(sampler.done() for sampler in samplers):
+        return
+
+    index = load_offsets(filepath)
+    if index is not None:
+        # Sample (offset, length) pairs, then read just the kept records
+        for task_id, entries in index["tasks"].items():
+            for entry in entries:
+                for sampler in samplers:
+                    slot = sampler.accept(task_id, entry[0])
+                    if slot is not None:
+                        sampler.keep(task_id, slot, entry[0], entry[1])
+
+        spans = sorted({span for sampler in samplers for span in sampler.kept_entries()})
+        records = {}
+        for (position, _), record in zip(spans, iter_indexed(filepath, spans)):
+            records[position] = record
+        for sampler in samplers:
+            sampler.fill(records)
+        READ_STATS.add({
+            "records_read": len(spans),
+            "records_decoded": len(spans),
+            "bytes_read": sum(length for _, length in spans),
+        })
+        return
+
+    read = decoded = skipped = nbytes = 0
+    try:
+        with LineReader(filepath) as lines:
+            for line in lines:
+                position = nbytes
+                read += 1
+                nbytes += len(line)
+
+                try:
+                    was_decoded, kept = offer_line(samplers, line, position)
+                except MalformedRecord as e:
+                    skip_malformed(e, filepath, position)
+                    skipped += 1
+                    continue
+                decoded += was_decoded
+                skipped += not kept
+                if kept and all(sampler.done() for sampler in samplers):
+                    return
+    finally:
+        READ_STATS.add({
+            "records_read": read,
+            "records_decoded": decoded,
+            "records_skipped": skipped,
+            "bytes_read": nbytes,
+        })
+
+
+def offer_line(samplers, line, position):
+    """
+    Offer one raw JSONL line, found at byte position, to every sampler.
+
+    The line is decoded only if its task id cannot be read from the raw
+    bytes or some sampler keeps it. Returns (decoded, kept); a malformed
+    line raises MalformedRecord and leaves the samplers as they were.
+    """
+    task_id = quick_task_id(line)
+    record = None
+    if task_id is None:
+        record = decode_rollout(line)
+        task_id = record["info"].get("task_id", "")
+
+    slots = [sampler.accept(task_id, position) for sampler in samplers]
+    if all(slot is None for slot in slots):
+        return record is not None, False
+
+    if record is None:
+        try:
+            record = decode_rollout(line)
+        except MalformedRecord:
+            for sampler in samplers:
+                sampler.retract(task_id)
+            raise
+    for sampler, slot in zip(samplers, slots):
+        if slot is not None:
+            sampler.keep(task_id, slot, position, record)
+    return True, True
+
+
+def iter_log(filepath, task_ids=None):
+    """
+    Yield every record of a rollout log in file order, info decoded.
+
+    With task_ids, records of other tasks are skipped: through the offset
+    index when it is fresh, otherwise before decoding whenever the task id
+    can be read from the raw line.
+    """
+    if not Path(filepath).exists():
+        return
+    wanted = set(task_ids) if task_ids is not None else None
+
+    index = load_offsets(filepath)
+    if index is not None and wanted is not None:
+        spans = sorted((entry[0], entry[1]) for task_id, entries in index["tasks"].items()
+                       if task_id in wanted for entry in entries)
+        READ_STATS.add({
+            "records_read": len(spans),
+            "records_decoded": len(spans),
+            "bytes_read": sum(length for _, length in spans),
+        })
+        yield from iter_indexed(filepath, spans)
+        return
+
+    position = 0
+    with LineReader(filepath) as lines:
+        for line in lines:
+            start, position = position, position + len(line)
+            if not line.strip():
+                continue
+            stats = {"records_read": 1, "bytes_read": len(line)}
+            if wanted is not None:
+                task_id = quick_task_id(line)
+                if task_id is not None and task_id not in wanted:
+                    stats["records_skipped"] = 1
+                    READ_STATS.add(stats)
+                    continue
+            try:
+                record = decode_rollout(line)
+            except MalformedRecord as e:
+                skip_malformed(e, filepath, start)
+                stats["records_skipped"] = 1
+                READ_STATS.add(stats)
+                continue
+            stats["records_decoded"] = 1
+            keep = wanted is None or record["info"].get("task_id", "") in wanted
+            stats["records_skipped"] = int(not keep)
+            READ_STATS.add(stats)
+            if keep:
+                yield record
+
+
+def scan_rollouts(filepath, params_list):
+    """Sampled records from one scan of a rollout log, one list per params."""
+    samplers = [TaskSampler(params) for params in params_list]
+    scan_log(filepath, samplers)
+    return [sampler.rollouts() for sampler in samplers]
+
+
+def read_rollouts(filepath, params_list, cache=None):
+    """
+    Sampled records from a rollout log for each sampling params dict.
+
+    Params served from the cache are not rescanned; the others share a
+    single scan. Identical params are only sampled once.
+    """
+    unique = []
+    for params in params_list:
+        if params not in unique:
+            unique.append(params)
+
+    if not filepath.exists():
+        sampled = [[] for _ in unique]
+    elif cache is None:
+        sampled = scan_rollouts(filepath, unique)
+    else:
+        sampled = cache.fetch_many(filepath, unique, lambda missing: scan_rollouts(filepath, missing))
+    return [sampled[unique.index(params)] for params in params_list]
+
+
+def ingest_model(model_key, suites, cache=None):
+    """
+    Read a model's bank and road rollouts for several suites.
+
+    Each log is scanned at most once whatever the number of suites.
+    Returns {suite name: {"bank": [...], "road": [...]}}.
+    """
+    ingested = {suite.name: {} for suite in suites}
+    for dataset, path in (("bank", bank_path(model_key)), ("road", road_path(model_key))):
+        params_list = [suite.sampling_params(dataset) for suite in suites]
+        for suite, rollouts in zip(suites, read_rollouts(path, params_list, cache)):
+            ingested[suite.name][dataset] = rollouts
+    return ingested
+
+
+def _ingest_worker(model_key, suites, cache, benchmark_dir, strict):
+    """Process-pool entry point; returns samples plus cache, read and malformed-record counters."""
+    set_benchmark_dir(benchmark_dir)
+    set_strict(strict)
+    before = READ_STATS.as_dict()
+    MALFORMED.clear()
+    if cache is not None:
+        # The worker's copy starts its own counts
+        cache.hits = cache.misses = 0
+    ingested = ingest_model(model_key, suites, cache)
+    reads = {k: v - before[k] for k, v in READ_STATS.as_dict().items()}
+    if cache is None:
+        return ingested, 0, 0, reads, dict(MALFORMED)
+    return ingested, cache.hits, cache.misses, reads, dict(MALFORMED)
+
+
+def iter_ingest_suites(results, suites, cache=None, jobs=1):
+    """
+    Yield (model key, {suite name: rollouts}) for every model in results.
+
+    A model is only sampled for the suites that include it, and models no
+    suite includes are not read at all. With jobs > 1 models are loaded on
+    a process pool. Workers send back only their sampled records and
+    results are yielded in the order of results, so the output is
+    identical to a serial run.
+    """
+    work = []
+    for r in results:
+        model_suites = [suite for suite in suites if suite.includes(r["model"])]
+        if model_suites:
+            work.append((r["model"], model_suites))
+
+    if jobs <= 1 or len(work) <= 1:
+        for key, model_suites in work:
+            yield key, ingest_model(key, model_suites, cache)
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        outcomes = pool.map(_ingest_worker,
+                            [key for key, _ in work],
+                            [model_suites for _, model_suites in work],
+                            [cache] * len(work),
+                            [BENCHMARK_DIR] * len(work),
+                            [is_strict()] * len(work))
+        for (key, _), (model_rollouts, hits, misses, reads, malformed) in zip(work, outcomes):
+            READ_STATS.add(reads)
+            MALFORMED.update(malformed)
+            if cache is not None:
+                cache.hits += hits
+                cache.misses += misses
+            yield key, model_rollouts
+
+
+def ingest_suites(results, suites, cache=None, jobs=1):
+    """
+    Ingest rollouts for several suites in one pass over the logs.
+
+    Returns {suite name: {model key: {"bank": [...], "road": [...]}}}.
+    """
+    ingested = {suite.name: {} for suite in suites}
+    for key, by_suite in iter_ingest_suites(results, suites, cache, jobs):
+        for name, rollouts in by_suite.items():
+            ingested[name][key] = rollouts
+    return ingested
+
+
+def iter_ingest(results, cache=None, jobs=1, suite=None):
+    """Yield (model key, rollouts) for the models of one suite (default: the default suite)."""
+    if suite is None:
+        suite = load_suite()
+    for key, by_suite in iter_ingest_suites(results, [suite], cache, jobs):
+        yield key, by_suite[suite.name]
+
+
+def ingest(results, cache=None, jobs=1, suite=None):
+    """Ingest rollouts of one suite's models, keyed by model key."""
+    return dict(iter_ingest(results, cache, jobs, suite))
@@ -0,0 +1,120 @@
+"""
+Per-stage timing and memory instrumentation for the transform scripts.
+
+Wrap each pipeline stage in ``instr.stage(name)`` to record wall time, CPU
+time, process peak RSS, optional tracemalloc peak and the rollout read
+counters (records read/decoded/skipped, bytes read) accrued during the
+stage. ``write_report`` dumps everything as JSON for CI to track across
+runs, and ``profiled`` wraps a run in cProfile or pyinstrument.
+"""
+
+import cProfile
+import json
+import resource
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+
+from .ingest import READ_STATS
+
+try:
+    import pyinstrument
+except ImportError:
+    pyinstrument = None
+
+
+def _max_rss_mb(who=resource.RUSAGE_SELF):
+    rss = resource.getrusage(who).ru_maxrss
+    # ru_maxrss is bytes on macOS, kilobytes elsewhere
+    return round(rss / (2**20 if sys.platform == "darwin" else 2**10), 2)
+
+
+class Instrumentation:
+    """Collects one record per pipeline stage."""
+
+    def __init__(self, trace_memory=False):
+        self.trace_memory = trace_memory
+        self.stages = []
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @contextmanager
+    def stage(self, name):
+        """Measure the enclosed block as the stage called name."""
+        reads_before = READ_STATS.as_dict()
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        try:
+            yield
+        finally:
+            record = {
+                "stage": name,
+                "wall_seconds": round(time.perf_counter() - wall, 4),
+                "cpu_seconds": round(time.process_time() - cpu, 4),
+                "max_rss_mb": _max_rss_mb(),
+            }
+            if self.trace_memory:
+                record["traced_peak_mb"] = round(tracemalloc.get_traced_memory()[1] / 2**20, 2)
+            for field, value in READ_STATS.as_dict().items():
+                record[field] = value - reads_before[field]
+            self.stages.append(record)
+
+    def report(self):
+        """All stage records plus run-level totals."""
+        totals = {
+            "wall_seconds": round(sum(s["wall_seconds"] for s in self.stages), 4),
+            "cpu_seconds": round(sum(s["cpu_seconds"] for s in self.stages), 4),
+            "max_rss_mb": _max_rss_mb(),
+            "children_max_rss_mb": _max_rss_mb(resource.RUSAGE_CHILDREN),
+        }
+        totals.update(READ_STATS.as_dict())
+        return {
+            "generated": datetime.now().isoformat(),
+            "argv": sys.argv[1:],
+            "stages": self.stages,
+            "totals": totals,
+        }
+
+    def write_report(self, path):
+        """Write report() as JSON to path."""
+        with open(path, "w") as f:
+            json.dump(self.report(), f, indent=2)
+        print(f"Wrote stage report to {path}")
+
+
+@contextmanager
+def profiled(path):
+    """
+    Profile the enclosed block and save the result to path.
+
+    A path ending in .html uses pyinstrument when it is installed; anything
+    else gets a cProfile stats file readable with pstats or snakeviz.
+    """
+    if not path:
+        yield
+        return
+
+    if path.endswith(".html") and pyinstrument is not None:
+        profiler = pyinstrument.Profiler()
+        profiler.start()
+        try:
+            yield
+        finally:
+            profiler.stop()
+            with open(path, "w") as f:
+                f.write(profiler.output_html())
+    else:
+        if path.endswith(".html"):
+            print("pyinstrument is not installed; writing cProfile stats instead")
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            profiler.dump_stats(path)
+    print(f"Wrote profile to {path}")
@@ -0,0 +1,124 @@
+"""
+Byte-offset sidecar index for rollout JSONL files.
+
+For a log ``results.jsonl`` the index lives next to it as
+``results.jsonl.idx.json`` and maps each task id to its records in file
+order, as ``[offset, length, score_correctness, score_efficiency, reward]``.
+Readers use it to mmap straight to the few records they need, or to pull
+a single trajectory on demand.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+from collections import defaultdict
+from pathlib import Path
+
+from .compressed import is_compressed
+from .records import MalformedRecord, decode_rollout, located, skip_malformed
+
+# Bump when the sidecar layout changes
+INDEX_VERSION = 1
+
+
+def sidecar_path(filepath):
+    """Location of the offset index for a rollout log."""
+    filepath = Path(filepath)
+    return filepath.with_name(filepath.name + ".idx.json")
+
+
+def build_offsets(filepath):
+    """Scan a plain (uncompressed) rollout log once and write its sidecar index."""
+    if is_compressed(filepath):
+        raise ValueError(f"cannot index compressed log {filepath}; offsets need an uncompressed file")
+    st = os.stat(filepath)
+    h = hashlib.sha256()
+    tasks = defaultdict(list)
+    offset = 0
+    with open(filepath, "rb") as f:
+        for line in f:
+            h.update(line)
+            if line.strip():
+                try:
+                    record = decode_rollout(line)
+                except MalformedRecord as e:
+                    # Left out of the index, so indexed reads never meet it
+                    skip_malformed(e, filepath, offset)
+                    offset += len(line)
+                    continue
+                task_id = record["info"].get("task_id", "")
+                tasks[task_id].append([
+                    offset,
+                    len(line),
+                    record.get("score_correctness", 0),
+                    record.get("score_efficiency", 0),
+                    record.get("reward", 0),
+                ])
+            offset += len(line)
+
+    index = {
+        "version": INDEX_VERSION,
+        "fingerprint": {
+            "size": st.st_size,
+            "mtime_ns": st.st_mtime_ns,
+            "sha256": h.hexdigest(),
+        },
+        "tasks": tasks,
+    }
+    out = sidecar_path(filepath)
+    tmp = out.with_name(out.name + f".{os.getpid()}.tmp")
+    with open(tmp, "w") as f:
+        json.dump(index, f)
+    os.replace(tmp, out)
+    return index
+
+
+def load_offsets(filepath):
+    """Sidecar index for filepath, or None if missing or stale (always None for compressed logs)."""
+    if is_compressed(filepath):
+        return None
+    try:
+        with open(sidecar_path(filepath)) as f:
+            index = json.load(f)
+        st = os.stat(filepath)
+    except (OSError, ValueError):
+        return None
+
+    fp = index.get("fingerprint", {})
+    if index.get("version") != INDEX_VERSION:
+        return None
+    if (fp.get("size"), fp.get("mtime_ns")) != (st.st_size, st.st_mtime_ns):
+        return None
+    return index
+
+
+def iter_indexed(filepath, spans):
+    """Yield decoded records for (offset, length) spans, read through mmap, info decoded."""
+    if not spans:
+        return
+    with open(filepath, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        for offset, length in spans:
+            try:
+                yield decode_rollout(mm[offset:offset + length])
+            except MalformedRecord as e:
+                raise located(e, filepath, offset) from None
+
+
+def read_trajectory(filepath, task_id, ordinal, index=None):
+    """
+    Load one rollout: the ordinal-th record of task_id in filepath.
+
+    Returns None when the log has no such rollout. Raises LookupError if the
+    log has no fresh index.
+    """
+    if index is None:
+        index = load_offsets(filepath)
+    if index is None:
+        raise LookupError(f"no fresh offset index for {filepath}")
+
+    entries = index["tasks"].get(task_id, [])
+    if not 0 <= ordinal < len(entries):
+        return None
+    offset, length = entries[ordinal][:2]
+    return next(iter_indexed(filepath, [(offset, length)]))
@@ -0,0 +1,274 @@
+"""
+Helpers for decoding individual rollout records.
+
+Rollout records, task records and final_25_results.json entries are
+decoded against small schemas that list the fields the transforms use;
+other fields are dropped. The JSON backend is the fastest one installed:
+
+- ``msgspec``: decodes straight into typed structs, so unused fields are
+  skipped by the parser and types are checked while decoding.
+- ``orjson``: fast decode into dicts, then checked against the schema.
+- ``json``: the standard library, checked the same way.
+
+Set CODEBLUE_JSON_BACKEND to one of these names to force a backend. Every
+backend yields the same dicts. A record that is not valid JSON, whose
+``info`` cannot be decoded, or whose fields have the wrong type raises
+MalformedRecord instead of being read as an empty record. Readers of
+rollout logs pass it to skip_malformed(), which counts and skips the
+record, or re-raises it with its location under --strict (set_strict).
+
+A score logged as ``null`` reads as 0, as an absent one always has.
+"""
+
+import json
+import os
+from collections import Counter
+from typing import Any, Union
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+BACKENDS = ("msgspec", "orjson", "json")
+
+NUMBER = (int, float)
+OPTIONAL_NUMBER = (int, float, type(None))
+ANY = None
+
+# Field -> (accepted types or ANY, required)
+ROLLOUT_FIELDS = {
+    "info": ((dict, str), False),
+    "prompt": ((list, str, type(None)), False),
+    "completion": ((list, str, type(None)), False),
+    "answer": (ANY, False),
+    "reward": (OPTIONAL_NUMBER, False),
+    "score_correctness": (OPTIONAL_NUMBER, False),
+    "score_efficiency": (OPTIONAL_NUMBER, False),
+    "score_notes_usage": (OPTIONAL_NUMBER, False),
+    "score_code_quality": (OPTIONAL_NUMBER, False),
+    # null stays null: the rollout was not timed
+    "generation_ms": (OPTIONAL_NUMBER, False),
+}
+
+# Rollout scores whose null is read as 0
+SCORE_FIELDS = ("reward", "score_correctness", "score_efficiency", "score_notes_usage",
+                "score_code_quality")
+
+TASK_FIELDS = {
+    "id": (str, True),
+    "dataset": (str, True),
+    "level": (str, True),
+    "template": (str, True),
+    "goal": (str, True),
+    "expected_output_type": (str, True),
+    "golden": (dict, True),
+    "tolerance": (NUMBER, False),
+    "metadata": (dict, False),
+    "ambiguities": (list, False),
+}
+
+RESULT_FIELDS = {
+    "model": (str, True),
+    "bank_correct": (int, True),
+    "bank_total": (int, True),
+    "bank_partial": (int, True),
+    "bank_pct": (NUMBER, True),
+    "road_correct": (int, True),
+    "road_total": (int, True),
+    "road_partial": (int, True),
+    "road_pct": (NUMBER, True),
+    "total_correct": (int, True),
+    "total_attempts": (int, True),
+    "total_partial": (int, True),
+    "total_pct": (NUMBER, True),
+    "avg_reward": (NUMBER, True),
+    "has_bank": (bool, True),
+    "has_road": (bool, True),
+    "complete": (bool, True),
+}
+
+
+class MalformedRecord(ValueError):
+    """A record that does not match its schema."""
+
+
+# Raise on the first malformed rollout record instead of skipping it
+STRICT = False
+
+# Log path -> malformed records skipped in this process
+MALFORMED = Counter()
+
+
+def set_strict(strict):
+    """Fail on malformed rollout records (strict) or skip and count them."""
+    global STRICT
+    STRICT = bool(strict)
+
+
+def is_strict():
+    """Whether malformed rollout records raise (see set_strict)."""
+    return STRICT
+
+
+def _select_backend():
+    forced = os.environ.get("CODEBLUE_JSON_BACKEND")
+    if forced:
+        if forced not in BACKENDS:
+            raise ValueError(f"unknown CODEBLUE_JSON_BACKEND {forced!r} (expected one of {', '.join(BACKENDS)})")
+        if {"msgspec": msgspec, "orjson": orjson}.get(forced, json) is None:
+            raise ImportError(f"CODEBLUE_JSON_BACKEND={forced} but {forced} is not installed")
+        return forced
+    if msgspec is not None:
+        return "msgspec"
+    if orjson is not None:
+        return "orjson"
+    return "json"
+
+
+BACKEND = _select_backend()
+
+DECODE_ERRORS = (ValueError,) + ((msgspec.DecodeError,) if msgspec is not None else ())
+
+
+def _type_name(types):
+    if types is NUMBER:
+        return "a number"
+    if types is OPTIONAL_NUMBER:
+        return "a number or null"
+    if isinstance(types, tuple):
+        return " or ".join(t.__name__ for t in types)
+    return types.__name__
+
+
+def _matches(value, types):
+    if types is ANY:
+        return True
+    # bool is an int subclass but never a valid count or score
+    if isinstance(value, bool) and types in (int, NUMBER, OPTIONAL_NUMBER):
+        return False
+    return isinstance(value, types)
+
+
+def check_fields(obj, fields, kind):
+    """Project a decoded object onto fields, raising MalformedRecord on a mismatch."""
+    if not isinstance(obj, dict):
+        raise MalformedRecord(f"{kind} must be a JSON object, got {type(obj).__name__}")
+    checked = {}
+    for name, (types, required) in fields.items():
+        if name not in obj:
+            if required:
+                raise MalformedRecord(f"{kind} is missing {name!r}")
+            continue
+        value = obj[name]
+        if not _matches(value, types):
+            raise MalformedRecord(f"{kind} field {name!r} must be {_type_name(types)}, "
+                                  f"got {type(value).__name__}")
+        checked[name] = value
+    return checked
+
+
+def _loads(data):
+    """Decode JSON text or bytes into plain Python objects with the selected backend."""
+    try:
+        if BACKEND == "msgspec":
+            return msgspec.json.decode(data)
+        if BACKEND == "orjson":
+            return orjson.loads(data)
+        return json.loads(data)
+    except DECODE_ERRORS as e:
+        raise MalformedRecord(f"invalid JSON: {e}") from None
+
+
+def parse_info(info):
+    """Parse info field which may be dict or JSON string."""
+    if not info:
+        return {}
+    if isinstance(info, str):
+        try:
+            info = _loads(info)
+        except MalformedRecord as e:
+            raise MalformedRecord(f"info is not a valid JSON string: {e}") from None
+    if not isinstance(info, dict):
+        raise MalformedRecord(f"info must be an object or a JSON string of one, got {type(info).__name__}")
+    task_id = info.get("task_id")
+    if task_id is not None and not isinstance(task_id, str):
+        raise MalformedRecord(f"info.task_id must be str, got {type(task_id).__name__}")
+    return info
+
+
+if msgspec is not None:
+    Number = Union[int, float, msgspec.UnsetType]
+    OptionalNumber = Union[int, float, None, msgspec.UnsetType]
+    Messages = Union[list, str, None, msgspec.UnsetType]
+
+    class RolloutStruct(msgspec.Struct):
+        """Typed rollout record; fields absent from the JSON stay UNSET."""
+        info: Union[dict, str, msgspec.UnsetType] = msgspec.UNSET
+        prompt: Messages = msgspec.UNSET
+        completion: Messages = msgspec.UNSET
+        answer: Any = msgspec.UNSET
+        reward: OptionalNumber = msgspec.UNSET
+        score_correctness: OptionalNumber = msgspec.UNSET
+        score_efficiency: OptionalNumber = msgspec.UNSET
+        score_notes_usage: OptionalNumber = msgspec.UNSET
+        score_code_quality: OptionalNumber = msgspec.UNSET
+        generation_ms: OptionalNumber = msgspec.UNSET
+
+    _rollout_decoder = msgspec.json.Decoder(RolloutStruct)
+
+
+def _struct_dict(struct):
+    """Fields of a decoded struct that were present in the JSON."""
+    return {name: value for name in struct.__struct_fields__
+            if (value := getattr(struct, name)) is not msgspec.UNSET}
+
+
+def decode_rollout(line):
+    """Decode one rollout JSONL line; ``info`` comes back as a dict."""
+    if BACKEND == "msgspec":
+        try:
+            record = _struct_dict(_rollout_decoder.decode(line))
+        except msgspec.DecodeError as e:
+            # ValidationError is a DecodeError
+            raise MalformedRecord(f"rollout record: {e}") from None
+    else:
+        record = check_fields(_loads(line), ROLLOUT_FIELDS, "rollout record")
+    for name in SCORE_FIELDS:
+        if name in record and record[name] is None:
+            record[name] = 0
+    record["info"] = parse_info(record.get("info", {}))
+    return record
+
+
+def decode_task(line):
+    """Decode one final_25_tasks.jsonl line."""
+    return check_fields(_loads(line), TASK_FIELDS, "task record")
+
+
+def decode_results(data):
+    """Decode final_25_results.json into a list of results entries."""
+    results = _loads(data)
+    if not isinstance(results, list):
+        raise MalformedRecord(f"results must be a JSON array, got {type(results).__name__}")
+    return [check_fields(r, RESULT_FIELDS, f"results entry {i}") for i, r in enumerate(results)]
+
+
+def located(e, filepath, position):
+    """MalformedRecord e prefixed with where the record was read from."""
+    return MalformedRecord(f"{filepath}, byte {position}: {e}")
+
+
+def skip_malformed(e, filepath, position):
+    """
+    Count the malformed rollout record e, read from filepath at byte
+    position, as skipped; with set_strict(True) raise it located instead.
+    """
+    if STRICT:
+        raise located(e, filepath, position) from None
+    MALFORMED[str(filepath)] += 1
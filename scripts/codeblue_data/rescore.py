@@ -0,0 +1,291 @@
+"""
+Rescoring of rollout answers against the tasks' golden values.
+
+Logged ``score_correctness`` values come from the grader that ran with
+the eval, and regrading used to mean a one-off script over the full logs.
+``Rescorer`` regrades whole batches of records instead:
+
+- Each answer is normalized once: numbers, numeric strings (``"1,234.5"``,
+  ``"$12"``, ``"45%"``, ``"Answer: 2.55"``) and booleans are coerced to a
+  float or a canonical string, and list literals as the logs record them
+  (``"['oct']"``, ``"[{'job': 'retired', 'count': 35185}]"``) are parsed
+  into tuples of normalized elements, with rows as frozensets of items.
+- Scores are memoized by (task id, normalized answer), so an answer that
+  many rollouts give is scored once.
+- The numeric answers of a batch are compared against their expected
+  values in one vectorized pass, with NumPy when it is installed and an
+  equivalent pure-Python path otherwise.
+
+A numeric answer is correct when it is within the task's tolerance of the
+expected value, relative to the value's magnitude:
+``|answer - expected| <= tolerance * |expected|``. An answer that would be
+correct once divided or multiplied by 100 (a fraction reported as a
+percentage or the other way round) is a scale error and earns
+``SCALE_ERROR_SCORE``, which counts as partial credit. Other scalar
+answers must equal the expected value after normalization.
+
+How structured answers are compared follows the task's
+``expected_output_type``: a ``list`` answer must hold the expected
+elements in any order, and a ``dataframe`` answer must hold the expected
+rows in order, each with the expected columns (extra columns are
+ignored). Elements and cells are compared like scalars. Tasks of any
+other type are graded "unknown" and keep their logged score.
+"""
+
+import ast
+import json
+import math
+import re
+from collections import Counter
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+CORRECT_SCORE = 1.0
+# Partial credit: between columns.PARTIAL_THRESHOLD and CORRECT_THRESHOLD
+SCALE_ERROR_SCORE = 0.5
+WRONG_SCORE = 0.0
+
+# Answer / expected ratios graded as scale errors
+SCALE_FACTORS = (100.0, 0.01)
+
+DEFAULT_TOLERANCE = 0.01
+
+# expected_output_type values the grader understands
+SCALAR, LIST, DATAFRAME = "scalar", "list", "dataframe"
+OUTPUT_TYPES = (SCALAR, LIST, DATAFRAME)
+
+# Verdicts, in the order reports list them
+VERDICTS = ("correct", "scale_error", "wrong", "unknown", "unknown_task")
+# Verdicts that leave the logged score in place
+UNGRADED = ("unknown", "unknown_task")
+
+NUMBER_PATTERN = re.compile(r"[-+]?(?:\d{1,3}(?:,\d{3})+|\d+)?(?:\.\d+)?(?:[eE][-+]?\d+)?")
+
+
+def _parse_number(text):
+    """float for text holding exactly one number (commas, $ and % allowed), else None."""
+    numbers = [m for m in NUMBER_PATTERN.findall(text) if any(c.isdigit() for c in m)]
+    if len(numbers) != 1:
+        return None
+    try:
+        return float(numbers[0].replace(",", ""))
+    except ValueError:
+        return None
+
+
+def _parse_literal(text):
+    """The list or dict a Python/JSON literal string holds, else None."""
+    if not text.startswith(("[", "{", "(")):
+        return None
+    try:
+        value = ast.literal_eval(text)
+    except (ValueError, TypeError, SyntaxError, MemoryError, RecursionError):
+        return None
+    return value if isinstance(value, (list, tuple, dict)) else None
+
+
+def normalize_answer(answer):
+    """
+    Hashable normalized form of an answer or expected value.
+
+    A float if the value reads as a single number, a canonical lowercase
+    string for other scalars, a tuple of normalized elements for a list
+    (or a string holding a list literal) and a frozenset of (lowercase
+    column, normalized value) items for a dict. None stays None. NaN
+    becomes the string "nan" so equal answers share a memo entry.
+    """
+    if isinstance(answer, str):
+        literal = _parse_literal(answer.strip())
+        if literal is not None:
+            answer = literal
+    if answer is None:
+        return None
+    if isinstance(answer, (list, tuple)):
+        return tuple(normalize_answer(item) for item in answer)
+    if isinstance(answer, dict):
+        return frozenset((str(column).strip().lower(), normalize_answer(value))
+                         for column, value in answer.items())
+    if isinstance(answer, bool):
+        return "true" if answer else "false"
+    if isinstance(answer, (int, float)):
+        value = float(answer)
+    elif isinstance(answer, str):
+        text = answer.strip().strip("`'\"").strip()
+        value = _parse_number(text)
+        if value is None:
+            return text.rstrip(".").lower()
+    else:
+        return json.dumps(answer, sort_keys=True, separators=(",", ":")).lower()
+    return "nan" if math.isnan(value) else value
+
+
+def _within(answers, targets, tolerances):
+    """Element-wise |answer - target| <= tolerance * |target| over NumPy arrays."""
+    return np.abs(answers - targets) <= tolerances * np.abs(targets)
+
+
+def _close(answer, target, tolerance):
+    return abs(answer - target) <= tolerance * abs(target)
+
+
+def _same(answer, expected, tolerance):
+    """Whether a normalized element or cell matches: floats within tolerance, else equal."""
+    if isinstance(answer, float) and isinstance(expected, float):
+        return _close(answer, expected, tolerance)
+    return answer is not None and answer == expected
+
+
+def _as_tuple(value):
+    return value if isinstance(value, tuple) else (value,)
+
+
+def _match_list(answer, expected, tolerance):
+    """Whether answer holds the expected elements, in any order."""
+    answer, expected = list(_as_tuple(answer)), _as_tuple(expected)
+    if len(answer) != len(expected):
+        return False
+    for item in expected:
+        for i, candidate in enumerate(answer):
+            if _same(candidate, item, tolerance):
+                del answer[i]
+                break
+        else:
+            return False
+    return True
+
+
+def _match_dataframe(answer, expected, tolerance):
+    """Whether answer holds the expected rows in order, each with the expected columns."""
+    answer, expected = _as_tuple(answer), _as_tuple(expected)
+    if len(answer) != len(expected):
+        return False
+    for row, expected_row in zip(answer, expected):
+        if not isinstance(row, frozenset) or not isinstance(expected_row, frozenset):
+            return False
+        cells = dict(row)
+        for column, value in expected_row:
+            if column not in cells or not _same(cells[column], value, tolerance):
+                return False
+    return True
+
+
+class Rescorer:
+    """Memoized batch grader for the tasks of final_25_tasks.jsonl."""
+
+    def __init__(self, task_records):
+        """task_records are decoded final_25_tasks.jsonl records (see ingest.load_task_records)."""
+        self.expected = {}
+        for task in task_records:
+            tolerance = task.get("tolerance", DEFAULT_TOLERANCE)
+            output_type = task.get("expected_output_type", SCALAR)
+            self.expected[task["id"]] = (normalize_answer(task["golden"].get("answer_value")),
+                                         tolerance, output_type)
+        # (task id, normalized answer) -> (score, verdict)
+        self.memo = {}
+        self.hits = self.misses = 0
+        self.verdicts = Counter()
+
+    def grade(self, records):
+        """(score, verdict) for each rollout record, in order."""
+        keys = [(r["info"].get("task_id", ""), normalize_answer(r.get("answer"))) for r in records]
+        missing = [key for key in dict.fromkeys(keys) if key not in self.memo]
+        self.misses += len(missing)
+        self.hits += len(keys) - len(missing)
+        if missing:
+            self._grade_batch(missing)
+        return [self.memo[key] for key in keys]
+
+    def rescore(self, records):
+        """
+        Replace score_correctness of every record with its regraded score.
+
+        The logged score is kept as score_correctness_logged. Records of
+        tasks that have no golden value, or whose output type the grader
+        does not support, are left alone. Returns the verdicts.
+        """
+        verdicts = []
+        for record, (score, verdict) in zip(records, self.grade(records)):
+            if verdict not in UNGRADED:
+                if "score_correctness_logged" not in record:
+                    record["score_correctness_logged"] = record.get("score_correctness", 0)
+                record["score_correctness"] = score
+            verdicts.append(verdict)
+        self.verdicts.update(verdicts)
+        return verdicts
+
+    def _grade_batch(self, keys):
+        """Grade keys not yet memoized: numeric scalars in one pass, the rest one by one."""
+        numeric = []
+        for key in keys:
+            task_id, answer = key
+            if task_id not in self.expected:
+                self.memo[key] = (WRONG_SCORE, "unknown_task")
+                continue
+            expected, tolerance, output_type = self.expected[task_id]
+            if output_type == SCALAR:
+                if isinstance(answer, tuple) and len(answer) == 1:
+                    answer = answer[0]
+                if isinstance(answer, float) and isinstance(expected, float):
+                    numeric.append((key, answer, expected, tolerance))
+                    continue
+                correct = _same(answer, expected, tolerance)
+            elif output_type == LIST:
+                correct = _match_list(answer, expected, tolerance)
+            elif output_type == DATAFRAME:
+                correct = _match_dataframe(answer, expected, tolerance)
+            else:
+                self.memo[key] = (WRONG_SCORE, "unknown")
+                continue
+            self.memo[key] = (CORRECT_SCORE, "correct") if correct else (WRONG_SCORE, "wrong")
+
+        if not numeric:
+            return
+        if np is not None:
+            correct, scaled = self._compare_numpy(numeric)
+        else:
+            correct, scaled = self._compare_python(numeric)
+        for (key, *_), is_correct, is_scaled in zip(numeric, correct, scaled):
+            if is_correct:
+                self.memo[key] = (CORRECT_SCORE, "correct")
+            elif is_scaled:
+                self.memo[key] = (SCALE_ERROR_SCORE, "scale_error")
+            else:
+                self.memo[key] = (WRONG_SCORE, "wrong")
+
+    @staticmethod
+    def _compare_numpy(numeric):
+        answers = np.fromiter((n[1] for n in numeric), dtype=float, count=len(numeric))
+        expected = np.fromiter((n[2] for n in numeric), dtype=float, count=len(numeric))
+        tolerances = np.fromiter((n[3] for n in numeric), dtype=float, count=len(numeric))
+        correct = _within(answers, expected, tolerances)
+        scaled = np.zeros(len(numeric), dtype=bool)
+        for factor in SCALE_FACTORS:
+            scaled |= _within(answers / factor, expected, tolerances)
+        scaled &= ~correct
+        return correct.tolist(), scaled.tolist()
+
+    @staticmethod
+    def _compare_python(numeric):
+        correct = [_close(a, e, t) for _, a, e, t in numeric]
+        scaled = [not c and any(_close(a / factor, e, t) for factor in SCALE_FACTORS)
+                  for c, (_, a, e, t) in zip(correct, numeric)]
+        return correct, scaled
+
+
+def rescore_ingested(ingested, rescorer):
+    """
+    Rescore in place every record of ``ingest_suites`` output as one batch.
+
+    Suites share the records of models they both include; each record is
+    rescored once. Returns the verdicts.
+    """
+    records = {}
+    for by_model in ingested.values():
+        for rollouts in by_model.values():
+            for dataset in rollouts.values():
+                for record in dataset:
+                    records[id(record)] = record
+    return rescorer.rescore(list(records.values()))
@@ -0,0 +1,123 @@
+"""
+Per-task rollout sampling policies.
+
+A sampler decides, record by record, which rollouts of a log to keep for
+each selected task. Two policies are supported:
+
+- ``first``: the first ``per_task`` records of each task in file order.
+- ``reservoir``: a uniform sample of ``per_task`` records of each task,
+  drawn with reservoir sampling (Algorithm R) from a per-task RNG seeded by
+  ``seed`` and the task id, so it is reproducible and needs one pass with
+  memory bounded by the sample size however long the log is.
+
+Samplers are driven either by a streaming scan or by the entries of an
+offset index; both see the same sequence per task and so pick the same
+records. A sampler is fully described by its parameters dict, which is
+also what the build cache keys on.
+"""
+
+import random
+
+POLICIES = ("first", "reservoir")
+
+
+def sampling_params(task_ids, per_task, policy="first", seed=0):
+    """Parameters that determine which records a scan keeps."""
+    if policy not in POLICIES:
+        raise ValueError(f"unknown sampling policy {policy!r} (expected one of {', '.join(POLICIES)})")
+    if per_task < 1:
+        raise ValueError(f"per_task must be at least 1, got {per_task}")
+    return {
+        "task_ids": sorted(task_ids),
+        "samples_per_task": per_task,
+        "policy": policy,
+        "seed": seed,
+    }
+
+
+class TaskSampler:
+    """Sampling state for one log under one set of sampling parameters."""
+
+    def __init__(self, params):
+        self.params = params
+        self.per_task = params["samples_per_task"]
+        self.reservoir = params["policy"] == "reservoir"
+        self.seen = dict.fromkeys(params["task_ids"], 0)
+        self.kept = {}
+        self.first_seen = {}
+        self.open_tasks = len(self.seen)
+        self.rngs = {}
+
+    def accept(self, task_id, position):
+        """
+        Register the next record of task_id, found at position.
+
+        Returns the slot the record goes into, or None if it is not kept.
+        Must be called once for every record of a selected task, in order.
+        """
+        n = self.seen.get(task_id)
+        if n is None:
+            return None
+        self.seen[task_id] = n + 1
+        self.first_seen.setdefault(task_id, position)
+
+        if n < self.per_task:
+            if n + 1 == self.per_task:
+                self.open_tasks -= 1
+            return n
+        if not self.reservoir:
+            return None
+
+        rng = self.rngs.get(task_id)
+        if rng is None:
+            rng = self.rngs[task_id] = random.Random(f"{self.params['seed']}:{task_id}")
+        slot = rng.randrange(n + 1)
+        return slot if slot < self.per_task else None
+
+    def retract(self, task_id):
+        """
+        Undo the last accept() of task_id, for a record that turned out to
+        be malformed and is skipped. A reservoir draw already made for it
+        is not replayed.
+        """
+        n = self.seen.get(task_id)
+        if not n:
+            return
+        self.seen[task_id] = n - 1
+        if n == self.per_task:
+            self.open_tasks += 1
+
+    def keep(self, task_id, slot, position, record):
+        """Store a record in the slot returned by accept()."""
+        kept = self.kept.setdefault(task_id, [])
+        if slot == len(kept):
+            kept.append([position, record])
+        else:
+            kept[slot] = [position, record]
+
+    def done(self):
+        """Whether no later record can change the sample."""
+        return not self.seen or (not self.reservoir and not self.open_tasks)
+
+    def kept_entries(self):
+        """(position, record) of every kept record."""
+        return [(position, record) for kept in self.kept.values() for position, record in kept]
+
+    def fill(self, records):
+        """Replace kept placeholders with records looked up by position."""
+        for kept in self.kept.values():
+            for entry in kept:
+                entry[1] = records[entry[0]]
+
+    def rollouts(self):
+        """
+        Kept records grouped by task.
+
+        Tasks appear in order of their first record in the log and records
+        keep their file order, matching the layout the transform scripts
+        have always produced.
+        """
+        rollouts = []
+        for task_id in sorted(self.kept, key=self.first_seen.get):
+            rollouts.extend(record for _, record in sorted(self.kept[task_id], key=lambda e: e[0]))
+        return rollouts
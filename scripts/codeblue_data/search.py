@@ -0,0 +1,368 @@
+"""
+Inverted index over the full rollout logs, for failure analysis.
+
+Finding every rollout whose completion mentions a pandas error or whose
+answer has the wrong unit used to mean grepping every log. Instead each
+log gets an index, built in one pass and rebuilt only when the log
+changes (size or mtime), under ``SEARCH_DIR/<dataset>/<model key>/``:
+
+- ``meta.json``: source path, fingerprint and counts; written last, so a
+  half-built index is never taken for a fresh one.
+- ``docs.z``: per rollout (doc id = record ordinal in the log), its task
+  id, byte position and length, and score_correctness.
+- ``NN.z``: ``SHARDS`` shards of the postings. A term goes to the shard
+  given by the CRC-32 of its text and maps to the sorted ids of the
+  rollouts containing it, delta- and varint-encoded. Each shard is zlib
+  compressed, so a query decompresses one shard per term and log.
+
+Completions (every message's content and tool call arguments) and answers
+are indexed as separate fields, tokenized into lowercase words and
+numbers. A query matches rollouts that contain all of its tokens; with
+exact=True the candidates are then read back and kept only if the field
+contains the query text itself, case-insensitively.
+"""
+
+import json
+import os
+import re
+import zlib
+from collections import defaultdict
+from pathlib import Path
+
+from .columns import CORRECT_THRESHOLD
+from .compressed import LineReader, is_compressed
+from .offsets import iter_indexed
+from .records import MalformedRecord, decode_rollout, skip_malformed
+
+SEARCH_DIR = Path(__file__).parent.parent.parent / ".cache" / "search"
+
+# Bump when the index layout or tokenization changes
+INDEX_VERSION = 1
+
+SHARDS = 16
+
+# Field name -> term prefix
+FIELDS = {"completion": "c", "answer": "a"}
+
+# Words (letters, digits, underscores, not starting with a digit) and numbers
+TOKEN_PATTERN = re.compile(r"\d+(?:\.\d+)?|[^\W\d]\w*")
+MAX_TOKEN_LENGTH = 64
+
+
+def tokenize(text):
+    """Distinct lowercase tokens of text."""
+    return {token for token in TOKEN_PATTERN.findall(text.lower()) if len(token) <= MAX_TOKEN_LENGTH}
+
+
+def _content_text(content):
+    if content is None:
+        return ""
+    if isinstance(content, list):
+        return "\n".join(part.get("text") or "" if isinstance(part, dict) else str(part) for part in content)
+    return str(content)
+
+
+def field_texts(record):
+    """{field: text} of a rollout record, as indexed and matched by exact queries."""
+    completion = record.get("completion")
+    if not isinstance(completion, list):
+        completion = [{"content": completion}] if completion else []
+    parts = []
+    for message in completion:
+        if not isinstance(message, dict):
+            parts.append(str(message))
+            continue
+        parts.append(_content_text(message.get("content")))
+        for call in message.get("tool_calls") or []:
+            function = call.get("function", {}) if isinstance(call, dict) else {}
+            arguments = function.get("arguments") if isinstance(function, dict) else None
+            if arguments:
+                parts.append(arguments if isinstance(arguments, str) else json.dumps(arguments))
+    answer = record.get("answer")
+    return {
+        "completion": "\n".join(parts),
+        "answer": "" if answer is None else str(answer),
+    }
+
+
+def _shard_of(term):
+    return zlib.crc32(term.encode()) % SHARDS
+
+
+def _put_varint(out, n):
+    while n >= 0x80:
+        out.append((n & 0x7F) | 0x80)
+        n >>= 7
+    out.append(n)
+
+
+def _get_varint(data, i):
+    n = shift = 0
+    while True:
+        byte = data[i]
+        i += 1
+        n |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return n, i
+        shift += 7
+
+
+def _encode_shard(postings):
+    """Bytes of one shard: per term, its length and UTF-8 text, then its doc count and id deltas."""
+    out = bytearray()
+    for term in sorted(postings):
+        encoded = term.encode()
+        _put_varint(out, len(encoded))
+        out += encoded
+        ids = postings[term]
+        _put_varint(out, len(ids))
+        previous = 0
+        for doc in ids:
+            _put_varint(out, doc - previous)
+            previous = doc
+    return zlib.compress(bytes(out))
+
+
+def _decode_shard(data):
+    """{term: (start, count)} of a decompressed shard; postings are decoded on demand."""
+    terms = {}
+    i = 0
+    while i < len(data):
+        length, i = _get_varint(data, i)
+        term = data[i:i + length].decode()
+        i += length
+        count, i = _get_varint(data, i)
+        terms[term] = (i, count)
+        for _ in range(count):
+            _, i = _get_varint(data, i)
+    return terms
+
+
+def _postings(data, start, count):
+    ids = []
+    doc = 0
+    i = start
+    for _ in range(count):
+        delta, i = _get_varint(data, i)
+        doc += delta
+        ids.append(doc)
+    return ids
+
+
+def _write_atomic(path, data):
+    tmp = path.with_name(path.name + f".{os.getpid()}.tmp")
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def index_dir(search_dir, model_key, dataset):
+    """Directory of one log's index."""
+    return Path(search_dir) / dataset / model_key
+
+
+def build_log_index(filepath, out_dir):
+    """Index every rollout of one log into out_dir; returns the index's meta dict."""
+    st = os.stat(filepath)
+    postings = defaultdict(list)
+    docs = {"task_ids": [], "positions": [], "lengths": [], "scores": []}
+
+    position = 0
+    with LineReader(filepath) as lines:
+        for line in lines:
+            start, position = position, position + len(line)
+            if not line.strip():
+                continue
+            try:
+                record = decode_rollout(line)
+            except MalformedRecord as e:
+                # Left out of the index, so searches never return it
+                skip_malformed(e, filepath, start)
+                continue
+            doc = len(docs["positions"])
+            docs["task_ids"].append(record["info"].get("task_id", ""))
+            docs["positions"].append(start)
+            docs["lengths"].append(len(line))
+            docs["scores"].append(record.get("score_correctness", 0))
+            for field, text in field_texts(record).items():
+                prefix = FIELDS[field]
+                for token in tokenize(text):
+                    postings[f"{prefix}:{token}"].append(doc)
+
+    shards = [{} for _ in range(SHARDS)]
+    for term, ids in postings.items():
+        shards[_shard_of(term)][term] = ids
+
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    for n, shard in enumerate(shards):
+        _write_atomic(out_dir / f"{n:02d}.z", _encode_shard(shard))
+    _write_atomic(out_dir / "docs.z", zlib.compress(json.dumps(docs).encode()))
+    meta = {
+        "version": INDEX_VERSION,
+        "source": str(Path(filepath).resolve()),
+        "size": st.st_size,
+        "mtime_ns": st.st_mtime_ns,
+        "rollouts": len(docs["positions"]),
+        "terms": len(postings),
+    }
+    _write_atomic(out_dir / "meta.json", json.dumps(meta).encode())
+    return meta
+
+
+def load_meta(directory):
+    """A log index's meta dict, or None if it is missing or from another index version."""
+    try:
+        with open(Path(directory) / "meta.json") as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return meta if meta.get("version") == INDEX_VERSION else None
+
+
+def is_fresh(meta, filepath):
+    """Whether an index built as meta still matches the log at filepath."""
+    try:
+        st = os.stat(filepath)
+    except OSError:
+        return False
+    return (meta is not None and meta["source"] == str(Path(filepath).resolve())
+            and (meta["size"], meta["mtime_ns"]) == (st.st_size, st.st_mtime_ns))
+
+
+class SearchIndex:
+    """Token queries over the indexed rollout logs of every model."""
+
+    def __init__(self, search_dir=SEARCH_DIR):
+        self.search_dir = Path(search_dir)
+        self._shards = {}
+        self._docs = {}
+
+    def sync_log(self, filepath, model_key, dataset):
+        """Index a log unless its index is fresh; returns True if it was (re)built."""
+        directory = index_dir(self.search_dir, model_key, dataset)
+        if not Path(filepath).exists() or is_fresh(load_meta(directory), filepath):
+            return False
+        build_log_index(filepath, directory)
+        self._shards = {k: v for k, v in self._shards.items() if k[0] != directory}
+        self._docs.pop(directory, None)
+        return True
+
+    def logs(self, models=None, datasets=None):
+        """(model key, dataset, index directory, meta) of every indexed log."""
+        found = []
+        for meta_path in sorted(self.search_dir.glob("*/*/meta.json")):
+            directory = meta_path.parent
+            model_key, dataset = directory.name, directory.parent.name
+            if models is not None and model_key not in models:
+                continue
+            if datasets is not None and dataset not in datasets:
+                continue
+            meta = load_meta(directory)
+            if meta is not None:
+                found.append((model_key, dataset, directory, meta))
+        return found
+
+    def _shard(self, directory, n):
+        key = (directory, n)
+        if key not in self._shards:
+            with open(directory / f"{n:02d}.z", "rb") as f:
+                data = zlib.decompress(f.read())
+            self._shards[key] = (data, _decode_shard(data))
+        return self._shards[key]
+
+    def docs(self, directory):
+        """Per-rollout columns of one log index: task_ids, positions, lengths, scores."""
+        if directory not in self._docs:
+            with open(directory / "docs.z", "rb") as f:
+                self._docs[directory] = json.loads(zlib.decompress(f.read()))
+        return self._docs[directory]
+
+    def postings(self, directory, token, fields=tuple(FIELDS)):
+        """Sorted doc ids of one log whose given fields contain token."""
+        ids = set()
+        for field in fields:
+            term = f"{FIELDS[field]}:{token}"
+            data, terms = self._shard(directory, _shard_of(term))
+            if term in terms:
+                ids.update(_postings(data, *terms[term]))
+        return sorted(ids)
+
+    def search(self, query, fields=tuple(FIELDS), models=None, datasets=None, failed=False,
+               exact=False, limit=None):
+        """
+        Rollouts matching query, as hit dicts in log and file order.
+
+        Each hit has model, dataset, task_id, position (byte offset into
+        the decompressed log) and score_correctness. failed keeps only
+        rollouts scored below the correct threshold; exact re-reads the
+        candidates and keeps those whose fields contain the query text.
+        """
+        tokens = sorted(tokenize(query), key=len, reverse=True)
+        if not tokens:
+            return []
+
+        hits = []
+        for model_key, dataset, directory, meta in self.logs(models, datasets):
+            ids = None
+            # Longest tokens first: usually the rarest, so the candidate set shrinks fastest
+            for token in tokens:
+                found = self.postings(directory, token, fields)
+                ids = found if ids is None else sorted(set(ids).intersection(found))
+                if not ids:
+                    break
+            if not ids:
+                continue
+
+            docs = self.docs(directory)
+            if failed:
+                ids = [doc for doc in ids if docs["scores"][doc] < CORRECT_THRESHOLD]
+            if exact and ids:
+                needle = query.lower()
+                records = self.fetch(meta["source"], [(docs["positions"][d], docs["lengths"][d]) for d in ids])
+                ids = [doc for doc, record in zip(ids, records)
+                       if any(needle in text.lower() for field, text in field_texts(record).items()
+                              if field in fields)]
+            for doc in ids:
+                hits.append({
+                    "model": model_key,
+                    "dataset": dataset,
+                    "task_id": docs["task_ids"][doc],
+                    "position": docs["positions"][doc],
+                    "length": docs["lengths"][doc],
+                    "score_correctness": docs["scores"][doc],
+                    "source": meta["source"],
+                })
+                if limit is not None and len(hits) >= limit:
+                    return hits
+        return hits
+
+    @staticmethod
+    def fetch(filepath, spans):
+        """Decoded records at sorted (position, length) spans of a log, in order."""
+        if not is_compressed(filepath):
+            return list(iter_indexed(filepath, spans))
+        # No random access into a compressed stream: one pass picks out the spans
+        wanted = {position for position, _ in spans}
+        records = {}
+        position = 0
+        with LineReader(filepath) as lines:
+            for line in lines:
+                if position in wanted:
+                    records[position] = decode_rollout(line)
+                    if len(records) == len(wanted):
+                        break
+                position += len(line)
+        return [records[position] for position, _ in spans]
+
+    def records(self, hits):
+        """The rollout record of each hit, in order, each log read once."""
+        by_source = defaultdict(list)
+        for i, hit in enumerate(hits):
+            by_source[hit["source"]].append((hit["position"], hit["length"], i))
+        records = [None] * len(hits)
+        for source, entries in by_source.items():
+            entries.sort()
+            for (_, _, i), record in zip(entries, self.fetch(source, [(p, n) for p, n, _ in entries])):
+                records[i] = record
+        return records
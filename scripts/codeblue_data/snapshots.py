@@ -0,0 +1,345 @@
+"""
+Versioned snapshots of built final25 payloads, for run-to-run comparison.
+
+Every build overwrites final25-data.json, so history is kept separately:
+``save_snapshot`` stores the parts of a payload that regressions show up
+in, and ``diff_snapshots`` and ``trend`` compare runs from those alone,
+without reading a rollout log.
+
+A snapshot is one binary file per run, ``<suite>/<run id>.snap``:
+
+- the magic line ``CBSNAP1``, then a 4-byte little-endian header length
+  and a JSON header: run metadata, model keys, task ids, and the type code,
+  offset and length of every column;
+- the columns, as raw little-endian ``array`` bytes one after the other.
+
+Model x task matrices (correct, partial and total counts over every
+sampled rollout, not just the ones the payload shows) are stored row-major
+by model. Leaderboard columns
+(rank, completeness, bank/road/combined % and average reward from the
+results file, and the % correct of the sampled rollouts) have one entry
+per model. A reader seeks straight to the columns it needs, so a
+trend over many runs reads only the leaderboard.
+
+A payload whose snapshot content equals the suite's latest snapshot is not
+stored again.
+"""
+
+import hashlib
+import json
+import struct
+import sys
+from array import array
+from datetime import datetime
+from pathlib import Path
+
+from .columns import RolloutColumns
+
+SNAPSHOT_DIR = Path(__file__).parent.parent.parent / "snapshots"
+
+MAGIC = b"CBSNAP1\n"
+
+# Bump when the header or column layout changes
+SNAPSHOT_VERSION = 1
+
+# Column name -> array type code (sizes that are the same on every platform)
+MATRIX_COLUMNS = {"correct": "i", "partial": "i", "total": "i"}
+LEADERBOARD_COLUMNS = {
+    "rank": "i",
+    "complete": "b",
+    "bank_pct": "d",
+    "road_pct": "d",
+    "total_pct": "d",
+    "avg_reward": "d",
+    "sampled_pct": "d",
+}
+
+# Leaderboard metrics compared by diff_snapshots
+METRICS = ("bank_pct", "road_pct", "total_pct", "avg_reward", "sampled_pct")
+
+# Unranked (incomplete) models
+NO_RANK = -1
+
+
+def leaderboard_ranks(models):
+    """Rank of each model, 1 = best combined %, then average reward; NO_RANK if incomplete."""
+    ranked = sorted((m for m in models if m["complete"]),
+                    key=lambda m: (m["combined"]["pct"], m["avgReward"]), reverse=True)
+    ranks = {m["model"]: i + 1 for i, m in enumerate(ranked)}
+    return [ranks.get(m["model"], NO_RANK) for m in models]
+
+
+def snapshot_columns(payload, ingested):
+    """
+    (model keys, task ids, {column: array}) of a final25 payload.
+
+    The model x task matrices and sampled_pct count every sampled rollout
+    in ingested (the ``{model key: {"bank", "road"}}`` ingestion output the
+    payload was built from), not the rollouts each model entry shows.
+    """
+    models = payload["models"]
+    model_keys = [m["model"] for m in models]
+    task_ids = [t["id"] for t in payload["tasks"]]
+    counts = RolloutColumns.from_ingested(model_keys, task_ids, ingested).task_model_counts()
+    n_models = len(model_keys)
+
+    columns = {name: array(code) for name, code in MATRIX_COLUMNS.items()}
+    sampled_pct = []
+    for model_i in range(n_models):
+        correct_sum = total_sum = 0
+        for task_i in range(len(task_ids)):
+            wrong, partial, correct = counts[task_i * n_models + model_i]
+            total = wrong + partial + correct
+            columns["correct"].append(correct)
+            columns["partial"].append(partial)
+            columns["total"].append(total)
+            correct_sum += correct
+            total_sum += total
+        sampled_pct.append(round(100 * correct_sum / total_sum, 1) if total_sum else 0.0)
+
+    leaderboard = {
+        "rank": leaderboard_ranks(models),
+        "complete": [int(m["complete"]) for m in models],
+        "bank_pct": [m["bank"]["pct"] for m in models],
+        "road_pct": [m["road"]["pct"] for m in models],
+        "total_pct": [m["combined"]["pct"] for m in models],
+        "avg_reward": [m["avgReward"] for m in models],
+        "sampled_pct": sampled_pct,
+    }
+    for name, code in LEADERBOARD_COLUMNS.items():
+        columns[name] = array(code, leaderboard[name])
+    return model_keys, task_ids, columns
+
+
+def _little_endian(column):
+    if sys.byteorder == "big":
+        column = array(column.typecode, column)
+        column.byteswap()
+    return column.tobytes()
+
+
+def _digest(model_keys, task_ids, blobs):
+    h = hashlib.sha256(json.dumps([model_keys, task_ids]).encode())
+    for name, blob in blobs:
+        h.update(name.encode())
+        h.update(blob)
+    return h.hexdigest()
+
+
+def suite_dir(snapshot_dir, suite_name):
+    """Directory holding one suite's snapshots."""
+    return Path(snapshot_dir) / suite_name
+
+
+def list_snapshots(snapshot_dir, suite_name):
+    """Snapshot paths of a suite, oldest first."""
+    return sorted(suite_dir(snapshot_dir, suite_name).glob("*.snap"))
+
+
+def save_snapshot(payload, ingested, suite_name, snapshot_dir=SNAPSHOT_DIR, run_id=None):
+    """
+    Store a final25 payload's snapshot; returns its path.
+
+    ingested holds the sampled records the payload was built from.
+
+    Returns None if the payload matches the suite's latest snapshot.
+    run_id defaults to the current time, so ids sort in run order.
+    """
+    model_keys, task_ids, columns = snapshot_columns(payload, ingested)
+    blobs = [(name, _little_endian(column)) for name, column in columns.items()]
+    digest = _digest(model_keys, task_ids, blobs)
+
+    existing = list_snapshots(snapshot_dir, suite_name)
+    if existing and read_header(existing[-1])["digest"] == digest:
+        return None
+
+    if run_id is None:
+        run_id = datetime.now().strftime("%Y%m%dT%H%M%S%f")
+    layout = []
+    offset = 0
+    for (name, blob), column in zip(blobs, columns.values()):
+        layout.append({"name": name, "type": column.typecode, "offset": offset, "length": len(blob)})
+        offset += len(blob)
+    header = {
+        "snapshot_version": SNAPSHOT_VERSION,
+        "run": run_id,
+        "created": datetime.now().isoformat(),
+        "suite": suite_name,
+        "generated": payload.get("generated"),
+        "version": payload.get("version"),
+        "digest": digest,
+        "models": model_keys,
+        "tasks": task_ids,
+        "columns": layout,
+    }
+    encoded = json.dumps(header, separators=(",", ":")).encode()
+
+    directory = suite_dir(snapshot_dir, suite_name)
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"{run_id}.snap"
+    tmp = path.with_suffix(".snap.tmp")
+    with open(tmp, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<I", len(encoded)))
+        f.write(encoded)
+        for _, blob in blobs:
+            f.write(blob)
+    tmp.replace(path)
+    return path
+
+
+def _open_header(f, path):
+    if f.read(len(MAGIC)) != MAGIC:
+        raise ValueError(f"{path} is not a snapshot file")
+    (length,) = struct.unpack("<I", f.read(4))
+    header = json.loads(f.read(length))
+    if header.get("snapshot_version") != SNAPSHOT_VERSION:
+        raise ValueError(f"{path} has snapshot version {header.get('snapshot_version')}, "
+                         f"expected {SNAPSHOT_VERSION}")
+    return header, len(MAGIC) + 4 + length
+
+
+def read_header(path):
+    """A snapshot's JSON header."""
+    with open(path, "rb") as f:
+        return _open_header(f, path)[0]
+
+
+def read_snapshot(path, columns=None):
+    """
+    (header, {column: array}) of a snapshot.
+
+    columns names the columns to read (default: all); the others are
+    skipped without being read.
+    """
+    with open(path, "rb") as f:
+        header, start = _open_header(f, path)
+        loaded = {}
+        for spec in header["columns"]:
+            if columns is not None and spec["name"] not in columns:
+                continue
+            f.seek(start + spec["offset"])
+            column = array(spec["type"])
+            column.frombytes(f.read(spec["length"]))
+            if sys.byteorder == "big":
+                column.byteswap()
+            loaded[spec["name"]] = column
+    return header, loaded
+
+
+def find_snapshot(snapshot_dir, suite_name, ref):
+    """
+    Path of the snapshot ref names: a run id or unique prefix of one,
+    "latest", or "latest~N" for the Nth run before the latest.
+    """
+    paths = list_snapshots(snapshot_dir, suite_name)
+    if not paths:
+        raise ValueError(f"no snapshots of suite {suite_name!r} in {snapshot_dir}")
+    if ref == "latest" or ref.startswith("latest~"):
+        back = int(ref[len("latest~"):] or 0) if ref != "latest" else 0
+        if back >= len(paths):
+            raise ValueError(f"only {len(paths)} snapshots of suite {suite_name!r}")
+        return paths[-1 - back]
+    matches = [p for p in paths if p.stem.startswith(ref)]
+    if len(matches) != 1:
+        raise ValueError(f"{'no' if not matches else 'ambiguous'} snapshot {ref!r} of suite {suite_name!r}")
+    return matches[0]
+
+
+def _pass(correct, total):
+    """Whether a model x task cell counts as solved: a majority of its rollouts correct."""
+    return total > 0 and 2 * correct > total
+
+
+def diff_snapshots(old_path, new_path):
+    """
+    Changes between two snapshots of a suite.
+
+    Returns {"from", "to", "added", "removed", "ranks", "flips", "metrics"}:
+    models only in the new or the old run, rank changes of every model in
+    either run, the model x task cells that became solved or unsolved, and
+    leaderboard metric deltas of models in both runs.
+    """
+    old_header, old = read_snapshot(old_path)
+    new_header, new = read_snapshot(new_path)
+    old_models = {key: i for i, key in enumerate(old_header["models"])}
+    new_models = {key: i for i, key in enumerate(new_header["models"])}
+
+    ranks = []
+    for key in list(new_header["models"]) + [k for k in old_header["models"] if k not in new_models]:
+        before = old["rank"][old_models[key]] if key in old_models else None
+        after = new["rank"][new_models[key]] if key in new_models else None
+        before = None if before == NO_RANK else before
+        after = None if after == NO_RANK else after
+        if before != after:
+            ranks.append({"model": key, "from": before, "to": after,
+                          "change": before - after if before is not None and after is not None else None})
+
+    metrics = []
+    for key, j in new_models.items():
+        i = old_models.get(key)
+        if i is None:
+            continue
+        deltas = {name: round(new[name][j] - old[name][i], 4) for name in METRICS}
+        if any(deltas.values()):
+            metrics.append(dict({"model": key}, **deltas))
+
+    flips = []
+    old_tasks = {task_id: t for t, task_id in enumerate(old_header["tasks"])}
+    n_old, n_new = len(old_header["tasks"]), len(new_header["tasks"])
+    for key, j in new_models.items():
+        i = old_models.get(key)
+        if i is None:
+            continue
+        for t_new, task_id in enumerate(new_header["tasks"]):
+            t_old = old_tasks.get(task_id)
+            if t_old is None:
+                continue
+            a = i * n_old + t_old
+            b = j * n_new + t_new
+            was = _pass(old["correct"][a], old["total"][a])
+            now = _pass(new["correct"][b], new["total"][b])
+            if was != now:
+                flips.append({
+                    "model": key,
+                    "task": task_id,
+                    "now": "solved" if now else "unsolved",
+                    "from": [old["correct"][a], old["total"][a]],
+                    "to": [new["correct"][b], new["total"][b]],
+                })
+
+    ranks.sort(key=lambda r: (r["to"] is None, r["to"] or 0))
+    return {
+        "from": old_header["run"],
+        "to": new_header["run"],
+        "added": [key for key in new_header["models"] if key not in old_models],
+        "removed": [key for key in old_header["models"] if key not in new_models],
+        "ranks": ranks,
+        "flips": flips,
+        "metrics": metrics,
+    }
+
+
+def trend(snapshot_dir, suite_name, limit=None):
+    """
+    Rank and combined % of every model across a suite's runs, oldest first.
+
+    Only the leaderboard columns of each snapshot are read. Returns
+    {"runs": [{"run", "created"}], "models": {key: {"rank": [...],
+    "total_pct": [...]}}} with None where a model was absent or unranked.
+    """
+    paths = list_snapshots(snapshot_dir, suite_name)
+    if limit is not None:
+        paths = paths[-limit:]
+
+    runs = []
+    models = {}
+    for n, path in enumerate(paths):
+        header, columns = read_snapshot(path, ("rank", "total_pct"))
+        runs.append({"run": header["run"], "created": header["created"]})
+        for i, key in enumerate(header["models"]):
+            entry = models.setdefault(key, {"rank": [None] * len(paths), "total_pct": [None] * len(paths)})
+            rank = columns["rank"][i]
+            entry["rank"][n] = None if rank == NO_RANK else rank
+            entry["total_pct"][n] = columns["total_pct"][i]
+    return {"suite": suite_name, "runs": runs, "models": models}
@@ -0,0 +1,347 @@
+"""
+Embedded SQLite store of rollout records.
+
+An alternative to the JSON build cache: every record of a rollout log is
+loaded once into a local SQLite database, with the columns the reports
+slice on (model, provider, dataset, task id, scores) next to the raw JSON
+line. The tables look like:
+
+    logs(path, model, dataset, size, mtime_ns, sha256)
+    rollouts(log, model, provider, dataset, task_id, ordinal, position,
+             score_correctness, score_efficiency, reward, record)
+    tasks(id, dataset, level, template, record)
+
+with indexes on model, task id, template and level. ``ordinal`` is a
+record's index among the records of its task in the log, so the "first"
+sampling policy is a range lookup and the reservoir policy only walks the
+selected tasks' rows. A log is reloaded only when its fingerprint changes,
+so the store doubles as a cache between runs, and ``RolloutStore`` has the
+same ``fetch_many`` interface as ``BuildCache`` to slot into ingestion.
+
+Ad-hoc slices over every stored rollout (say per template x provider, or
+per level x model) are indexed GROUP BY queries; see ``RolloutStore.counts``
+and ``scripts/query_rollouts.py``. The transforms' outputs are not queried
+from the store: they are built from the sampled records it returns, the
+same way as with the build cache.
+"""
+
+import json
+import os
+import sqlite3
+from pathlib import Path
+
+from .cache import file_hash, fingerprint
+from .columns import CORRECT_THRESHOLD, PARTIAL_THRESHOLD
+from .compressed import LineReader
+from .ingest import READ_STATS, log_owner
+from .records import MalformedRecord, decode_rollout, skip_malformed
+from .sampling import TaskSampler
+
+STORE_FILE = Path(__file__).parent.parent.parent / ".cache" / "rollouts.sqlite"
+
+# Bump when the schema changes; an older store is rebuilt from scratch
+STORE_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS logs (
+    path TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    dataset TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    sha256 TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS rollouts (
+    id INTEGER PRIMARY KEY,
+    log TEXT NOT NULL,
+    model TEXT NOT NULL,
+    provider TEXT NOT NULL,
+    dataset TEXT NOT NULL,
+    task_id TEXT NOT NULL,
+    ordinal INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    score_correctness REAL,
+    score_efficiency REAL,
+    reward REAL,
+    record TEXT NOT NULL,
+    UNIQUE (log, position)
+);
+CREATE INDEX IF NOT EXISTS rollouts_log_task ON rollouts (log, task_id, ordinal);
+CREATE INDEX IF NOT EXISTS rollouts_model ON rollouts (model, task_id);
+CREATE INDEX IF NOT EXISTS rollouts_task ON rollouts (task_id);
+CREATE TABLE IF NOT EXISTS tasks (
+    id TEXT PRIMARY KEY,
+    dataset TEXT NOT NULL,
+    level TEXT,
+    template TEXT,
+    record TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tasks_template ON tasks (template);
+CREATE INDEX IF NOT EXISTS tasks_level ON tasks (level);
+"""
+
+# Columns counts() can group by
+DIMENSIONS = {
+    "model": "r.model",
+    "provider": "r.provider",
+    "dataset": "r.dataset",
+    "task_id": "r.task_id",
+    "template": "t.template",
+    "level": "t.level",
+}
+
+# Rows inserted, and committed, per batch while loading a log
+INSERT_BATCH = 1000
+
+
+class RolloutStore:
+    """SQLite-backed store of rollout records, usable in place of a BuildCache."""
+
+    def __init__(self, path=STORE_FILE):
+        self.path = Path(path)
+        self.hits = 0
+        self.misses = 0
+        self._conn = None
+
+    def __getstate__(self):
+        # Connections don't cross process boundaries; workers reopen
+        state = dict(self.__dict__)
+        state["_conn"] = None
+        return state
+
+    @property
+    def conn(self):
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=60)
+            conn.execute("PRAGMA journal_mode=WAL")
+            if conn.execute("PRAGMA user_version").fetchone()[0] != STORE_VERSION:
+                self._create_schema(conn)
+            self._conn = conn
+        return self._conn
+
+    @staticmethod
+    def _create_schema(conn):
+        """
+        (Re)create the tables unless another connection just did.
+
+        Pool workers open the store concurrently, so the version is
+        checked again under the write lock that BEGIN IMMEDIATE takes;
+        the statements run one by one because executescript would commit
+        and release the lock first.
+        """
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            if conn.execute("PRAGMA user_version").fetchone()[0] == STORE_VERSION:
+                return
+            for table in ("logs", "rollouts", "tasks"):
+                conn.execute(f"DROP TABLE IF EXISTS {table}")
+            for statement in SCHEMA.split(";"):
+                if statement.strip():
+                    conn.execute(statement)
+            conn.execute(f"PRAGMA user_version = {STORE_VERSION}")
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _is_fresh(self, key, st):
+        """Whether the stored copy of a log matches the file, as BuildCache.lookup decides."""
+        row = self.conn.execute("SELECT size, mtime_ns, sha256 FROM logs WHERE path = ?",
+                                (key,)).fetchone()
+        if row is None or row[0] != st.st_size:
+            return False
+        if row[1] != st.st_mtime_ns:
+            if file_hash(key) != row[2]:
+                return False
+            with self.conn:
+                self.conn.execute("UPDATE logs SET mtime_ns = ? WHERE path = ?", (st.st_mtime_ns, key))
+        return True
+
+    def load_log(self, filepath, model_key, dataset):
+        """
+        (Re)load every record of a rollout log. Returns the number of records.
+
+        Rows are committed every INSERT_BATCH records so other workers'
+        writes are not locked out for a whole log; the log's fingerprint
+        row goes in last, so a load that is cut short is redone next time.
+        """
+        key = str(Path(filepath).resolve())
+        provider = model_key.split("--")[0]
+        fp = fingerprint(filepath)
+        ordinals = {}
+        rows = []
+        count = skipped = nbytes = 0
+
+        with self.conn as conn:
+            conn.execute("DELETE FROM logs WHERE path = ?", (key,))
+            conn.execute("DELETE FROM rollouts WHERE log = ?", (key,))
+        with LineReader(filepath) as lines:
+            position = 0
+            for line in lines:
+                start, position = position, position + len(line)
+                if not line.strip():
+                    continue
+                try:
+                    record = decode_rollout(line)
+                except MalformedRecord as e:
+                    # Not stored, so samples never meet it
+                    skip_malformed(e, filepath, start)
+                    skipped += 1
+                    continue
+                task_id = record["info"].get("task_id", "")
+                ordinal = ordinals.get(task_id, 0)
+                ordinals[task_id] = ordinal + 1
+                rows.append((key, model_key, provider, dataset, task_id, ordinal, start,
+                             record.get("score_correctness"), record.get("score_efficiency"),
+                             record.get("reward"), line.decode()))
+                count += 1
+                if len(rows) >= INSERT_BATCH:
+                    self._insert(rows)
+                    rows = []
+            nbytes = position
+        self._insert(rows)
+        # Only record the fingerprint if the file didn't change while loading
+        st = os.stat(filepath)
+        if (st.st_size, st.st_mtime_ns) == (fp["size"], fp["mtime_ns"]):
+            with self.conn as conn:
+                conn.execute("INSERT INTO logs VALUES (?, ?, ?, ?, ?, ?)",
+                             (key, model_key, dataset, fp["size"], fp["mtime_ns"], fp["sha256"]))
+
+        READ_STATS.add({"records_read": count + skipped, "records_decoded": count,
+                        "records_skipped": skipped, "bytes_read": nbytes})
+        return count
+
+    def _insert(self, rows):
+        if not rows:
+            return
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO rollouts (log, model, provider, dataset, task_id, ordinal, position, "
+                "score_correctness, score_efficiency, reward, record) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+
+    def sync_log(self, filepath, model_key, dataset):
+        """Load a log unless the store already holds its current contents. Returns True if loaded."""
+        key = str(Path(filepath).resolve())
+        if not Path(filepath).exists():
+            with self.conn as conn:
+                conn.execute("DELETE FROM rollouts WHERE log = ?", (key,))
+                conn.execute("DELETE FROM logs WHERE path = ?", (key,))
+            return False
+        if self._is_fresh(key, os.stat(filepath)):
+            return False
+        self.load_log(filepath, model_key, dataset)
+        return True
+
+    def sync_tasks(self, task_records):
+        """Replace the stored task definitions."""
+        with self.conn as conn:
+            conn.execute("DELETE FROM tasks")
+            conn.executemany(
+                "INSERT INTO tasks VALUES (?, ?, ?, ?, ?)",
+                [(t["id"], t["dataset"], t.get("level"), t.get("template"), json.dumps(t))
+                 for t in task_records])
+
+    def sample(self, filepath, params_list):
+        """
+        Sampled records of a stored log, one list per params.
+
+        Candidate rows come from indexed lookups on (log, task_id,
+        ordinal) and are fed to the same samplers a file scan uses, so the
+        sample is identical; only the kept records are decoded.
+        """
+        key = str(Path(filepath).resolve())
+        samplers = [TaskSampler(params) for params in params_list]
+        for sampler in samplers:
+            params = sampler.params
+            query = ("SELECT task_id, position FROM rollouts "
+                     "WHERE log = ? AND task_id IN (SELECT value FROM json_each(?))")
+            args = [key, json.dumps(params["task_ids"])]
+            if params["policy"] == "first":
+                query += " AND ordinal < ?"
+                args.append(params["samples_per_task"])
+            for task_id, position in self.conn.execute(query + " ORDER BY position", args):
+                slot = sampler.accept(task_id, position)
+                if slot is not None:
+                    sampler.keep(task_id, slot, position, None)
+
+        positions = sorted({position for sampler in samplers for position, _ in sampler.kept_entries()})
+        records = {}
+        nbytes = 0
+        for position, line in self.conn.execute(
+                "SELECT position, record FROM rollouts "
+                "WHERE log = ? AND position IN (SELECT value FROM json_each(?))",
+                (key, json.dumps(positions))):
+            records[position] = decode_rollout(line)
+            # Records are stored as text; count the bytes read from the log
+            nbytes += len(line.encode())
+        for sampler in samplers:
+            sampler.fill(records)
+        READ_STATS.add({"records_read": len(records), "records_decoded": len(records),
+                        "bytes_read": nbytes})
+        return [sampler.rollouts() for sampler in samplers]
+
+    def fetch_many(self, filepath, params_list, read=None):
+        """
+        Sampled records for each params in params_list, as BuildCache.fetch_many.
+
+        The log is (re)loaded into the store if it is new or changed, and
+        the samples are then drawn from the store; read is not needed.
+        """
+        model_key, dataset = log_owner(filepath)
+        if self.sync_log(filepath, model_key, dataset):
+            self.misses += len(params_list)
+        else:
+            self.hits += len(params_list)
+        return self.sample(filepath, params_list)
+
+    def counts(self, by, task_ids=None, models=None):
+        """
+        Outcome counts per combination of the ``by`` dimensions.
+
+        by is a list of DIMENSIONS keys. Every stored rollout counts, not
+        just sampled ones; task_ids and models restrict the rows. Returns a
+        list of dicts with the dimension values plus correct, partial,
+        total, pct and avg_reward, ordered by the dimensions.
+        """
+        unknown = [dim for dim in by if dim not in DIMENSIONS]
+        if unknown:
+            raise ValueError(f"unknown dimension {unknown[0]!r} (expected one of {', '.join(DIMENSIONS)})")
+
+        columns = [DIMENSIONS[dim] for dim in by]
+        where, args = [], [CORRECT_THRESHOLD, PARTIAL_THRESHOLD, CORRECT_THRESHOLD]
+        if task_ids is not None:
+            where.append("r.task_id IN (SELECT value FROM json_each(?))")
+            args.append(json.dumps(sorted(task_ids)))
+        if models is not None:
+            where.append("r.model IN (SELECT value FROM json_each(?))")
+            args.append(json.dumps(sorted(models)))
+
+        select = ", ".join(columns)
+        query = (f"SELECT {select + ', ' if select else ''}"
+                 "SUM(r.score_correctness >= ?), "
+                 "SUM(r.score_correctness >= ? AND r.score_correctness < ?), "
+                 "COUNT(*), AVG(r.reward) "
+                 "FROM rollouts r LEFT JOIN tasks t ON t.id = r.task_id")
+        if where:
+            query += " WHERE " + " AND ".join(where)
+        if columns:
+            query += f" GROUP BY {select} ORDER BY {select}"
+
+        rows = []
+        for row in self.conn.execute(query, args):
+            correct, partial, total, avg_reward = row[len(by):]
+            if not total:
+                continue
+            entry = dict(zip(by, row[:len(by)]))
+            entry.update({
+                "correct": correct,
+                "partial": partial,
+                "total": total,
+                "pct": round(correct / total * 100, 1),
+                "avg_reward": round(avg_reward, 4) if avg_reward is not None else None,
+            })
+            rows.append(entry)
+        return rows
@@ -0,0 +1,134 @@
+"""
+Named benchmark suites, read from a JSON manifest.
+
+A suite picks the bank and road tasks to report on, how their rollouts are
+sampled, how many rollouts the trajectory viewer shows and which models
+take part. Suites live in ``scripts/suites.json``; a suite may ``extend``
+another and override some of its keys:
+
+    {
+      "default": "final25",
+      "suites": {
+        "final25": {
+          "bank": ["bank_hard_001", ...],
+          "road": ["road_hard_002", ...],
+          "sampling": {"policy": "first", "per_task": 3},
+          "rollouts_shown": 15
+        },
+        "final25-reservoir": {
+          "extends": "final25",
+          "sampling": {"policy": "reservoir", "per_task": 3, "seed": 0}
+        }
+      }
+    }
+
+The default suite writes to the paths the site reads; every other suite
+writes the same file layout under ``output_dir`` (by default
+``build/suites/<name>``).
+"""
+
+import json
+from pathlib import Path
+
+from .sampling import sampling_params
+
+MANIFEST_FILE = Path(__file__).parent.parent / "suites.json"
+REPO_ROOT = Path(__file__).parent.parent.parent
+SUITE_OUTPUT_DIR = Path("build") / "suites"
+
+SUITE_KEYS = {"description", "extends", "bank", "road", "sampling", "rollouts_shown", "models", "output_dir"}
+
+
+class Suite:
+    """One benchmark suite: its tasks, sampling policy and output location."""
+
+    def __init__(self, name, bank, road, sampling=None, rollouts_shown=15, models=None,
+                 output_dir=None, description=""):
+        sampling = sampling or {}
+        self.name = name
+        self.description = description
+        self.bank_ids = set(bank)
+        self.road_ids = set(road)
+        self.per_task = sampling.get("per_task", 3)
+        self.policy = sampling.get("policy", "first")
+        self.seed = sampling.get("seed", 0)
+        self.rollouts_shown = rollouts_shown
+        self.models = set(models) if models is not None else None
+        self.output_dir = output_dir
+
+        # Validate the sampling options up front
+        self.sampling_params("bank")
+
+    @property
+    def task_ids(self):
+        return self.bank_ids | self.road_ids
+
+    def sampling_params(self, dataset):
+        """Sampling parameters for the "bank" or "road" logs."""
+        task_ids = self.bank_ids if dataset == "bank" else self.road_ids
+        return sampling_params(task_ids, self.per_task, self.policy, self.seed)
+
+    def includes(self, model_key):
+        return self.models is None or model_key in self.models
+
+    def select(self, results):
+        """The entries of final_25_results.json that belong to this suite."""
+        return [r for r in results if self.includes(r["model"])]
+
+    def output_path(self, path):
+        """Where this suite writes a repo output path such as OUTPUT_FILE."""
+        if self.output_dir is None:
+            return path
+        return REPO_ROOT / self.output_dir / Path(path).relative_to(REPO_ROOT)
+
+
+def _resolve(name, specs, seen=()):
+    """Suite spec with its "extends" chain merged in."""
+    if name not in specs:
+        raise ValueError(f"unknown suite {name!r}")
+    if name in seen:
+        raise ValueError(f"suite {name!r} extends itself")
+    spec = specs[name]
+    unknown = set(spec) - SUITE_KEYS
+    if unknown:
+        raise ValueError(f"suite {name!r} has unknown keys: {', '.join(sorted(unknown))}")
+    if "extends" not in spec:
+        return dict(spec)
+    merged = _resolve(spec["extends"], specs, seen + (name,))
+    merged.pop("output_dir", None)
+    merged.update(spec)
+    return merged
+
+
+def load_manifest(path=MANIFEST_FILE):
+    """Return (default suite name, {name: Suite}) from a suite manifest."""
+    with open(path) as f:
+        manifest = json.load(f)
+
+    specs = manifest["suites"]
+    default = manifest.get("default", next(iter(specs)))
+    suites = {}
+    for name in specs:
+        spec = _resolve(name, specs)
+        spec.pop("extends", None)
+        if name != default:
+            spec.setdefault("output_dir", str(SUITE_OUTPUT_DIR / name))
+        suites[name] = Suite(name, **spec)
+    return default, suites
+
+
+def load_suites(names=None, path=MANIFEST_FILE):
+    """Suites named in names (default: the manifest's default suite), in order."""
+    default, suites = load_manifest(path)
+    selected = []
+    for name in names or [default]:
+        if name not in suites:
+            raise ValueError(f"unknown suite {name!r} (available: {', '.join(suites)})")
+        if suites[name] not in selected:
+            selected.append(suites[name])
+    return selected
+
+
+def load_suite(name=None, path=MANIFEST_FILE):
+    """A single suite, the manifest's default if name is None."""
+    return load_suites([name] if name else None, path)[0]
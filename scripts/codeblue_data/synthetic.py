@@ -0,0 +1,175 @@
+"""
+Synthetic benchmark_final_25-shaped data for benchmarking the pipeline.
+
+generate() writes final_25_results.json, final_25_tasks.jsonl and one bank
+and one road rollout log per model, with the same record layout as the
+real eval logs. Rollout counts, noise tasks and transcript sizes are all
+configurable and output is deterministic for a given seed.
+"""
+
+import json
+import random
+from pathlib import Path
+
+from .suites import load_suite
+
+PROVIDERS = ["anthropic", "openai", "google", "qwen", "deepseek", "mistralai", "meta-llama", "x-ai"]
+LEVELS = ["L4", "L5", "L6"]
+TEMPLATES = [
+    "multi_condition_filter", "grouped_ratio", "quantile_bucket", "top_k_share",
+    "conditional_mean", "rank_within_group", "rolling_delta", "null_rate",
+]
+SCORES = [0.0, 0.0, 0.2, 0.5, 0.8, 1.0, 1.0]
+
+
+def _text(rng, n_chars):
+    words = []
+    size = 0
+    while size < n_chars:
+        word = "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(2, 9)))
+        words.append(word)
+        size += len(word) + 1
+    return " ".join(words)[:n_chars]
+
+
+def _task_record(rng, task_id):
+    return {
+        "id": task_id,
+        "dataset": task_id.split("_")[0],
+        "level": rng.choice(LEVELS),
+        "template": rng.choice(TEMPLATES),
+        "goal": f"Synthetic goal for {task_id}: {_text(rng, 60)}?",
+        "expected_output_type": "scalar",
+        "golden": {"answer_value": round(rng.uniform(0, 100), 2)},
+        "tolerance": 0.01,
+        "metadata": {"slots": {"metric": "balance", "quartile": rng.choice(["Q1", "Q2", "Q3", "Q4"])}},
+        "ambiguities": ["quartile", "target"],
+    }
+
+
+def _rollout(rng, task, system_prompt, prompt_chars, turns, turn_chars):
+    expected = task["golden"]["answer_value"]
+    correctness = rng.choice(SCORES)
+    answer = expected if correctness >= 0.8 else round(expected * rng.choice([0.5, 100, 1.1]), 2)
+    info = {"task_id": task["id"], "expected": expected}
+
+    completion = []
+    for turn in range(turns):
+        completion.append({"role": "assistant", "content": _text(rng, turn_chars)})
+        if turn < turns - 1:
+            completion.append({"role": "tool", "content": _text(rng, turn_chars)})
+    completion.append({"role": "assistant", "content": f"Answer: {answer}"})
+
+    return {
+        "prompt": [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": task["goal"] + " " + _text(rng, prompt_chars)},
+        ],
+        "completion": completion,
+        "answer": str(answer),
+        "reward": round(correctness * 0.9 + rng.random() * 0.1, 4),
+        "score_correctness": correctness,
+        "score_efficiency": round(rng.random(), 2),
+        "generation_ms": rng.randint(500, 20000),
+        # Real logs carry info both as an object and as an embedded JSON string
+        "info": json.dumps(info) if rng.random() < 0.5 else info,
+    }
+
+
+def _write_log(path, rng, task_ids, tasks, rollouts_per_task, noise_ids, **sizes):
+    lines = [(task_id, i) for task_id in task_ids for i in range(rollouts_per_task)]
+    lines += [(task_id, i) for task_id in noise_ids for i in range(rollouts_per_task)]
+    rng.shuffle(lines)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    scores = []
+    with open(path, "w") as f:
+        for task_id, _ in lines:
+            task = tasks.get(task_id) or {"id": task_id, "goal": "Noise task", "golden": {"answer_value": 1.0}}
+            record = _rollout(rng, task, **sizes)
+            f.write(json.dumps(record) + "\n")
+            if task_id in tasks:
+                scores.append(record)
+    return scores
+
+
+def _summary(records):
+    correct = sum(1 for r in records if r["score_correctness"] >= 0.8)
+    partial = sum(1 for r in records if 0.2 <= r["score_correctness"] < 0.8)
+    return correct, partial, len(records)
+
+
+def generate(root, models=10, rollouts_per_task=5, noise_tasks=20, prompt_chars=400,
+             turns=4, turn_chars=300, partial_models=0.2, seed=0):
+    """
+    Write a synthetic benchmark directory under root and return its path.
+
+    models            number of models in final_25_results.json
+    rollouts_per_task rollouts logged per task per model
+    noise_tasks       extra non-benchmark task ids per log (bank and road each)
+    prompt_chars      size of each user prompt
+    turns             assistant turns per completion
+    turn_chars        size of each assistant/tool message
+    partial_models    fraction of models missing their road log
+    """
+    rng = random.Random(seed)
+    root = Path(root)
+    root.mkdir(parents=True, exist_ok=True)
+
+    suite = load_suite()
+    bank_ids, road_ids = sorted(suite.bank_ids), sorted(suite.road_ids)
+    task_ids = bank_ids + road_ids
+    tasks = {task_id: _task_record(rng, task_id) for task_id in task_ids}
+    with open(root / "final_25_tasks.jsonl", "w") as f:
+        for task_id in task_ids:
+            f.write(json.dumps(tasks[task_id]) + "\n")
+
+    system_prompt = "You are a data analyst. Solve the task using tools. " + _text(rng, prompt_chars)
+    sizes = {
+        "system_prompt": system_prompt,
+        "prompt_chars": prompt_chars,
+        "turns": turns,
+        "turn_chars": turn_chars,
+    }
+    bank_noise = [f"bank_synth_{i:04d}" for i in range(noise_tasks)]
+    road_noise = [f"road_synth_{i:04d}" for i in range(noise_tasks)]
+
+    results = []
+    for i in range(models):
+        model_key = f"{PROVIDERS[i % len(PROVIDERS)]}--synthetic-model-{i:04d}"
+        has_road = rng.random() >= partial_models
+
+        bank = _write_log(root / "bank_rescored_c1" / f"{model_key}.jsonl", rng,
+                          bank_ids, tasks, rollouts_per_task, bank_noise, **sizes)
+        road = []
+        if has_road:
+            road = _write_log(root / "eval_logs" / f"codeblue_env--{model_key}" / "results.jsonl", rng,
+                              road_ids, tasks, rollouts_per_task, road_noise, **sizes)
+
+        bank_c, bank_p, bank_t = _summary(bank)
+        road_c, road_p, road_t = _summary(road)
+        all_records = bank + road
+        results.append({
+            "model": model_key,
+            "bank_correct": bank_c,
+            "bank_total": bank_t,
+            "bank_partial": bank_p,
+            "bank_pct": round(100 * bank_c / bank_t, 1) if bank_t else 0,
+            "road_correct": road_c,
+            "road_total": road_t,
+            "road_partial": road_p,
+            "road_pct": round(100 * road_c / road_t, 1) if road_t else 0,
+            "total_correct": bank_c + road_c,
+            "total_attempts": bank_t + road_t,
+            "total_partial": bank_p + road_p,
+            "total_pct": round(100 * (bank_c + road_c) / (bank_t + road_t), 1) if bank_t + road_t else 0,
+            "avg_reward": round(sum(r["reward"] for r in all_records) / len(all_records), 4) if all_records else 0,
+            "has_bank": True,
+            "has_road": has_road,
+            "complete": has_road,
+        })
+
+    with open(root / "final_25_results.json", "w") as f:
+        json.dump(results, f, indent=2)
+
+    return root
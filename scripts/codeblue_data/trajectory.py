@@ -0,0 +1,213 @@
+"""
+Cost and latency metrics derived from rollout trajectories.
+
+Each rollout's ``completion`` message list is reduced to one row of
+counts:
+
+- ``turns``: assistant messages.
+- ``tool_calls``: ``tool`` result messages, or the entries of the
+  assistant messages' ``tool_calls`` when results are not logged.
+- ``output_chars``: characters of assistant content, and an output token
+  estimate of one token per ``CHARS_PER_TOKEN`` characters.
+- ``latency``: the record's ``generation_ms``. Logs without timing leave
+  it unset; nothing is assumed in its place.
+
+Reward per second is the timed rollouts' total reward over their total
+generation time.
+
+Rows are held in ``array`` columns like ``codeblue_data.columns`` and the
+summaries (means, p50/p95 latency, reward per second) are computed over
+whole columns at once for every group, with NumPy when it is installed
+and an equivalent pure-Python path otherwise.
+"""
+
+import math
+from array import array
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+CHARS_PER_TOKEN = 4
+
+# Latency percentiles reported per group
+PERCENTILES = (50, 95)
+
+
+def _content_chars(content):
+    """Characters in a message's content, which may be a list of parts."""
+    if content is None:
+        return 0
+    if isinstance(content, str):
+        return len(content)
+    if isinstance(content, list):
+        return sum(len(part.get("text") or "") if isinstance(part, dict) else len(str(part))
+                   for part in content)
+    return len(str(content))
+
+
+def rollout_metrics(record):
+    """(turns, tool_calls, output_chars, generation_ms or None) for one rollout record."""
+    completion = record.get("completion")
+    if not isinstance(completion, list):
+        completion = [{"role": "assistant", "content": completion}] if completion else []
+
+    turns = tool_results = requested = chars = 0
+    for message in completion:
+        if not isinstance(message, dict):
+            continue
+        role = message.get("role")
+        if role == "assistant":
+            turns += 1
+            chars += _content_chars(message.get("content"))
+            requested += len(message.get("tool_calls") or [])
+        elif role == "tool":
+            tool_results += 1
+    return turns, tool_results or requested, chars, record.get("generation_ms")
+
+
+def _percentile_sorted(values, q):
+    """q-th percentile of sorted values with linear interpolation (NumPy's default)."""
+    pos = (len(values) - 1) * q / 100
+    lo = math.floor(pos)
+    hi = min(lo + 1, len(values) - 1)
+    return values[lo] + (values[hi] - values[lo]) * (pos - lo)
+
+
+class TrajectoryColumns:
+    """Per-rollout trajectory metrics as parallel columns, tagged with a group index."""
+
+    def __init__(self):
+        self.group = array("l")
+        self.turns = array("l")
+        self.tool_calls = array("l")
+        self.output_chars = array("l")
+        # NaN where the log has no generation_ms
+        self.latency_ms = array("d")
+        self.reward = array("d")
+
+    def __len__(self):
+        return len(self.group)
+
+    def append(self, group_i, record):
+        """Add one rollout record to group group_i."""
+        turns, tool_calls, chars, latency = rollout_metrics(record)
+        self.group.append(group_i)
+        self.turns.append(turns)
+        self.tool_calls.append(tool_calls)
+        self.output_chars.append(chars)
+        self.latency_ms.append(float(latency) if latency is not None else math.nan)
+        self.reward.append(record.get("reward", 0))
+
+    @classmethod
+    def from_groups(cls, groups):
+        """Columns for a list of record lists, the i-th list forming group i."""
+        columns = cls()
+        for group_i, records in enumerate(groups):
+            for record in records:
+                columns.append(group_i, record)
+        return columns
+
+    def row(self, i):
+        """Per-example trajectory fields for row i."""
+        return {
+            "turns": self.turns[i],
+            "tool_calls": self.tool_calls[i],
+            "output_chars": self.output_chars[i],
+        }
+
+    def summaries(self, n_groups, merge=False):
+        """
+        Summary dict per group, a list of length n_groups.
+
+        With merge=True every row counts towards a single group instead.
+        Groups without rows get None.
+        """
+        groups = [0] * len(self) if merge else self.group
+        n_groups = 1 if merge else n_groups
+        if np is not None:
+            return self._summaries_numpy(groups, n_groups)
+        return self._summaries_python(groups, n_groups)
+
+    def _summaries_numpy(self, groups, n_groups):
+        group = np.asarray(groups, dtype=np.int64)
+        latency = np.asarray(self.latency_ms)
+        reward = np.asarray(self.reward)
+        timed = ~np.isnan(latency)
+
+        counts = np.bincount(group, minlength=n_groups)
+        sums = {name: np.bincount(group, weights=np.asarray(getattr(self, name), dtype=float),
+                                  minlength=n_groups)
+                for name in ("turns", "tool_calls", "output_chars")}
+        timed_counts = np.bincount(group[timed], minlength=n_groups)
+        latency_sums = np.bincount(group[timed], weights=latency[timed], minlength=n_groups)
+        timed_rewards = np.bincount(group[timed], weights=reward[timed], minlength=n_groups)
+
+        # Timed latencies sorted by group, then value: each group is a contiguous run
+        order = np.lexsort((latency[timed], group[timed]))
+        ordered = latency[timed][order]
+        starts = np.concatenate(([0], np.cumsum(timed_counts)[:-1]))
+        percentiles = {}
+        for q in PERCENTILES:
+            pos = np.maximum(timed_counts - 1, 0) * q / 100
+            lo = np.floor(pos).astype(np.int64)
+            hi = np.minimum(lo + 1, np.maximum(timed_counts - 1, 0))
+            has = timed_counts > 0
+            values = np.full(n_groups, np.nan)
+            a = ordered[(starts + lo)[has]]
+            b = ordered[(starts + hi)[has]]
+            values[has] = a + (b - a) * (pos - lo)[has]
+            percentiles[q] = values
+
+        return [
+            _summary(int(counts[g]), {name: float(s[g]) for name, s in sums.items()},
+                     int(timed_counts[g]), float(latency_sums[g]), float(timed_rewards[g]),
+                     {q: float(v[g]) for q, v in percentiles.items()})
+            if counts[g] else None
+            for g in range(n_groups)
+        ]
+
+    def _summaries_python(self, groups, n_groups):
+        counts = [0] * n_groups
+        sums = {name: [0] * n_groups for name in ("turns", "tool_calls", "output_chars")}
+        latencies = [[] for _ in range(n_groups)]
+        timed_rewards = [0.0] * n_groups
+        for i, g in enumerate(groups):
+            counts[g] += 1
+            for name, s in sums.items():
+                s[g] += getattr(self, name)[i]
+            if not math.isnan(self.latency_ms[i]):
+                latencies[g].append(self.latency_ms[i])
+                timed_rewards[g] += self.reward[i]
+
+        summaries = []
+        for g in range(n_groups):
+            if not counts[g]:
+                summaries.append(None)
+                continue
+            values = sorted(latencies[g])
+            percentiles = {q: _percentile_sorted(values, q) if values else math.nan for q in PERCENTILES}
+            summaries.append(_summary(counts[g], {name: s[g] for name, s in sums.items()},
+                                      len(values), sum(values), timed_rewards[g], percentiles))
+        return summaries
+
+
+def _summary(count, sums, timed, latency_sum, timed_reward, percentiles):
+    """Summary dict for one group from its counts and sums."""
+    latency = None
+    reward_per_second = None
+    if timed:
+        latency = {"timed": timed, "mean": round(latency_sum / timed, 1)}
+        latency.update({f"p{q}": round(value, 1) for q, value in percentiles.items()})
+        if latency_sum > 0:
+            reward_per_second = round(timed_reward / (latency_sum / 1000), 4)
+    return {
+        "rollouts": count,
+        "avgTurns": round(sums["turns"] / count, 2),
+        "avgToolCalls": round(sums["tool_calls"] / count, 2),
+        "avgOutputChars": round(sums["output_chars"] / count, 1),
+        "avgOutputTokens": round(sums["output_chars"] / count / CHARS_PER_TOKEN, 1),
+        "latencyMs": latency,
+        "rewardPerSecond": reward_per_second,
+    }
@@ -0,0 +1,201 @@
+"""
+Incremental ingestion of rollout logs that are still being written.
+
+During an eval sweep new lines keep being appended to the bank and road
+logs. A ``LogTail`` remembers how far into its log it has read and feeds
+only the newly appended, complete lines to its samplers; a partial last
+line is held back until the writer finishes it. Appended bytes are read
+``READ_CHUNK`` at a time, so a first poll of a large log does not hold it
+in memory whole. Samplers see records in
+file order either way, so a tail holds the same sample a full scan of the
+log would. A compressed log cannot be appended to in place, so when one
+changes it is read again from the start. ``RolloutWatcher`` keeps one
+tail per log of every model in final_25_results.json and reports which
+models changed on each poll.
+"""
+
+import os
+
+from .compressed import READ_CHUNK, LineReader, is_compressed
+from .ingest import READ_STATS, bank_path, load_results, offer_line, results_path, road_path
+from .records import MalformedRecord, skip_malformed
+from .sampling import TaskSampler
+
+
+class LogTail:
+    """Sampled view of one rollout log, advanced by reading appended bytes."""
+
+    def __init__(self, filepath, params_list):
+        self.filepath = filepath
+        self.params_list = params_list
+        self.reset()
+
+    def reset(self):
+        """Forget everything read so far."""
+        self.samplers = [TaskSampler(params) for params in self.params_list]
+        self.offset = 0
+        self.pending = b""
+        self.inode = None
+        self.signature = None
+
+    def poll(self):
+        """
+        Read whatever was appended since the last poll.
+
+        A log that was replaced, truncated or removed is read again from
+        the start. Returns True if any sample may have changed.
+        """
+        try:
+            st = os.stat(self.filepath)
+        except FileNotFoundError:
+            if self.inode is None:
+                return False
+            self.reset()
+            return True
+
+        if is_compressed(self.filepath):
+            return self._reread(st)
+
+        changed = False
+        if self.inode is not None and (st.st_ino != self.inode or st.st_size < self.offset):
+            self.reset()
+            changed = True
+        self.inode = st.st_ino
+        if st.st_size == self.offset:
+            return changed
+
+        # Samplers that can no longer change need nothing from the new bytes
+        if all(sampler.done() for sampler in self.samplers):
+            self.offset, self.pending = st.st_size, b""
+            return changed
+
+        read = decoded = skipped = nbytes = 0
+        position = self.offset - len(self.pending)
+        # Pieces of the unfinished last line, joined once its newline arrives
+        pieces = [self.pending] if self.pending else []
+        with open(self.filepath, "rb") as f:
+            f.seek(self.offset)
+            while self.offset < st.st_size:
+                data = f.read(min(READ_CHUNK, st.st_size - self.offset))
+                if not data:
+                    break
+                self.offset += len(data)
+                nbytes += len(data)
+                lines = data.split(b"\n")
+                pieces.append(lines[0])
+                if len(lines) == 1:
+                    continue
+                lines[0] = b"".join(pieces)
+                pieces = [lines.pop()]
+
+                for line in lines:
+                    line += b"\n"
+                    if line.strip():
+                        read += 1
+                        try:
+                            was_decoded, kept = offer_line(self.samplers, line, position)
+                        except MalformedRecord as e:
+                            skip_malformed(e, self.filepath, position)
+                            was_decoded, kept = False, False
+                        decoded += was_decoded
+                        skipped += not kept
+                        changed = changed or kept
+                    position += len(line)
+
+                if all(sampler.done() for sampler in self.samplers):
+                    self.offset, pieces = st.st_size, []
+                    break
+        self.pending = b"".join(pieces)
+        READ_STATS.add({
+            "records_read": read,
+            "records_decoded": decoded,
+            "records_skipped": skipped,
+            "bytes_read": nbytes,
+        })
+        return changed
+
+    def _reread(self, st):
+        """Sample a compressed log again from the start if it changed."""
+        signature = (st.st_ino, st.st_size, st.st_mtime_ns)
+        if signature == self.signature:
+            return False
+        self.reset()
+        self.inode = st.st_ino
+        self.signature = signature
+
+        read = decoded = skipped = position = 0
+        with LineReader(self.filepath) as lines:
+            for line in lines:
+                if line.strip():
+                    read += 1
+                    try:
+                        was_decoded, kept = offer_line(self.samplers, line, position)
+                    except MalformedRecord as e:
+                        skip_malformed(e, self.filepath, position)
+                        was_decoded, kept = False, False
+                    decoded += was_decoded
+                    skipped += not kept
+                    if kept and all(sampler.done() for sampler in self.samplers):
+                        break
+                position += len(line)
+        READ_STATS.add({
+            "records_read": read,
+            "records_decoded": decoded,
+            "records_skipped": skipped,
+            "bytes_read": position,
+        })
+        return True
+
+    def rollouts(self):
+        """Current sample for each params, in the order they were given."""
+        return [sampler.rollouts() for sampler in self.samplers]
+
+
+class RolloutWatcher:
+    """Tails every model's bank and road logs for a set of suites."""
+
+    def __init__(self, suites):
+        self.suites = suites
+        self.results = []
+        self.results_mtime = None
+        self.tails = {}
+
+    def _add_model(self, model_key):
+        model_suites = [suite for suite in self.suites if suite.includes(model_key)]
+        self.tails[model_key] = {
+            dataset: (LogTail(path, [suite.sampling_params(dataset) for suite in model_suites]),
+                      model_suites)
+            for dataset, path in (("bank", bank_path(model_key)), ("road", road_path(model_key)))
+        }
+
+    def poll(self):
+        """
+        Pick up new models and appended log lines.
+
+        Returns (results_changed, changed model keys).
+        """
+        results_changed = False
+        mtime = os.stat(results_path()).st_mtime_ns
+        if mtime != self.results_mtime:
+            self.results_mtime = mtime
+            self.results = load_results()
+            results_changed = True
+            for r in self.results:
+                if r["model"] not in self.tails:
+                    self._add_model(r["model"])
+
+        changed = set()
+        for r in self.results:
+            for tail, _ in self.tails[r["model"]].values():
+                if tail.poll():
+                    changed.add(r["model"])
+        return results_changed, changed
+
+    def ingested(self):
+        """Current samples as ``{suite name: {model key: {"bank", "road"}}}``."""
+        ingested = {suite.name: {} for suite in self.suites}
+        for r in self.results:
+            for dataset, (tail, model_suites) in self.tails[r["model"]].items():
+                for suite, rollouts in zip(model_suites, tail.rollouts()):
+                    ingested[suite.name].setdefault(r["model"], {})[dataset] = rollouts
+        return ingested
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Compare recorded benchmark runs without reprocessing the rollout logs.
+
+Runs are recorded by building with --snapshot (see codeblue_data.snapshots):
+
+    python scripts/build_data.py --snapshot
+    python scripts/compare_runs.py list
+    python scripts/compare_runs.py diff                  # latest~1 -> latest
+    python scripts/compare_runs.py diff 20260101 latest --json
+    python scripts/compare_runs.py trend --write
+
+Runs are named by run id (or a unique prefix), "latest" or "latest~N".
+"""
+
+import argparse
+import json
+import sys
+
+import transform_final25
+from codeblue_data.snapshots import (
+    METRICS, SNAPSHOT_DIR, diff_snapshots, find_snapshot, list_snapshots, read_header, trend,
+)
+from codeblue_data.suites import MANIFEST_FILE, load_suite
+
+
+def print_runs(paths):
+    """One line per recorded run."""
+    for path in paths:
+        header = read_header(path)
+        print(f"{header['run']}  {header['created']}  {len(header['models'])} models, "
+              f"{len(header['tasks'])} tasks")
+
+
+def print_diff(diff):
+    """Print rank changes, task flips and metric deltas as text."""
+    print(f"{diff['from']} -> {diff['to']}")
+    if diff["added"]:
+        print(f"Added: {', '.join(diff['added'])}")
+    if diff["removed"]:
+        print(f"Removed: {', '.join(diff['removed'])}")
+
+    print(f"\nRank changes ({len(diff['ranks'])}):")
+    for r in diff["ranks"]:
+        before = r["from"] if r["from"] is not None else "-"
+        after = r["to"] if r["to"] is not None else "-"
+        change = f" ({r['change']:+d})" if r["change"] is not None else ""
+        print(f"  {r['model']}: {before} -> {after}{change}")
+
+    print(f"\nTask flips ({len(diff['flips'])}):")
+    for f in diff["flips"]:
+        print(f"  {f['model']} {f['task']}: now {f['now']} "
+              f"({f['from'][0]}/{f['from'][1]} -> {f['to'][0]}/{f['to'][1]} correct)")
+
+    print(f"\nMetric deltas ({len(diff['metrics'])}):")
+    for m in diff["metrics"]:
+        print(f"  {m['model']}: " + ", ".join(f"{name} {m[name]:+g}" for name in METRICS))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare recorded benchmark runs.")
+    parser.add_argument("--snapshot-dir", default=str(SNAPSHOT_DIR),
+                        help=f"snapshot store (default: {SNAPSHOT_DIR})")
+    parser.add_argument("--manifest", default=str(MANIFEST_FILE),
+                        help=f"suite manifest to read (default: {MANIFEST_FILE})")
+    parser.add_argument("--suite",
+                        help="suite whose runs to compare (default: the manifest's default suite)")
+    output = argparse.ArgumentParser(add_help=False)
+    output.add_argument("--json", action="store_true",
+                        help="print JSON instead of text")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("list", parents=[output], help="list recorded runs, oldest first")
+    diff = commands.add_parser("diff", parents=[output],
+                               help="rank changes, task flips and metric deltas between two runs")
+    diff.add_argument("old", nargs="?", default="latest~1", help="earlier run (default: latest~1)")
+    diff.add_argument("new", nargs="?", default="latest", help="later run (default: latest)")
+    trend_parser = commands.add_parser("trend", help="rank and combined %% of every model over the runs")
+    trend_parser.add_argument("--runs", type=int, default=transform_final25.TREND_RUNS,
+                              help=f"most recent runs to include (default: {transform_final25.TREND_RUNS})")
+    trend_parser.add_argument("--write", action="store_true",
+                              help="write the dashboard's trend file instead of printing")
+    args = parser.parse_args()
+
+    try:
+        suite = load_suite(args.suite, args.manifest)
+        if args.command == "list":
+            paths = list_snapshots(args.snapshot_dir, suite.name)
+            if args.json:
+                print(json.dumps([read_header(p) for p in paths], indent=2))
+            else:
+                print_runs(paths)
+        elif args.command == "diff":
+            result = diff_snapshots(find_snapshot(args.snapshot_dir, suite.name, args.old),
+                                    find_snapshot(args.snapshot_dir, suite.name, args.new))
+            if args.json:
+                print(json.dumps(result, indent=2))
+            else:
+                print_diff(result)
+        elif args.write:
+            transform_final25.write_trend(args.snapshot_dir, suite=suite, runs=args.runs)
+            print(f"Wrote {suite.output_path(transform_final25.TREND_FILE)}")
+        else:
+            print(json.dumps(trend(args.snapshot_dir, suite.name, args.runs), indent=2))
+    except (OSError, ValueError) as e:
+        sys.exit(f"error: {e}")
+
+
+if __name__ == "__main__":
+    main()
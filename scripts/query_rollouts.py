@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Ad-hoc accuracy slices over every rollout in the SQLite rollout store.
+
+Loads any new or changed bank and road logs into the store (see
+codeblue_data.store), then prints correct/partial/total counts grouped by
+the requested dimensions, e.g.:
+
+    python scripts/query_rollouts.py --by template,provider
+    python scripts/query_rollouts.py --by level,model --suite final25 --json
+
+Unlike the transform outputs, which report on sampled rollouts, slices
+count every stored rollout of the selected tasks and models.
+"""
+
+import argparse
+import json
+import sys
+
+from codeblue_data.cli import (
+    add_benchmark_dir_argument, add_strict_argument, apply_benchmark_dir, apply_strict, print_malformed_stats,
+)
+from codeblue_data.ingest import bank_path, load_results, load_task_records, road_path
+from codeblue_data.store import DIMENSIONS, STORE_FILE, RolloutStore
+from codeblue_data.suites import MANIFEST_FILE, load_suite
+
+
+def print_table(rows, by):
+    """Print counts as an aligned text table."""
+    headers = list(by) + ["correct", "partial", "total", "pct", "avg_reward"]
+    cells = [[str(row[h]) for h in headers] for row in rows]
+    widths = [max(len(h), *(len(c[i]) for c in cells)) if cells else len(h) for i, h in enumerate(headers)]
+    print("  ".join(h.ljust(w) for h, w in zip(headers, widths)))
+    for c in cells:
+        print("  ".join(v.ljust(w) for v, w in zip(c, widths)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Slice rollout accuracy by model, task, template or level.")
+    add_benchmark_dir_argument(parser)
+    add_strict_argument(parser)
+    parser.add_argument("--store", default=str(STORE_FILE),
+                        help=f"SQLite rollout store (default: {STORE_FILE})")
+    parser.add_argument("--by", default="template,provider",
+                        help=f"comma-separated dimensions to group by: {', '.join(DIMENSIONS)} "
+                             "(default: template,provider)")
+    parser.add_argument("--manifest", default=str(MANIFEST_FILE),
+                        help=f"suite manifest to read (default: {MANIFEST_FILE})")
+    parser.add_argument("--suite",
+                        help="only count the tasks and models of this suite")
+    parser.add_argument("--model", action="append",
+                        help="only count this model; repeat for several")
+    parser.add_argument("--json", action="store_true",
+                        help="print the rows as JSON")
+    args = parser.parse_args()
+    apply_benchmark_dir(args)
+    apply_strict(args)
+
+    by = [dim.strip() for dim in args.by.split(",") if dim.strip()]
+    unknown = [dim for dim in by if dim not in DIMENSIONS]
+    if unknown:
+        sys.exit(f"error: unknown dimension {unknown[0]!r} (expected one of {', '.join(DIMENSIONS)})")
+    suite = None
+    if args.suite:
+        try:
+            suite = load_suite(args.suite, args.manifest)
+        except (OSError, ValueError) as e:
+            sys.exit(f"error: {e}")
+
+    store = RolloutStore(args.store)
+    results = load_results()
+    models = [r["model"] for r in (suite.select(results) if suite else results)]
+    if args.model:
+        models = [key for key in models if key in args.model]
+
+    loaded = 0
+    for key in models:
+        loaded += store.sync_log(bank_path(key), key, "bank")
+        loaded += store.sync_log(road_path(key), key, "road")
+    store.sync_tasks(load_task_records())
+    if loaded:
+        print(f"Loaded {loaded} rollout logs into {args.store}", file=sys.stderr)
+    print_malformed_stats(file=sys.stderr)
+
+    rows = store.counts(by, task_ids=suite.task_ids if suite else None, models=models)
+    store.close()
+
+    if args.json:
+        print(json.dumps(rows, indent=2))
+    else:
+        print_table(rows, by)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Regrade every rollout in the bank and road logs against the golden values.
+
+Streams the full logs (not just the sampled rollouts the reports use),
+grades each log's records in batches of GRADE_BATCH with
+codeblue_data.rescore, and
+prints how the regraded scores compare with the logged ones, e.g.:
+
+    python scripts/rescore_logs.py
+    python scripts/rescore_logs.py --suite final25 --model openai--m2 --json
+
+To use regraded scores in the built outputs, pass --rescore to
+build_data.py or either transform script instead.
+"""
+
+import argparse
+import json
+import sys
+from itertools import islice
+
+from codeblue_data.cli import (
+    add_benchmark_dir_argument, add_strict_argument, apply_benchmark_dir, apply_strict, print_malformed_stats,
+)
+from codeblue_data.columns import CORRECT, PARTIAL, WRONG, outcome
+from codeblue_data.ingest import bank_path, iter_log, load_results, load_task_records, road_path
+from codeblue_data.rescore import UNGRADED, VERDICTS, Rescorer
+from codeblue_data.suites import MANIFEST_FILE, load_suite
+
+# Records graded per batch, so a log is never held in memory whole
+GRADE_BATCH = 10000
+
+OUTCOME_NAMES = {CORRECT: "correct", PARTIAL: "partial"}
+
+
+def rescore_log(filepath, task_ids, rescorer):
+    """Comparison row for one log: logged vs regraded outcomes and verdict counts."""
+    row = {"rollouts": 0, "changed": 0}
+    for name in OUTCOME_NAMES.values():
+        row[f"logged_{name}"] = row[f"rescored_{name}"] = 0
+    row.update({verdict: 0 for verdict in VERDICTS})
+
+    records = iter_log(filepath, task_ids)
+    while True:
+        batch = list(islice(records, GRADE_BATCH))
+        if not batch:
+            break
+        row["rollouts"] += len(batch)
+        for record, (after, verdict) in zip(batch, rescorer.grade(batch)):
+            before = record.get("score_correctness", 0)
+            row[verdict] += 1
+            if verdict in UNGRADED:
+                after = before
+            old, new = outcome(before), outcome(after)
+            if old != WRONG:
+                row[f"logged_{OUTCOME_NAMES[old]}"] += 1
+            if new != WRONG:
+                row[f"rescored_{OUTCOME_NAMES[new]}"] += 1
+            row["changed"] += old != new
+    return row
+
+
+def print_table(rows):
+    """Print comparison rows as an aligned text table."""
+    headers = ["model", "dataset", "rollouts", "logged_correct", "rescored_correct",
+               "logged_partial", "rescored_partial", "scale_error", "changed"]
+    cells = [[str(row[h]) for h in headers] for row in rows]
+    widths = [max(len(h), *(len(c[i]) for c in cells)) if cells else len(h) for i, h in enumerate(headers)]
+    print("  ".join(h.ljust(w) for h, w in zip(headers, widths)))
+    for c in cells:
+        print("  ".join(v.ljust(w) for v, w in zip(c, widths)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Regrade rollout logs against the tasks' golden values.")
+    add_benchmark_dir_argument(parser)
+    add_strict_argument(parser)
+    parser.add_argument("--manifest", default=str(MANIFEST_FILE),
+                        help=f"suite manifest to read (default: {MANIFEST_FILE})")
+    parser.add_argument("--suite",
+                        help="only regrade the tasks and models of this suite")
+    parser.add_argument("--model", action="append",
+                        help="only regrade this model; repeat for several")
+    parser.add_argument("--json", action="store_true",
+                        help="print the rows as JSON")
+    args = parser.parse_args()
+    apply_benchmark_dir(args)
+    apply_strict(args)
+
+    suite = None
+    if args.suite:
+        try:
+            suite = load_suite(args.suite, args.manifest)
+        except (OSError, ValueError) as e:
+            sys.exit(f"error: {e}")
+
+    results = load_results()
+    models = [r["model"] for r in (suite.select(results) if suite else results)]
+    if args.model:
+        models = [key for key in models if key in args.model]
+
+    rescorer = Rescorer(load_task_records())
+    rows = []
+    for key in models:
+        for dataset, path in (("bank", bank_path(key)), ("road", road_path(key))):
+            task_ids = None
+            if suite is not None:
+                task_ids = suite.bank_ids if dataset == "bank" else suite.road_ids
+            row = rescore_log(path, task_ids, rescorer)
+            if row["rollouts"]:
+                rows.append(dict({"model": key, "dataset": dataset}, **row))
+
+    print_malformed_stats(file=sys.stderr)
+    if args.json:
+        print(json.dumps(rows, indent=2))
+    else:
+        print_table(rows)
+        print(f"\n{rescorer.hits + rescorer.misses} rollouts, {rescorer.misses} distinct answers graded",
+              file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
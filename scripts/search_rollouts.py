@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Find rollouts by what their completions or answers contain.
+
+Indexes any new or changed bank and road logs (see codeblue_data.search),
+then prints the rollouts containing every word of the query, e.g.:
+
+    python scripts/search_rollouts.py "KeyError"
+    python scripts/search_rollouts.py "0.39" --field answer --failed
+    python scripts/search_rollouts.py "could not convert string" --exact --suite final25 --json
+
+Searches cover every rollout in the full logs, not just the sampled ones
+the dashboard ships.
+"""
+
+import argparse
+import json
+import sys
+import time
+
+from codeblue_data.cli import (
+    add_benchmark_dir_argument, add_strict_argument, apply_benchmark_dir, apply_strict, print_malformed_stats,
+)
+from codeblue_data.ingest import bank_path, load_results, road_path
+from codeblue_data.records import MalformedRecord
+from codeblue_data.search import FIELDS, SEARCH_DIR, SearchIndex, field_texts
+from codeblue_data.suites import MANIFEST_FILE, load_suite
+
+SNIPPET_CONTEXT = 40
+
+
+def snippet(text, query):
+    """The first occurrence of query's first word in text, with some context on either side."""
+    lowered = text.lower()
+    words = query.lower().split()
+    at = lowered.find(query.lower())
+    if at < 0 and words:
+        at = lowered.find(words[0])
+    at = max(at, 0)
+    start = max(at - SNIPPET_CONTEXT, 0)
+    end = at + len(query) + SNIPPET_CONTEXT
+    excerpt = " ".join(text[start:end].split())
+    return ("..." if start else "") + excerpt + ("..." if end < len(text) else "")
+
+
+def print_table(hits):
+    """Print hits as an aligned text table."""
+    headers = ["model", "dataset", "task_id", "score", "match"]
+    cells = [[hit["model"], hit["dataset"], hit["task_id"], f"{hit['score_correctness']:g}", hit["match"]]
+             for hit in hits]
+    widths = [max(len(h), *(len(c[i]) for c in cells)) if cells else len(h) for i, h in enumerate(headers)]
+    print("  ".join(h.ljust(w) for h, w in zip(headers, widths)))
+    for c in cells:
+        print("  ".join(v.ljust(w) for v, w in zip(c, widths)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Search rollout completions and answers across every model's logs.")
+    parser.add_argument("query", help="words the rollout must all contain")
+    add_benchmark_dir_argument(parser)
+    add_strict_argument(parser)
+    parser.add_argument("--search-dir", default=str(SEARCH_DIR),
+                        help=f"search index directory (default: {SEARCH_DIR})")
+    parser.add_argument("--field", choices=list(FIELDS),
+                        help="only search this field (default: completions and answers)")
+    parser.add_argument("--manifest", default=str(MANIFEST_FILE),
+                        help=f"suite manifest to read (default: {MANIFEST_FILE})")
+    parser.add_argument("--suite",
+                        help="only search the models of this suite")
+    parser.add_argument("--model", action="append",
+                        help="only search this model; repeat for several")
+    parser.add_argument("--dataset", choices=["bank", "road"],
+                        help="only search this dataset's logs")
+    parser.add_argument("--failed", action="store_true",
+                        help="only rollouts scored below the correct threshold")
+    parser.add_argument("--exact", action="store_true",
+                        help="require the query as a phrase, not just all of its words")
+    parser.add_argument("--limit", type=int, default=50,
+                        help="most hits to return; 0 for all (default: 50)")
+    parser.add_argument("--json", action="store_true",
+                        help="print the hits as JSON")
+    args = parser.parse_args()
+    apply_benchmark_dir(args)
+    apply_strict(args)
+
+    suite = None
+    if args.suite:
+        try:
+            suite = load_suite(args.suite, args.manifest)
+        except (OSError, ValueError) as e:
+            sys.exit(f"error: {e}")
+
+    index = SearchIndex(args.search_dir)
+    results = load_results()
+    models = [r["model"] for r in (suite.select(results) if suite else results)]
+    if args.model:
+        models = [key for key in models if key in args.model]
+
+    try:
+        indexed = 0
+        for key in models:
+            indexed += index.sync_log(bank_path(key), key, "bank")
+            indexed += index.sync_log(road_path(key), key, "road")
+        if indexed:
+            print(f"Indexed {indexed} rollout logs into {args.search_dir}", file=sys.stderr)
+
+        fields = [args.field] if args.field else list(FIELDS)
+        start = time.perf_counter()
+        hits = index.search(args.query, fields=fields, models=set(models),
+                            datasets={args.dataset} if args.dataset else None,
+                            failed=args.failed, exact=args.exact, limit=args.limit or None)
+        elapsed = time.perf_counter() - start
+        records = index.records(hits)
+    except MalformedRecord as e:
+        sys.exit(f"error: {e}")
+    print_malformed_stats(file=sys.stderr)
+
+    print(f"{len(hits)} matches in {1000 * elapsed:.1f} ms", file=sys.stderr)
+    for hit, record in zip(hits, records):
+        texts = field_texts(record)
+        field = next((f for f in fields if args.query.lower().split()[0] in texts[f].lower()), fields[0])
+        hit["field"] = field
+        hit["match"] = snippet(texts[field], args.query)
+
+    if args.json:
+        print(json.dumps(hits, indent=2))
+    else:
+        print_table(hits)
+
+
+if __name__ == "__main__":
+    main()
@@ -10,29 +10,37 @@ Reads:
 
 Outputs:
 - src/data/final25-data.json
+- public/data/final25-trend.json (with --snapshot: rank and combined % of
+  every model over the recorded runs, fetched by the leaderboard)
+
+Identical rollout entries of a model are written once, as a reference into
+the payload's content table with a multiplicity ``count`` (see
+codeblue_data.encoding.ContentTable).
 """
 
-import json
 from pathlib import Path
 from datetime import datetime
 from collections import defaultdict
 
+from codeblue_data.cli import (
+    cache_from_args, instrumentation_from_args, parse_args, print_cache_stats, print_malformed_stats,
+    print_rescore_stats, rescorer_from_args, suites_from_args,
+)
+from codeblue_data.columns import RolloutColumns
+from codeblue_data.confidence import confidence_tables, task_groups
+from codeblue_data.encoding import ContentTable, write_json
+from codeblue_data.ingest import ingest, ingest_suites, load_results, load_task_records
+from codeblue_data.instrument import Instrumentation, profiled
+from codeblue_data.snapshots import save_snapshot, trend
+from codeblue_data.rescore import rescore_ingested
+from codeblue_data.suites import load_suite
+
 # Paths
-BENCHMARK_DIR = Path(__file__).parent.parent.parent / "benchmark_final_25"
 OUTPUT_FILE = Path(__file__).parent.parent / "src/data/final25-data.json"
+TREND_FILE = Path(__file__).parent.parent / "public/data/final25-trend.json"
 
-# Final task IDs
-BANK_19_IDS = {
-    'bank_hard_001', 'bank_hard_005', 'bank_hard_012', 'bank_hard_019', 'bank_hard_020',
-    'bank_hard_021', 'bank_hard_023', 'bank_hard_026', 'bank_hard_028', 'bank_hard_029',
-    'bank_hard_030', 'bank_hard_031', 'bank_hard_033', 'bank_hard_035', 'bank_hard_038',
-    'bank_hard_039', 'bank_hard_040', 'bank_hard_041', 'bank_hard_044'
-}
-
-ROAD_6_IDS = {
-    'road_hard_002', 'road_hard_004', 'road_hard_007',
-    'road_hard_014', 'road_hard_015', 'road_hard_021'
-}
+# Most recent runs included in TREND_FILE
+TREND_RUNS = 30
 
 # Provider colors (matching BenchmarkCharts.tsx)
 PROVIDER_COLORS = {
@@ -48,199 +56,130 @@ PROVIDER_COLORS = {
 }
 
 
-def load_results():
-    """Load model results from final_25_results.json."""
-    with open(BENCHMARK_DIR / "final_25_results.json") as f:
-        return json.load(f)
-
+def load_tasks(records=None, suite=None):
+    """Load task definitions from final_25_tasks.jsonl, limited to suite's tasks if given."""
+    if records is None:
+        records = load_task_records()
 
-def load_tasks():
-    """Load task definitions from final_25_tasks.jsonl."""
     tasks = []
-    with open(BENCHMARK_DIR / "final_25_tasks.jsonl") as f:
-        for line in f:
-            task = json.loads(line)
-            tasks.append({
-                "id": task["id"],
-                "dataset": task["dataset"],
-                "level": task["level"],
-                "template": task["template"],
-                "goal": task["goal"],
-                "expected_type": task["expected_output_type"],
-                "expected_value": task["golden"]["answer_value"],
-                "tolerance": task.get("tolerance", 0.01),
-                "slots": task.get("metadata", {}).get("slots", {}),
-                "ambiguities": task.get("ambiguities", []),
-            })
+    for task in records:
+        if suite is not None and task["id"] not in suite.task_ids:
+            continue
+        tasks.append({
+            "id": task["id"],
+            "dataset": task["dataset"],
+            "level": task["level"],
+            "template": task["template"],
+            "goal": task["goal"],
+            "expected_type": task["expected_output_type"],
+            "expected_value": task["golden"]["answer_value"],
+            "tolerance": task.get("tolerance", 0.01),
+            "slots": task.get("metadata", {}).get("slots", {}),
+            "ambiguities": task.get("ambiguities", []),
+        })
     return tasks
 
 
-def parse_info(info):
-    """Parse info field which may be dict or JSON string."""
-    if isinstance(info, str):
-        try:
-            return json.loads(info)
-        except:
-            return {}
-    return info or {}
+def summarize_rollouts(records, dataset):
+    """Reduce ingested rollout records to the fields the trajectory viewer needs."""
+    rollouts = []
+    for r in records:
+        info = r["info"]
+        rollouts.append({
+            "task_id": info["task_id"],
+            "dataset": dataset,
+            "score_correctness": r.get("score_correctness", 0),
+            "score_efficiency": r.get("score_efficiency", 0),
+            "reward": r.get("reward", 0),
+            "answer": r.get("answer"),
+            "expected": info.get("expected"),
+        })
+    return rollouts
 
 
-def load_rollouts_bank(model_key):
-    """Load rollouts for a model from bank_rescored_c1."""
-    rollouts = []
-    bank_dir = BENCHMARK_DIR / "bank_rescored_c1"
-
-    # Map model key to filename
-    filename = model_key + ".jsonl"
-    filepath = bank_dir / filename
-
-    if not filepath.exists():
-        return rollouts
-
-    by_task = defaultdict(list)
-    with open(filepath) as f:
-        for line in f:
-            record = json.loads(line)
-            info = parse_info(record.get("info", {}))
-            task_id = info.get("task_id", "")
-            if task_id in BANK_19_IDS:
-                by_task[task_id].append(record)
-
-    # Take first 3 per task
-    for task_id, records in by_task.items():
-        for r in records[:3]:
-            info = parse_info(r.get("info", {}))
-            rollouts.append({
-                "task_id": task_id,
-                "dataset": "bank",
-                "score_correctness": r.get("score_correctness", 0),
-                "score_efficiency": r.get("score_efficiency", 0),
-                "reward": r.get("reward", 0),
-                "answer": r.get("answer"),
-                "expected": info.get("expected"),
-            })
+def transform_model(r, rollouts, suite):
+    """UI entry for one model from its results row and ingested rollouts."""
+    model_key = r["model"]
+    provider = model_key.split("--")[0]
+    name = model_key.split("--")[-1]
+
+    # Rollouts from the shared ingestion pass
+    bank_rollouts = summarize_rollouts(rollouts["bank"], "bank")
+    road_rollouts = summarize_rollouts(rollouts["road"], "road")
+    all_rollouts = bank_rollouts + road_rollouts
+
+    return {
+        "model": model_key,
+        "provider": provider,
+        "name": name,
+        "displayName": name.replace("-", " ").title(),
+        "color": PROVIDER_COLORS.get(provider, "#6B7280"),
+
+        # Bank metrics
+        "bank": {
+            "correct": r["bank_correct"],
+            "total": r["bank_total"],
+            "partial": r["bank_partial"],
+            "pct": r["bank_pct"],
+        },
 
-    return rollouts
+        # Road metrics
+        "road": {
+            "correct": r["road_correct"],
+            "total": r["road_total"],
+            "partial": r["road_partial"],
+            "pct": r["road_pct"],
+        },
 
+        # Combined metrics
+        "combined": {
+            "correct": r["total_correct"],
+            "total": r["total_attempts"],
+            "partial": r["total_partial"],
+            "pct": r["total_pct"],
+        },
 
-def load_rollouts_road(model_key):
-    """Load rollouts for a model from eval_logs."""
-    rollouts = []
-    eval_dir = BENCHMARK_DIR / "eval_logs"
-
-    # Find model directory
-    model_dir = eval_dir / f"codeblue_env--{model_key}"
-    if not model_dir.exists():
-        return rollouts
-
-    results_file = model_dir / "results.jsonl"
-    if not results_file.exists():
-        return rollouts
-
-    by_task = defaultdict(list)
-    with open(results_file) as f:
-        for line in f:
-            record = json.loads(line)
-            info = parse_info(record.get("info", {}))
-            task_id = info.get("task_id", "")
-            if task_id in ROAD_6_IDS:
-                by_task[task_id].append(record)
-
-    # Take first 3 per task
-    for task_id, records in by_task.items():
-        for r in records[:3]:
-            info = parse_info(r.get("info", {}))
-            rollouts.append({
-                "task_id": task_id,
-                "dataset": "road",
-                "score_correctness": r.get("score_correctness", 0),
-                "score_efficiency": r.get("score_efficiency", 0),
-                "reward": r.get("reward", 0),
-                "answer": r.get("answer"),
-                "expected": info.get("expected"),
-            })
+        "avgReward": r["avg_reward"],
+        "hasBank": r["has_bank"],
+        "hasRoad": r["has_road"],
+        "complete": r["complete"],
 
-    return rollouts
+        # Rollouts for trajectory viewer
+        "rollouts": all_rollouts[:suite.rollouts_shown],
+    }
 
 
-def transform_models(results):
+def transform_models(results, ingested=None, suite=None):
     """Transform model results to UI format."""
-    models = []
-
-    for r in results:
-        model_key = r["model"]
-        provider = model_key.split("--")[0]
-        name = model_key.split("--")[-1]
-
-        # Load rollouts
-        bank_rollouts = load_rollouts_bank(model_key)
-        road_rollouts = load_rollouts_road(model_key)
-        all_rollouts = bank_rollouts + road_rollouts
-
-        models.append({
-            "model": model_key,
-            "provider": provider,
-            "name": name,
-            "displayName": name.replace("-", " ").title(),
-            "color": PROVIDER_COLORS.get(provider, "#6B7280"),
-
-            # Bank metrics
-            "bank": {
-                "correct": r["bank_correct"],
-                "total": r["bank_total"],
-                "partial": r["bank_partial"],
-                "pct": r["bank_pct"],
-            },
-
-            # Road metrics
-            "road": {
-                "correct": r["road_correct"],
-                "total": r["road_total"],
-                "partial": r["road_partial"],
-                "pct": r["road_pct"],
-            },
-
-            # Combined metrics
-            "combined": {
-                "correct": r["total_correct"],
-                "total": r["total_attempts"],
-                "partial": r["total_partial"],
-                "pct": r["total_pct"],
-            },
-
-            "avgReward": r["avg_reward"],
-            "hasBank": r["has_bank"],
-            "hasRoad": r["has_road"],
-            "complete": r["complete"],
-
-            # Rollouts for trajectory viewer
-            "rollouts": all_rollouts[:15],  # Limit to 15 samples
-        })
+    if suite is None:
+        suite = load_suite()
+    if ingested is None:
+        ingested = ingest(results, suite=suite)
 
-    return models
+    return [transform_model(r, ingested[r["model"]], suite) for r in results]
 
 
-def compute_task_performance(models, tasks):
+def compute_task_performance(models, tasks, columns=None):
     """Compute per-task performance across models."""
+    if columns is None:
+        columns = RolloutColumns.from_models(models, tasks)
+
+    counts = columns.task_model_counts()
+    n_models = len(models)
     task_perf = {}
 
-    for task in tasks:
-        task_id = task["id"]
-        task_perf[task_id] = {
+    for task_i, task in enumerate(tasks):
+        task_perf[task["id"]] = {
             "task": task,
             "models": {},
         }
 
-        for model in models:
-            model_key = model["model"]
-            rollouts = [r for r in model["rollouts"] if r["task_id"] == task_id]
+        for model_i, model in enumerate(models):
+            _, partial, correct = counts[task_i * n_models + model_i]
+            total = sum(counts[task_i * n_models + model_i])
 
-            if rollouts:
-                correct = sum(1 for r in rollouts if r["score_correctness"] >= 0.80)
-                partial = sum(1 for r in rollouts if 0.20 <= r["score_correctness"] < 0.80)
-                total = len(rollouts)
-
-                task_perf[task_id]["models"][model_key] = {
+            if total:
+                task_perf[task["id"]]["models"][model["model"]] = {
                     "correct": correct,
                     "partial": partial,
                     "total": total,
@@ -250,39 +189,113 @@ def compute_task_performance(models, tasks):
     return task_perf
 
 
-def compute_template_stats(tasks, models):
+def compute_template_stats(tasks, models, columns=None):
     """Compute accuracy by template type."""
-    template_stats = defaultdict(lambda: {"tasks": 0, "correct": 0, "total": 0})
+    if columns is None:
+        columns = RolloutColumns.from_models(models, tasks)
 
-    for task in tasks:
-        template = task["template"]
-        task_id = task["id"]
-        template_stats[template]["tasks"] += 1
+    templates = [task["template"] for task in tasks]
+    complete = [model["complete"] for model in models]
+    counts = columns.group_counts(templates, complete)
 
-        for model in models:
-            if not model["complete"]:
-                continue
-
-            rollouts = [r for r in model["rollouts"] if r["task_id"] == task_id]
-            for r in rollouts:
-                template_stats[template]["total"] += 1
-                if r["score_correctness"] >= 0.80:
-                    template_stats[template]["correct"] += 1
+    task_counts = defaultdict(int)
+    for template in templates:
+        task_counts[template] += 1
 
     # Convert to list and compute percentages
     result = []
-    for template, stats in template_stats.items():
+    for template, (wrong, partial, correct) in counts.items():
+        total = wrong + partial + correct
         result.append({
             "template": template,
-            "tasks": stats["tasks"],
-            "correct": stats["correct"],
-            "total": stats["total"],
-            "pct": round(100 * stats["correct"] / stats["total"], 1) if stats["total"] else 0,
+            "tasks": task_counts[template],
+            "correct": correct,
+            "total": total,
+            "pct": round(100 * correct / total, 1) if total else 0,
         })
 
     return sorted(result, key=lambda x: x["pct"], reverse=True)
 
 
+def compute_aggregates(models, tasks, columns=None):
+    """
+    Precompute the tables the dashboard pages index into.
+
+    - heatmap: task id -> model key -> correct/partial/wrong/total counts
+    - taskDifficulty: task id -> % correct across complete models
+    - levels: level -> correct/partial/total/pct across complete models
+
+    columns should hold every sampled rollout of the models, in models
+    order (RolloutColumns.from_ingested); without it only the rollouts
+    each model entry shows are counted.
+    """
+    if columns is None:
+        columns = RolloutColumns.from_models(models, tasks)
+
+    counts = columns.task_model_counts()
+    n_models = len(models)
+    heatmap = {}
+    task_difficulty = {}
+
+    for task_i, task in enumerate(tasks):
+        cells = {}
+        correct_total = attempts = 0
+        for model_i, model in enumerate(models):
+            wrong, partial, correct = counts[task_i * n_models + model_i]
+            total = wrong + partial + correct
+            if not total:
+                continue
+            cells[model["model"]] = {
+                "correct": correct,
+                "partial": partial,
+                "wrong": wrong,
+                "total": total,
+            }
+            if model["complete"]:
+                correct_total += correct
+                attempts += total
+        heatmap[task["id"]] = cells
+        task_difficulty[task["id"]] = 100 * correct_total / attempts if attempts else 0
+
+    level_counts = columns.group_counts(
+        [task["level"] for task in tasks], [model["complete"] for model in models])
+    levels = {}
+    for level in sorted(level_counts):
+        wrong, partial, correct = level_counts[level]
+        total = wrong + partial + correct
+        levels[level] = {
+            "correct": correct,
+            "partial": partial,
+            "total": total,
+            "pct": round(100 * correct / total, 1) if total else 0,
+        }
+
+    return {
+        "heatmap": heatmap,
+        "taskDifficulty": task_difficulty,
+        "levels": levels,
+    }
+
+
+def compute_confidence(results, tasks, ingested, columns=None):
+    """
+    Confidence intervals for every model's accuracy, per domain and template.
+
+    Uses all sampled rollouts of each model, not just the ones shown in the
+    trajectory viewer. Pairwise significance is left out: it grows with the
+    square of the number of models and no final25 view shows it.
+    """
+    if columns is None:
+        columns = RolloutColumns.from_ingested([r["model"] for r in results],
+                                               [task["id"] for task in tasks], ingested)
+    correct, total = columns.success_counts()
+    return confidence_tables(columns.model_keys, correct, total, {
+        "domains": task_groups([task["dataset"] for task in tasks]),
+        "templates": task_groups([task["template"] for task in tasks]),
+        "levels": task_groups([task["level"] for task in tasks]),
+    }, pairwise=False)
+
+
 def compute_anomalies(models):
     """Detect notable performance anomalies."""
     anomalies = []
@@ -324,27 +337,54 @@ def compute_anomalies(models):
     return anomalies
 
 
-def main():
-    print("Loading source data...")
-    results = load_results()
-    tasks = load_tasks()
-
-    print(f"Found {len(results)} models, {len(tasks)} tasks")
+def build_output(results, tasks, ingested=None, instr=None, suite=None):
+    """Build the final25-data.json payload for suite (default: the default suite)."""
+    if instr is None:
+        instr = Instrumentation()
+    if suite is None:
+        suite = load_suite()
+    if ingested is None:
+        ingested = ingest(results, suite=suite)
 
     print("Transforming model data...")
-    models = transform_models(results)
+    with instr.stage("transform_models"):
+        models = transform_models(results, ingested, suite)
+
+    return build_payload(models, results, tasks, ingested, instr)
+
+
+def build_payload(models, results, tasks, ingested, instr=None):
+    """Build the final25-data.json payload from already transformed models."""
+    if instr is None:
+        instr = Instrumentation()
+
+    with instr.stage("build_columns"):
+        columns = RolloutColumns.from_models(models, tasks)
+        # Every sampled rollout, not just the rollouts_shown cut of each model
+        sampled = RolloutColumns.from_ingested([m["model"] for m in models],
+                                               [task["id"] for task in tasks], ingested)
 
     print("Computing task performance...")
-    task_perf = compute_task_performance(models, tasks)
+    with instr.stage("compute_task_performance"):
+        task_perf = compute_task_performance(models, tasks, columns)
 
     print("Computing template stats...")
-    template_stats = compute_template_stats(tasks, models)
+    with instr.stage("compute_template_stats"):
+        template_stats = compute_template_stats(tasks, models, columns)
+
+    print("Precomputing page aggregates...")
+    with instr.stage("compute_aggregates"):
+        aggregates = compute_aggregates(models, tasks, sampled)
+
+    print("Computing confidence intervals...")
+    with instr.stage("compute_confidence"):
+        aggregates["confidence"] = compute_confidence(results, tasks, ingested, sampled)
 
     print("Detecting anomalies...")
-    anomalies = compute_anomalies(models)
+    with instr.stage("compute_anomalies"):
+        anomalies = compute_anomalies(models)
 
-    # Build output
-    output = {
+    return {
         "generated": datetime.now().isoformat(),
         "version": "v2.0-corrected",
         "summary": {
@@ -360,19 +400,99 @@ def main():
         "tasks": tasks,
         "templateStats": template_stats,
         "anomalies": anomalies,
+        "aggregates": aggregates,
     }
 
-    print(f"Writing to {OUTPUT_FILE}...")
-    OUTPUT_FILE.parent.mkdir(parents=True, exist_ok=True)
-    with open(OUTPUT_FILE, 'w') as f:
-        json.dump(output, f, indent=2)
 
-    print("Done!")
+def with_content(output):
+    """Payload with each model's rollouts as counted references into a content table."""
+    table = ContentTable()
+    models = [dict(m, rollouts=table.ref_counted(m["rollouts"])) for m in output["models"]]
+    return dict(output, models=models, content=table.bodies)
+
+
+def write_output(output, compact=False, suite=None):
+    """Write the payload to OUTPUT_FILE, or to its location for suite."""
+    path = suite.output_path(OUTPUT_FILE) if suite is not None else OUTPUT_FILE
+    print(f"Writing to {path}...")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    write_json(path, with_content(output), compact)
+
+
+def write_trend(snapshot_dir, compact=False, suite=None, runs=TREND_RUNS):
+    """Write the trend over the suite's latest runs snapshots to TREND_FILE."""
+    if suite is None:
+        suite = load_suite()
+    path = suite.output_path(TREND_FILE)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    write_json(path, trend(snapshot_dir, suite.name, runs), compact)
+
+
+def record_snapshot(output, ingested, snapshot_dir, compact=False, suite=None):
+    """Snapshot a built payload into the run history and refresh the trend file."""
+    if suite is None:
+        suite = load_suite()
+    path = save_snapshot(output, ingested, suite.name, snapshot_dir)
+    print(f"Snapshot: {path}" if path else "Snapshot: unchanged since the last run")
+    write_trend(snapshot_dir, compact, suite)
+
+
+def print_summary(output):
+    """Print a short summary of a built payload."""
+    summary = output["summary"]
     print(f"\nSummary:")
-    print(f"  Models: {len(models)} ({output['summary']['models_complete']} complete)")
-    print(f"  Tasks: {len(tasks)} ({output['summary']['bank_tasks']} bank, {output['summary']['road_tasks']} road)")
-    print(f"  Templates: {output['summary']['templates']}")
-    print(f"  Anomalies: {len(anomalies)}")
+    print(f"  Models: {len(output['models'])} ({summary['models_complete']} complete)")
+    print(f"  Tasks: {summary['total_tasks']} ({summary['bank_tasks']} bank, {summary['road_tasks']} road)")
+    print(f"  Templates: {summary['templates']}")
+    print(f"  Anomalies: {len(output['anomalies'])}")
+
+
+def main():
+    args = parse_args("Transform benchmark_final_25 data into final25-data.json.")
+    suites = suites_from_args(args)
+    cache = cache_from_args(args)
+    instr = instrumentation_from_args(args)
+
+    with profiled(args.profile):
+        print("Loading source data...")
+        with instr.stage("load_results"):
+            results = load_results()
+        with instr.stage("load_tasks"):
+            task_records = load_task_records()
+
+        print(f"Found {len(results)} models, {len(task_records)} tasks")
+
+        with instr.stage("ingest"):
+            ingested = ingest_suites(results, suites, cache, args.jobs)
+        print_cache_stats(cache)
+        print_malformed_stats()
+
+        rescorer = rescorer_from_args(args, task_records)
+        if rescorer is not None:
+            with instr.stage("rescore"):
+                rescore_ingested(ingested, rescorer)
+            print_rescore_stats(rescorer)
+
+        outputs = []
+        for suite in suites:
+            if len(suites) > 1:
+                print(f"\nSuite {suite.name}:")
+            output = build_output(suite.select(results), load_tasks(task_records, suite),
+                                  ingested[suite.name], instr, suite)
+            with instr.stage("dump"):
+                write_output(output, args.compact, suite)
+            if args.snapshot:
+                with instr.stage("snapshot"):
+                    record_snapshot(output, ingested[suite.name], args.snapshot, args.compact, suite)
+            outputs.append((suite, output))
+
+    print("Done!")
+    for suite, output in outputs:
+        if len(suites) > 1:
+            print(f"\nSuite {suite.name}:")
+        print_summary(output)
+    if args.report:
+        instr.write_report(args.report)
 
 
 if __name__ == "__main__":
@@ -3,110 +3,63 @@
 Transform Final 25 data into the benchmark-data.json format used by BenchmarkCharts.
 
 This preserves the existing UI while swapping in the Final 25 data.
+
+Outputs:
+- src/data/benchmark-data.json (everything, transcripts included)
+- src/data/benchmark-summary.json (same, minus prompt/completion transcripts;
+  what the dashboard components import)
+- public/data/trajectories/<provider>--<name>.json (transcripts, one file per
+  model, fetched on demand by the components that replay them)
+- public/data/benchmark-pairwise.json (pairwise significance between every
+  two models, fetched on demand by ABTestSimulator)
+
+Transcript messages are written once per file in a content-addressed table
+(see codeblue_data.encoding.ContentTable), so a system prompt or a repeated
+answer shared by many examples is stored a single time.
 """
 
-import json
+import pickle
+import tempfile
 from pathlib import Path
 from datetime import datetime
-from collections import defaultdict
+
+from codeblue_data.cli import (
+    apply_benchmark_dir, apply_strict, cache_from_args, instrumentation_from_args, make_parser,
+    print_cache_stats, print_malformed_stats, print_rescore_stats, rescorer_from_args, suites_from_args,
+)
+from codeblue_data.confidence import confidence_tables, task_groups
+from codeblue_data.encoding import (
+    ContentTable, SpilledContentTable, StreamedDict, StreamedList, intern_strings, write_json,
+    write_json_stream,
+)
+from codeblue_data.ingest import ingest, ingest_suites, iter_ingest, load_results, load_task_records
+from codeblue_data.instrument import Instrumentation, profiled
+from codeblue_data.rescore import rescore_ingested
+from codeblue_data.trajectory import TrajectoryColumns
 
 # Paths
-BENCHMARK_DIR = Path(__file__).parent.parent.parent / "benchmark_final_25"
 OUTPUT_FILE = Path(__file__).parent.parent / "src/data/benchmark-data.json"
+SUMMARY_FILE = Path(__file__).parent.parent / "src/data/benchmark-summary.json"
+TRAJECTORY_DIR = Path(__file__).parent.parent / "public/data/trajectories"
+PAIRWISE_FILE = Path(__file__).parent.parent / "public/data/benchmark-pairwise.json"
 
-# Final task IDs
-BANK_19_IDS = {
-    'bank_hard_001', 'bank_hard_005', 'bank_hard_012', 'bank_hard_019', 'bank_hard_020',
-    'bank_hard_021', 'bank_hard_023', 'bank_hard_026', 'bank_hard_028', 'bank_hard_029',
-    'bank_hard_030', 'bank_hard_031', 'bank_hard_033', 'bank_hard_035', 'bank_hard_038',
-    'bank_hard_039', 'bank_hard_040', 'bank_hard_041', 'bank_hard_044'
-}
-
-ROAD_6_IDS = {
-    'road_hard_002', 'road_hard_004', 'road_hard_007',
-    'road_hard_014', 'road_hard_015', 'road_hard_021'
-}
-
-ALL_TASK_IDS = BANK_19_IDS | ROAD_6_IDS
-
+# Example fields moved out of the summary into trajectory shards
+TRANSCRIPT_FIELDS = ("prompt", "completion")
 
-def parse_info(info):
-    if isinstance(info, str):
-        try:
-            return json.loads(info)
-        except:
-            return {}
-    return info or {}
+# Rubric scores reported only when the rollout logs carry them
+RUBRIC_SCORES = ("score_notes_usage", "score_code_quality")
 
 
-def load_tasks():
+def load_tasks(records=None):
     """Load task definitions."""
-    tasks = {}
-    with open(BENCHMARK_DIR / "final_25_tasks.jsonl") as f:
-        for line in f:
-            task = json.loads(line)
-            tasks[task["id"]] = task
-    return tasks
-
-
-def load_bank_rollouts(model_key):
-    """Load rollouts from bank_rescored_c1."""
-    rollouts = []
-    bank_dir = BENCHMARK_DIR / "bank_rescored_c1"
-    filepath = bank_dir / f"{model_key}.jsonl"
-
-    if not filepath.exists():
-        return rollouts
-
-    by_task = defaultdict(list)
-    with open(filepath) as f:
-        for line in f:
-            record = json.loads(line)
-            info = parse_info(record.get("info", {}))
-            task_id = info.get("task_id", "")
-            if task_id in BANK_19_IDS:
-                by_task[task_id].append(record)
-
-    # First 3 per task
-    for task_id, records in by_task.items():
-        for r in records[:3]:
-            rollouts.append(r)
-
-    return rollouts
-
-
-def load_road_rollouts(model_key):
-    """Load rollouts from eval_logs."""
-    rollouts = []
-    eval_dir = BENCHMARK_DIR / "eval_logs"
-    model_dir = eval_dir / f"codeblue_env--{model_key}"
-
-    if not model_dir.exists():
-        return rollouts
-
-    results_file = model_dir / "results.jsonl"
-    if not results_file.exists():
-        return rollouts
-
-    by_task = defaultdict(list)
-    with open(results_file) as f:
-        for line in f:
-            record = json.loads(line)
-            info = parse_info(record.get("info", {}))
-            task_id = info.get("task_id", "")
-            if task_id in ROAD_6_IDS:
-                by_task[task_id].append(record)
-
-    for task_id, records in by_task.items():
-        for r in records[:3]:
-            rollouts.append(r)
-
-    return rollouts
+    if records is None:
+        records = load_task_records()
+    return {task["id"]: task for task in records}
 
 
 def transform_rollout_to_example(rollout, tasks, example_id):
     """Transform a rollout record to the examples format."""
-    info = parse_info(rollout.get("info", {}))
+    info = rollout["info"]
     task_id = info.get("task_id", "")
     task = tasks.get(task_id, {})
 
@@ -141,126 +94,561 @@ def transform_rollout_to_example(rollout, tasks, example_id):
         "completion": completion if isinstance(completion, list) else [{"role": "assistant", "content": str(completion)}],
         "score_correctness": rollout.get("score_correctness", 0),
         "score_efficiency": rollout.get("score_efficiency", 0),
-        "generation_ms": rollout.get("generation_ms", 5000)
+        "generation_ms": rollout.get("generation_ms")
     }
 
 
-def main():
-    print("Loading Final 25 data...")
+def rubric_scores(rollouts, digits=None):
+    """Mean of each optional rubric score over the rollouts that logged it."""
+    scores = {}
+    for name in RUBRIC_SCORES:
+        values = [e[name] for e in rollouts if name in e]
+        if values:
+            mean = sum(values) / len(values)
+            scores[name] = round(mean, digits) if digits is not None else mean
+    return scores
+
+
+def summarize_model(model_key, bank_rollouts, road_rollouts, trajectories=None):
+    """
+    Benchmark entry for one model, without its examples.
+
+    trajectories holds the bank rows then the road rows as groups 0 and 1;
+    it is built from the rollouts if not given.
+    """
+    provider = model_key.split("--")[0]
+    name = model_key.split("--")[-1]
+    all_rollouts = bank_rollouts + road_rollouts
+    if trajectories is None:
+        trajectories = TrajectoryColumns.from_groups([bank_rollouts, road_rollouts])
+    bank_cost, road_cost = trajectories.summaries(2)
+    cost = trajectories.summaries(1, merge=True)[0]
+
+    # Compute metrics
+    total_correct = sum(1 for e in all_rollouts if e.get("score_correctness", 0) >= 0.8)
+    total_attempts = len(all_rollouts)
+    correctness = total_correct / total_attempts if total_attempts else 0
+
+    avg_efficiency = sum(e.get("score_efficiency", 0) for e in all_rollouts) / len(all_rollouts) if all_rollouts else 0
+    avg_reward = sum(e.get("reward", 0) for e in all_rollouts) / len(all_rollouts) if all_rollouts else 0
+    best_reward = max((e.get("reward", 0) for e in all_rollouts), default=0)
+
+    # Create modes - bank vs road as "modes"
+    modes = {}
+    if bank_rollouts:
+        bank_correct = sum(1 for e in bank_rollouts if e.get("score_correctness", 0) >= 0.8)
+        bank_eff = sum(e.get("score_efficiency", 0) for e in bank_rollouts) / len(bank_rollouts)
+        bank_reward = sum(e.get("reward", 0) for e in bank_rollouts) / len(bank_rollouts)
+        modes["bank"] = {
+            "reward": bank_reward,
+            "metrics": {
+                "score_correctness": bank_correct / len(bank_rollouts),
+                "score_efficiency": bank_eff,
+                **rubric_scores(bank_rollouts),
+            },
+            "runs": len(bank_rollouts),
+            "cost": bank_cost,
+        }
+
+    if road_rollouts:
+        road_correct = sum(1 for e in road_rollouts if e.get("score_correctness", 0) >= 0.8)
+        road_eff = sum(e.get("score_efficiency", 0) for e in road_rollouts) / len(road_rollouts)
+        road_reward = sum(e.get("reward", 0) for e in road_rollouts) / len(road_rollouts)
+        modes["road"] = {
+            "reward": road_reward,
+            "metrics": {
+                "score_correctness": road_correct / len(road_rollouts),
+                "score_efficiency": road_eff,
+                **rubric_scores(road_rollouts),
+            },
+            "runs": len(road_rollouts),
+            "cost": road_cost,
+        }
+
+    return {
+        "model": f"{provider}/{name}",
+        "provider": provider,
+        "name": name,
+        "totalRuns": total_attempts,
+        "avgReward": round(avg_reward, 4),
+        "bestReward": round(best_reward, 4),
+        "modes": modes,
+        "metrics": {
+            "score_correctness": round(correctness, 4),
+            "score_efficiency": round(avg_efficiency, 4),
+            **rubric_scores(all_rollouts, 4),
+        },
+        "cost": cost,
+    }
+
+
+def build_examples(rollouts, tasks, first_id, trajectories=None):
+    """Examples for a model's rollouts, numbered from first_id, with their trajectory metrics."""
+    if trajectories is None:
+        trajectories = TrajectoryColumns.from_groups([rollouts])
+    examples = []
+    for i, rollout in enumerate(rollouts):
+        example = transform_rollout_to_example(rollout, tasks, first_id + i)
+        example.update(trajectories.row(i))
+        examples.append(example)
+    return examples
+
+
+def is_complete(model_data):
+    """Whether a model has both bank and road data."""
+    return bool(model_data["modes"].get("bank") and model_data["modes"].get("road"))
+
+
+def sort_key(model_data):
+    """Leaderboard order: by correctness, best first (use with reverse=True)."""
+    return model_data["metrics"]["score_correctness"]
+
+
+def build_model(model_key, rollouts, tasks, first_id):
+    """Benchmark entry for one model with its examples numbered from first_id."""
+    bank_rollouts = rollouts["bank"]
+    road_rollouts = rollouts["road"]
 
-    # Load results
-    with open(BENCHMARK_DIR / "final_25_results.json") as f:
-        results = json.load(f)
+    # One walk over the trajectories serves the summary and the examples
+    trajectories = TrajectoryColumns.from_groups([bank_rollouts, road_rollouts])
 
-    tasks = load_tasks()
+    # Convert to examples format - include ALL rollouts (25 tasks × 3 rollouts = 75)
+    model_data = summarize_model(model_key, bank_rollouts, road_rollouts, trajectories)
+    model_data["examples"] = build_examples(bank_rollouts + road_rollouts, tasks, first_id, trajectories)
+    return model_data
 
-    print(f"Found {len(results)} models, {len(tasks)} tasks")
+
+def rank_models(models):
+    """Complete models only (both bank and road data), best first."""
+    models = [m for m in models if is_complete(m)]
+    models.sort(key=sort_key, reverse=True)
+    return models
+
+
+def build_models(results, tasks, ingested=None, suite=None):
+    """Build per-model benchmark entries, complete models only, best first."""
+    if ingested is None:
+        ingested = ingest(results, suite=suite)
 
     models = []
-    total_runs = 0
     example_id = 1
 
     for r in results:
-        model_key = r["model"]
-        provider = model_key.split("--")[0]
-        name = model_key.split("--")[-1]
-
-        # Load all rollouts
-        bank_rollouts = load_bank_rollouts(model_key)
-        road_rollouts = load_road_rollouts(model_key)
-        all_rollouts = bank_rollouts + road_rollouts
-
-        # Convert to examples format - include ALL rollouts (25 tasks × 3 rollouts = 75)
-        examples = []
-        for rollout in all_rollouts:
-            ex = transform_rollout_to_example(rollout, tasks, example_id)
-            examples.append(ex)
-            example_id += 1
-
-        # Compute metrics
-        total_correct = sum(1 for e in all_rollouts if e.get("score_correctness", 0) >= 0.8)
-        total_attempts = len(all_rollouts)
-        correctness = total_correct / total_attempts if total_attempts else 0
-
-        avg_efficiency = sum(e.get("score_efficiency", 0) for e in all_rollouts) / len(all_rollouts) if all_rollouts else 0
-        avg_reward = sum(e.get("reward", 0) for e in all_rollouts) / len(all_rollouts) if all_rollouts else 0
-        best_reward = max((e.get("reward", 0) for e in all_rollouts), default=0)
-
-        # Create modes - bank vs road as "modes"
-        modes = {}
-        if bank_rollouts:
-            bank_correct = sum(1 for e in bank_rollouts if e.get("score_correctness", 0) >= 0.8)
-            bank_eff = sum(e.get("score_efficiency", 0) for e in bank_rollouts) / len(bank_rollouts)
-            bank_reward = sum(e.get("reward", 0) for e in bank_rollouts) / len(bank_rollouts)
-            modes["bank"] = {
-                "reward": bank_reward,
-                "metrics": {
-                    "score_correctness": bank_correct / len(bank_rollouts),
-                    "score_efficiency": bank_eff,
-                    "score_notes_usage": 0.8,
-                    "score_code_quality": 0.9
-                },
-                "runs": len(bank_rollouts)
-            }
-
-        if road_rollouts:
-            road_correct = sum(1 for e in road_rollouts if e.get("score_correctness", 0) >= 0.8)
-            road_eff = sum(e.get("score_efficiency", 0) for e in road_rollouts) / len(road_rollouts)
-            road_reward = sum(e.get("reward", 0) for e in road_rollouts) / len(road_rollouts)
-            modes["road"] = {
-                "reward": road_reward,
-                "metrics": {
-                    "score_correctness": road_correct / len(road_rollouts),
-                    "score_efficiency": road_eff,
-                    "score_notes_usage": 0.8,
-                    "score_code_quality": 0.9
-                },
-                "runs": len(road_rollouts)
-            }
-
-        model_data = {
-            "model": f"{provider}/{name}",
-            "provider": provider,
-            "name": name,
-            "totalRuns": total_attempts,
-            "avgReward": round(avg_reward, 4),
-            "bestReward": round(best_reward, 4),
-            "modes": modes,
-            "metrics": {
-                "score_correctness": round(correctness, 4),
-                "score_efficiency": round(avg_efficiency, 4),
-                "score_notes_usage": 0.8,
-                "score_code_quality": 0.9
-            },
-            "examples": examples
+        # Rollouts from the shared ingestion pass
+        model_data = build_model(r["model"], ingested[r["model"]], tasks, example_id)
+        example_id += len(model_data["examples"])
+        models.append(model_data)
+
+    return rank_models(models)
+
+
+class AggregateBuilder:
+    """
+    Accumulates the success tables used by FailureInsights and ABTestSimulator.
+
+    An example counts as a success when score_correctness > 0.5. Models are
+    added one at a time so the tables can be built while streaming.
+    - taskStats: task id -> level, success/fail/total and per-example outcomes
+    - levelStats: level -> success/total across all models
+    - modelStats: model -> per-level success/total/avgTime, overall rates
+      and its weakest level (among levels with at least 2 attempts); avgTime
+      averages the examples with a logged generation_ms and is None if none do
+    - confidence: intervals for each model's success rate, overall and per
+      level (see codeblue_data.confidence)
+
+    The pairwise significance table grows with the square of the number of
+    models, so it is kept out of the tables, in ``pairwise``, and written
+    to PAIRWISE_FILE instead of the statically imported payload.
+    """
+
+    def __init__(self):
+        self.task_stats = {}
+        self.level_stats = {}
+        self.model_stats = {}
+        # Per-model [success, total] per task, for the confidence tables
+        self.task_counts = {}
+        self.confidence = None
+        self.pairwise = None
+
+    def add_model(self, m):
+        """Fold one model's examples into the tables."""
+        levels = {}
+        timed = {}
+        success = total = total_time = total_timed = 0
+
+        for ex in m["examples"]:
+            info = ex["info"]
+            level = info["level"]
+            succeeded = ex["score_correctness"] > 0.5
+
+            task = self.task_stats.setdefault(info["task_id"], {
+                "level": level, "success": 0, "fail": 0, "total": 0, "models": [],
+            })
+            task["total"] += 1
+            task["success" if succeeded else "fail"] += 1
+            task["models"].append({"name": m["name"], "provider": m["provider"], "succeeded": succeeded})
+
+            cell = self.task_counts.setdefault(m["model"], {}).setdefault(info["task_id"], [0, 0])
+            cell[0] += succeeded
+            cell[1] += 1
+
+            overall = self.level_stats.setdefault(level, {"success": 0, "total": 0})
+            overall["total"] += 1
+            overall["success"] += succeeded
+
+            lv = levels.setdefault(level, {"success": 0, "total": 0, "avgTime": 0})
+            lv["total"] += 1
+            lv["success"] += succeeded
+            total += 1
+            success += succeeded
+            if ex["generation_ms"] is not None:
+                lv["avgTime"] += ex["generation_ms"]
+                timed[level] = timed.get(level, 0) + 1
+                total_time += ex["generation_ms"]
+                total_timed += 1
+
+        weakest_level, weakest_rate = "", 100
+        for level, lv in levels.items():
+            lv["avgTime"] = lv["avgTime"] / timed[level] if level in timed else None
+            if lv["total"] >= 2:
+                rate = 100 * lv["success"] / lv["total"]
+                if rate < weakest_rate:
+                    weakest_level, weakest_rate = level, rate
+
+        self.model_stats[m["model"]] = {
+            "name": m["name"],
+            "provider": m["provider"],
+            "levels": levels,
+            "overallSuccess": 100 * success / total if total else 0,
+            "avgTime": total_time / total_timed if total_timed else None,
+            "weakestLevel": weakest_level,
+            "weakestRate": weakest_rate,
+        }
+
+        self.confidence = None
+
+    def compute_confidence(self):
+        """Confidence tables over the models added so far."""
+        task_ids = list(self.task_stats)
+        model_keys = list(self.task_counts)
+        correct = [[self.task_counts[key].get(t, [0, 0])[0] for t in task_ids] for key in model_keys]
+        total = [[self.task_counts[key].get(t, [0, 0])[1] for t in task_ids] for key in model_keys]
+        levels = task_groups([self.task_stats[t]["level"] for t in task_ids])
+        return confidence_tables(model_keys, correct, total, {"levels": levels})
+
+    def result(self):
+        if self.confidence is None:
+            self.confidence = self.compute_confidence()
+            self.pairwise = self.confidence.pop("pairwise")
+        return {
+            "taskStats": self.task_stats,
+            "levelStats": self.level_stats,
+            "modelStats": self.model_stats,
+            "confidence": self.confidence,
         }
 
-        models.append(model_data)
-        total_runs += total_attempts
 
-    # Filter to only complete models (both bank and road data)
-    models = [m for m in models if m["modes"].get("bank") and m["modes"].get("road")]
+def aggregate_models(models):
+    """AggregateBuilder with every model folded in."""
+    builder = AggregateBuilder()
+    for m in models:
+        builder.add_model(m)
+    return builder
 
-    # Recalculate total runs for filtered models
-    total_runs = sum(m["totalRuns"] for m in models)
 
-    # Sort by correctness
-    models.sort(key=lambda m: m["metrics"]["score_correctness"], reverse=True)
+def compute_aggregates(models):
+    """Precompute the FailureInsights/ABTestSimulator tables for models."""
+    return aggregate_models(models).result()
 
-    output = {
+
+def build_output(results, tasks, ingested=None, instr=None, suite=None):
+    """Build the benchmark-data.json payload for suite (default: the default suite)."""
+    if instr is None:
+        instr = Instrumentation()
+
+    with instr.stage("build_models"):
+        models = build_models(results, tasks, ingested, suite)
+    return build_payload(models, instr)
+
+
+def build_payload(models, instr=None):
+    """
+    Build the benchmark-data.json payload from ranked model entries.
+
+    The pairwise significance table rides along as "pairwise";
+    write_output() moves it to PAIRWISE_FILE.
+    """
+    if instr is None:
+        instr = Instrumentation()
+
+    with instr.stage("compute_benchmark_aggregates"):
+        builder = aggregate_models(models)
+        aggregates = builder.result()
+
+    return {
         "generated": datetime.now().isoformat(),
-        "totalRuns": total_runs,
-        "models": models
+        "totalRuns": sum(m["totalRuns"] for m in models),
+        "models": models,
+        "aggregates": aggregates,
+        "pairwise": builder.pairwise,
     }
 
-    print(f"Writing to {OUTPUT_FILE}...")
-    with open(OUTPUT_FILE, 'w') as f:
-        json.dump(output, f, indent=2)
 
-    print(f"\nDone! {len(models)} models, {total_runs} total runs")
-    for m in models[:5]:
+def trajectory_slug(model):
+    """Shard file stem for a model id like "provider/name"."""
+    return model.replace("/", "--")
+
+
+def reference_transcripts(examples, table):
+    """Copies of examples whose transcript messages are references into table."""
+    return [dict(ex, **{field: [table.ref(message) for message in ex[field]]
+                        for field in TRANSCRIPT_FIELDS if field in ex})
+            for ex in examples]
+
+
+def with_content(payload, table):
+    """Payload with the models' transcripts moved into a content table."""
+    models = [dict(m, examples=reference_transcripts(m["examples"], table)) for m in payload["models"]]
+    return dict(payload, models=models, content=table.bodies)
+
+
+def split_model(m):
+    """Split one model entry into (entry without transcripts, trajectory shard)."""
+    examples = []
+    transcripts = []
+    for ex in m["examples"]:
+        examples.append({k: v for k, v in ex.items() if k not in TRANSCRIPT_FIELDS})
+        transcript = {"example_id": ex["example_id"]}
+        for field in TRANSCRIPT_FIELDS:
+            transcript[field] = ex[field]
+        transcripts.append(transcript)
+    return dict(m, examples=examples), {"model": m["model"], "examples": transcripts}
+
+
+def split_transcripts(output):
+    """
+    Split a payload into a transcript-free summary and per-model shards.
+
+    Returns (summary, shards) where shards maps a trajectory slug to
+    {"model": ..., "examples": [{"example_id", "prompt", "completion"}]}.
+    """
+    models = []
+    shards = {}
+    for m in output["models"]:
+        entry, shard = split_model(m)
+        models.append(entry)
+        shards[trajectory_slug(m["model"])] = shard
+
+    return dict(output, models=models), shards
+
+
+def output_paths(suite=None):
+    """(OUTPUT_FILE, SUMMARY_FILE, TRAJECTORY_DIR, PAIRWISE_FILE), relocated for suite if given."""
+    paths = (OUTPUT_FILE, SUMMARY_FILE, TRAJECTORY_DIR, PAIRWISE_FILE)
+    if suite is None:
+        return paths
+    return tuple(suite.output_path(path) for path in paths)
+
+
+def write_shard(trajectory_dir, slug, shard, compact=False):
+    """Write one model's trajectory shard, its messages in a content table."""
+    table = ContentTable()
+    shard = dict(shard, examples=reference_transcripts(shard["examples"], table), content=table.bodies)
+    write_json(trajectory_dir / f"{slug}.json",
+               intern_strings(shard) if compact else shard, compact)
+
+
+def remove_stale_shards(trajectory_dir, slugs):
+    """Drop shards (and their .gz/.br siblings) of models not in slugs."""
+    for stale in trajectory_dir.glob("*.json*"):
+        if stale.name[:stale.name.rfind(".json")] not in slugs:
+            stale.unlink()
+
+
+def write_shards(output, compact=False, suite=None, only=None):
+    """
+    Write the summary file and one trajectory shard per model.
+
+    Compact shards intern repeated strings (system prompts, goals) into a
+    lookup table that the model page decodes after fetching. If only is
+    given, just the shards with those slugs are rewritten.
+    """
+    _, summary_file, trajectory_dir, _ = output_paths(suite)
+    summary, shards = split_transcripts(output)
+
+    print(f"Writing summary to {summary_file}...")
+    write_json(summary_file, summary, compact)
+
+    changed = [slug for slug in shards if only is None or slug in only]
+    print(f"Writing {len(changed)} trajectory shards to {trajectory_dir}...")
+    trajectory_dir.mkdir(parents=True, exist_ok=True)
+    for slug in changed:
+        write_shard(trajectory_dir, slug, shards[slug], compact)
+    remove_stale_shards(trajectory_dir, shards)
+
+
+def write_pairwise(pairwise, compact=False, suite=None):
+    """Write the pairwise significance table (null without NumPy) to PAIRWISE_FILE."""
+    pairwise_file = output_paths(suite)[3]
+    print(f"Writing pairwise significance to {pairwise_file}...")
+    pairwise_file.parent.mkdir(parents=True, exist_ok=True)
+    write_json(pairwise_file, pairwise, compact)
+
+
+def write_output(output, compact=False, suite=None, only=None):
+    """Write the payload to OUTPUT_FILE, plus the summary, trajectory shards and PAIRWISE_FILE."""
+    output = dict(output)
+    pairwise = output.pop("pairwise", None)
+    output_file = output_paths(suite)[0]
+    print(f"Writing to {output_file}...")
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    write_json(output_file, with_content(output, ContentTable()), compact)
+    write_shards(output, compact, suite, only)
+    write_pairwise(pairwise, compact, suite)
+
+
+def stream_output(results, tasks, cache=None, jobs=1, compact=False, suite=None, rescorer=None):
+    """
+    Build and write all outputs while holding one model's examples at a time.
+
+    The first pass ingests models one by one, writes each trajectory shard
+    and spills the full entry to a temporary file, keeping only its summary.
+    Once the leaderboard order is known, the second pass streams the spilled
+    entries into OUTPUT_FILE and SUMMARY_FILE, accumulating the aggregates
+    on the way. The files are the same as write_output(build_output(...)).
+    With a rescorer each model's rollouts are regraded as they are ingested.
+
+    Returns the payload without examples, for print_summary().
+    """
+    output_file, summary_file, trajectory_dir, _ = output_paths(suite)
+    trajectory_dir.mkdir(parents=True, exist_ok=True)
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+
+    with tempfile.TemporaryDirectory() as spill_dir:
+        spill_dir = Path(spill_dir)
+        models = []
+        example_id = 1
+
+        for i, (model_key, rollouts) in enumerate(iter_ingest(results, cache, jobs, suite)):
+            if rescorer is not None:
+                rescorer.rescore(rollouts["bank"] + rollouts["road"])
+            trajectories = TrajectoryColumns.from_groups([rollouts["bank"], rollouts["road"]])
+            model_data = summarize_model(model_key, rollouts["bank"], rollouts["road"], trajectories)
+            examples = build_examples(rollouts["bank"] + rollouts["road"], tasks, example_id, trajectories)
+            example_id += len(examples)
+            if not is_complete(model_data):
+                continue
+
+            full = dict(model_data, examples=examples)
+            spilled = spill_dir / f"{i}.pickle"
+            with open(spilled, "wb") as f:
+                pickle.dump(full, f, pickle.HIGHEST_PROTOCOL)
+            write_shard(trajectory_dir, trajectory_slug(full["model"]), split_model(full)[1], compact)
+            models.append((model_data, spilled))
+
+        models.sort(key=lambda entry: sort_key(entry[0]), reverse=True)
+        remove_stale_shards(trajectory_dir, {trajectory_slug(m["model"]) for m, _ in models})
+
+        def spilled_models():
+            for _, spilled in models:
+                with open(spilled, "rb") as f:
+                    yield pickle.load(f)
+
+        # Bodies go to disk as they are first referenced, so the table does
+        # not grow with the number of models held in memory
+        table = SpilledContentTable(spill_dir / "content.jsonl")
+
+        def aggregated_models():
+            for m in spilled_models():
+                builder.add_model(m)
+                yield dict(m, examples=reference_transcripts(m["examples"], table))
+
+        builder = AggregateBuilder()
+        header = [
+            ("generated", datetime.now().isoformat()),
+            ("totalRuns", sum(m["totalRuns"] for m, _ in models)),
+        ]
+
+        print(f"Streaming to {output_file}...")
+        write_json_stream(output_file, header + [
+            ("models", StreamedList(aggregated_models())),
+            ("aggregates", builder.result),
+            ("content", lambda: StreamedDict(table.items())),
+        ], compact)
+
+        print(f"Streaming summary to {summary_file}...")
+        write_json_stream(summary_file, header + [
+            ("models", StreamedList(split_model(m)[0] for m in spilled_models())),
+            ("aggregates", builder.result()),
+        ], compact)
+
+    write_pairwise(builder.pairwise, compact, suite)
+    return dict(header, models=[m for m, _ in models])
+
+
+def print_summary(output):
+    """Print a short summary of a built payload."""
+    print(f"\nDone! {len(output['models'])} models, {output['totalRuns']} total runs")
+    for m in output["models"][:5]:
         print(f"  {m['name']}: {m['metrics']['score_correctness']*100:.1f}% correctness")
 
 
+def main():
+    parser = make_parser("Transform Final 25 data into benchmark-data.json.")
+    parser.add_argument("--stream", action="store_true",
+                        help="build and write one model at a time to bound memory use "
+                             "(each suite is then ingested separately)")
+    args = parser.parse_args()
+    apply_benchmark_dir(args)
+    apply_strict(args)
+    suites = suites_from_args(args)
+    cache = cache_from_args(args)
+    instr = instrumentation_from_args(args)
+
+    with profiled(args.profile):
+        print("Loading Final 25 data...")
+
+        with instr.stage("load_results"):
+            results = load_results()
+        with instr.stage("load_tasks"):
+            tasks = load_tasks()
+
+        print(f"Found {len(results)} models, {len(tasks)} tasks")
+
+        rescorer = rescorer_from_args(args, tasks.values())
+        outputs = []
+        if args.stream:
+            for suite in suites:
+                with instr.stage("stream"):
+                    outputs.append((suite, stream_output(suite.select(results), tasks, cache,
+                                                         args.jobs, args.compact, suite, rescorer)))
+            print_cache_stats(cache)
+            print_malformed_stats()
+            print_rescore_stats(rescorer)
+        else:
+            with instr.stage("ingest"):
+                ingested = ingest_suites(results, suites, cache, args.jobs)
+            print_cache_stats(cache)
+            print_malformed_stats()
+
+            if rescorer is not None:
+                with instr.stage("rescore"):
+                    rescore_ingested(ingested, rescorer)
+                print_rescore_stats(rescorer)
+
+            for suite in suites:
+                output = build_output(suite.select(results), tasks, ingested[suite.name], instr, suite)
+                with instr.stage("dump"):
+                    write_output(output, args.compact, suite)
+                outputs.append((suite, output))
+
+    for suite, output in outputs:
+        if len(suites) > 1:
+            print(f"\nSuite {suite.name}:")
+        print_summary(output)
+    if args.report:
+        instr.write_report(args.report)
+
+
 if __name__ == "__main__":
     main()
@@ -1,7 +1,7 @@
 'use client';
 
 import { useParams, useRouter } from 'next/navigation';
-import { useMemo, useState } from 'react';
+import { useEffect, useMemo, useState } from 'react';
 import {
   ArrowLeft,
   Trophy,
@@ -35,7 +35,8 @@ import {
   Pie,
   Cell,
 } from 'recharts';
-import benchmarkData from '@/data/benchmark-data.json';
+import benchmarkData from '@/data/benchmark-summary.json';
+import { fetchTrajectories, type Trajectory } from '@/lib/trajectories';
 
 interface Example {
   example_id: number;
@@ -48,11 +49,24 @@ interface Example {
     task_id: string;
     tolerance: number;
   };
-  prompt: Array<{ content: string; role: string }>;
-  completion: Array<{ content: string; role: string }>;
   score_correctness: number;
   score_efficiency: number;
-  generation_ms: number;
+  // Only set when the rollout log recorded timing
+  generation_ms: number | null;
+  turns?: number;
+  tool_calls?: number;
+  output_chars?: number;
+}
+
+// Trajectory-derived cost and latency (see scripts/codeblue_data/trajectory.py)
+interface CostSummary {
+  rollouts: number;
+  avgTurns: number;
+  avgToolCalls: number;
+  avgOutputChars: number;
+  avgOutputTokens: number;
+  latencyMs: { timed: number; mean: number; p50: number; p95: number } | null;
+  rewardPerSecond: number | null;
 }
 
 interface ModelData {
@@ -64,11 +78,18 @@ interface ModelData {
   bestReward: number;
   rank?: number;
   color?: string;
-  modes: Record<string, { reward: number; metrics: Record<string, number>; runs: number }>;
+  modes: Record<string, { reward: number; metrics: Record<string, number>; runs: number; cost?: CostSummary | null }>;
   metrics: Record<string, number>;
+  cost?: CostSummary | null;
   examples: Example[];
 }
 
+const formatSeconds = (ms: number | null | undefined) =>
+  ms === null || ms === undefined ? '—' : `${(ms / 1000).toFixed(1)}s`;
+
+const formatScore = (value: number | undefined) =>
+  value === undefined ? '—' : `${(value * 100).toFixed(1)}%`;
+
 const providerColors: Record<string, string> = {
   qwen: '#10B981',
   anthropic: '#8B5CF6',
@@ -95,12 +116,29 @@ export default function ModelDetailPage() {
   const [activeTab, setActiveTab] = useState<'overview' | 'trajectories' | 'analysis'>('overview');
   const [expandedExample, setExpandedExample] = useState<number | null>(null);
 
+  const [trajectories, setTrajectories] = useState<Record<number, Trajectory> | null>(null);
+
   const modelData = useMemo(() => {
     return (benchmarkData.models as ModelData[]).find(
       (m) => m.model === modelParam || m.name === modelParam
     );
   }, [modelParam]);
 
+  // Load this model's transcripts the first time the trajectories tab opens
+  useEffect(() => {
+    if (activeTab !== 'trajectories' || !modelData || trajectories) return;
+
+    // Transcripts live in per-model shards, fetched on demand
+    let cancelled = false;
+    fetchTrajectories(modelData.model).then((byId) => {
+      if (!cancelled) setTrajectories(byId);
+    });
+
+    return () => {
+      cancelled = true;
+    };
+  }, [activeTab, modelData, trajectories]);
+
   if (!modelData) {
     return (
       <div className="min-h-screen bg-slate-900 p-8">
@@ -130,12 +168,15 @@ export default function ModelDetailPage() {
     : 0;
 
   // Radar chart data
+  // Rubric scores the logs don't carry are left off the chart
   const radarData = [
-    { metric: 'Correctness', value: (modelData.metrics.score_correctness || 0) * 100, fullMark: 100 },
-    { metric: 'Efficiency', value: (modelData.metrics.score_efficiency || 0) * 100, fullMark: 100 },
-    { metric: 'Notes Usage', value: (modelData.metrics.score_notes_usage || 0) * 100, fullMark: 100 },
-    { metric: 'Code Quality', value: (modelData.metrics.score_code_quality || 0) * 100, fullMark: 100 },
-  ];
+    { metric: 'Correctness', key: 'score_correctness' },
+    { metric: 'Efficiency', key: 'score_efficiency' },
+    { metric: 'Notes Usage', key: 'score_notes_usage' },
+    { metric: 'Code Quality', key: 'score_code_quality' },
+  ]
+    .filter(({ key }) => modelData.metrics[key] !== undefined)
+    .map(({ metric, key }) => ({ metric, value: modelData.metrics[key] * 100, fullMark: 100 }));
 
   // Mode comparison data
   const modeData = Object.entries(modelData.modes).map(([mode, data]) => ({
@@ -152,10 +193,9 @@ export default function ModelDetailPage() {
     { name: 'Failure', value: modelData.examples.length - successfulExamples.length, color: '#EF4444' },
   ];
 
-  // Average generation time
-  const avgGenTime = modelData.examples.length > 0
-    ? modelData.examples.reduce((sum, e) => sum + (e.generation_ms || 0), 0) / modelData.examples.length / 1000
-    : 0;
+  // Average generation time over the rollouts that logged one
+  const latency = modelData.cost?.latencyMs ?? null;
+  const avgGenTime = latency ? latency.mean / 1000 : null;
 
   const tabs = [
     { id: 'overview', label: 'Overview', icon: BarChart3 },
@@ -232,7 +272,13 @@ export default function ModelDetailPage() {
               <Clock className="w-4 h-4" />
               Avg Gen Time
             </div>
-            <div className="text-2xl font-bold text-white">{avgGenTime.toFixed(1)}s</div>
+            <div className="text-2xl font-bold text-white">{formatSeconds(latency?.mean)}</div>
+            {latency && (
+              <div className="text-xs text-slate-400 mt-1">
+                p50 {formatSeconds(latency.p50)} · p95 {formatSeconds(latency.p95)}
+                {modelData.cost?.rewardPerSecond != null && ` · ${modelData.cost.rewardPerSecond.toFixed(3)} reward/s`}
+              </div>
+            )}
           </div>
           <div className="bg-slate-800 rounded-lg p-4">
             <div className="flex items-center gap-2 text-slate-400 text-sm mb-1">
@@ -398,7 +444,7 @@ export default function ModelDetailPage() {
                     <div className="text-right">
                       <div className="text-sm text-slate-400">Time</div>
                       <div className="font-medium text-white">
-                        {(example.generation_ms / 1000).toFixed(1)}s
+                        {formatSeconds(example.generation_ms)}
                       </div>
                     </div>
                     {expandedExample === idx ? (
@@ -427,44 +473,50 @@ export default function ModelDetailPage() {
                     </div>
 
                     <h4 className="text-sm font-medium text-slate-400 mb-2">Conversation</h4>
-                    <div className="space-y-3 max-h-96 overflow-y-auto">
-                      {example.prompt.map((msg, msgIdx) => (
-                        <div
-                          key={`prompt-${msgIdx}`}
-                          className={`p-3 rounded ${
-                            msg.role === 'system'
-                              ? 'bg-slate-900 border-l-2 border-blue-500'
-                              : msg.role === 'user'
-                              ? 'bg-slate-900 border-l-2 border-amber-500'
-                              : 'bg-slate-900 border-l-2 border-emerald-500'
-                          }`}
-                        >
-                          <div className="text-xs uppercase text-slate-500 mb-1">{msg.role}</div>
-                          <pre className="text-sm text-slate-300 whitespace-pre-wrap font-mono">
-                            {msg.content.length > 500
-                              ? msg.content.slice(0, 500) + '...'
-                              : msg.content}
-                          </pre>
-                        </div>
-                      ))}
-                      {example.completion.map((msg, msgIdx) => (
-                        <div
-                          key={`completion-${msgIdx}`}
-                          className={`p-3 rounded ${
-                            msg.role === 'assistant'
-                              ? 'bg-slate-900 border-l-2 border-emerald-500'
-                              : 'bg-slate-900 border-l-2 border-amber-500'
-                          }`}
-                        >
-                          <div className="text-xs uppercase text-slate-500 mb-1">{msg.role}</div>
-                          <pre className="text-sm text-slate-300 whitespace-pre-wrap font-mono">
-                            {msg.content.length > 500
-                              ? msg.content.slice(0, 500) + '...'
-                              : msg.content}
-                          </pre>
-                        </div>
-                      ))}
-                    </div>
+                    {!trajectories?.[example.example_id] ? (
+                      <div className="text-sm text-slate-500">
+                        {trajectories ? 'Transcript not available.' : 'Loading transcript...'}
+                      </div>
+                    ) : (
+                      <div className="space-y-3 max-h-96 overflow-y-auto">
+                        {trajectories[example.example_id].prompt.map((msg, msgIdx) => (
+                          <div
+                            key={`prompt-${msgIdx}`}
+                            className={`p-3 rounded ${
+                              msg.role === 'system'
+                                ? 'bg-slate-900 border-l-2 border-blue-500'
+                                : msg.role === 'user'
+                                ? 'bg-slate-900 border-l-2 border-amber-500'
+                                : 'bg-slate-900 border-l-2 border-emerald-500'
+                            }`}
+                          >
+                            <div className="text-xs uppercase text-slate-500 mb-1">{msg.role}</div>
+                            <pre className="text-sm text-slate-300 whitespace-pre-wrap font-mono">
+                              {msg.content.length > 500
+                                ? msg.content.slice(0, 500) + '...'
+                                : msg.content}
+                            </pre>
+                          </div>
+                        ))}
+                        {trajectories[example.example_id].completion.map((msg, msgIdx) => (
+                          <div
+                            key={`completion-${msgIdx}`}
+                            className={`p-3 rounded ${
+                              msg.role === 'assistant'
+                                ? 'bg-slate-900 border-l-2 border-emerald-500'
+                                : 'bg-slate-900 border-l-2 border-amber-500'
+                            }`}
+                          >
+                            <div className="text-xs uppercase text-slate-500 mb-1">{msg.role}</div>
+                            <pre className="text-sm text-slate-300 whitespace-pre-wrap font-mono">
+                              {msg.content.length > 500
+                                ? msg.content.slice(0, 500) + '...'
+                                : msg.content}
+                            </pre>
+                          </div>
+                        ))}
+                      </div>
+                    )}
                   </div>
                 )}
               </div>
@@ -505,10 +557,10 @@ export default function ModelDetailPage() {
                           {((data.metrics.score_efficiency || 0) * 100).toFixed(1)}%
                         </td>
                         <td className="py-3 px-4 text-right text-slate-300">
-                          {((data.metrics.score_notes_usage || 0) * 100).toFixed(1)}%
+                          {formatScore(data.metrics.score_notes_usage)}
                         </td>
                         <td className="py-3 px-4 text-right text-slate-300">
-                          {((data.metrics.score_code_quality || 0) * 100).toFixed(1)}%
+                          {formatScore(data.metrics.score_code_quality)}
                         </td>
                       </tr>
                     ))}
@@ -585,7 +637,7 @@ export default function ModelDetailPage() {
                     </div>
                   </div>
                 )}
-                {avgGenTime > 60 && (
+                {avgGenTime !== null && avgGenTime > 60 && (
                   <div className="flex items-start gap-3 p-3 bg-red-500/10 border border-red-500/30 rounded-lg">
                     <Clock className="w-5 h-5 text-red-400 flex-shrink-0 mt-0.5" />
                     <div>
@@ -8,6 +8,7 @@ import Final25Leaderboard from '@/components/Final25Leaderboard';
 import TaskHeatmap from '@/components/TaskHeatmap';
 import TemplateAnalysis from '@/components/TemplateAnalysis';
 import AnomalyInsights from '@/components/AnomalyInsights';
+import RankTrend from '@/components/RankTrend';
 
 const tabs = [
   { id: 'leaderboard', label: 'Leaderboard', icon: Trophy },
@@ -98,7 +99,12 @@ export default function Final25Page() {
 
         {/* Tab Content */}
         <Suspense fallback={<LoadingState />}>
-          {activeTab === 'leaderboard' && <Final25Leaderboard />}
+          {activeTab === 'leaderboard' && (
+            <div className="space-y-6">
+              <Final25Leaderboard />
+              <RankTrend />
+            </div>
+          )}
           {activeTab === 'tasks' && <TaskHeatmap />}
           {activeTab === 'templates' && <TemplateAnalysis />}
           {activeTab === 'anomalies' && <AnomalyInsights />}
@@ -1,32 +1,83 @@
 'use client';
 
-import { useState, useMemo } from 'react';
+import { useEffect, useState } from 'react';
 import { FlaskConical, Sliders, TrendingUp, DollarSign, Clock, Check, X, BarChart3 } from 'lucide-react';
-import benchmarkDataRaw from '@/data/benchmark-data.json';
-
-interface Example {
-  example_id: number;
-  task: string;
-  reward: number;
-  answer: string;
-  info: { expected: number; level: string; task_id: string } | null;
-  score_correctness: number;
-  score_efficiency: number;
-  generation_ms: number;
-}
+import benchmarkDataRaw from '@/data/benchmark-summary.json';
+import { resolveContent } from '@/lib/content';
 
 interface ModelData {
   model: string;
   provider: string;
   name: string;
-  examples: Example[];
+}
+
+interface ModelStats {
+  name: string;
+  provider: string;
+  // avgTime is null when none of the rollouts logged timing
+  levels: Record<string, { success: number; total: number; avgTime: number | null }>;
+  overallSuccess: number;
+  avgTime: number | null;
+}
+
+interface ConfidenceCell {
+  pct: number;
+  correct: number;
+  total: number;
+  wilson: [number, number];
+  bootstrap: [number, number] | null;
+}
+
+interface Confidence {
+  models: Record<string, { overall: ConfidenceCell }>;
+}
+
+// Written to public/data by scripts/transform_to_benchmark_format.py;
+// null when the build had no NumPy for the bootstrap
+interface Pairwise {
+  models: string[];
+  diff: number[][];
+  low: number[][];
+  high: number[][];
+  pValue: number[][];
 }
 
 interface BenchmarkData {
   models: ModelData[];
+  aggregates: {
+    modelStats: Record<string, ModelStats>;
+    confidence?: Confidence;
+  };
 }
 
-const benchmarkData = benchmarkDataRaw as BenchmarkData;
+const benchmarkData = resolveContent<BenchmarkData>(benchmarkDataRaw);
+
+// Per-level success and latency per model, and success-rate confidence
+// intervals, precomputed by scripts/transform_to_benchmark_format.py
+const modelStats = benchmarkData.aggregates.modelStats;
+const confidence = benchmarkData.aggregates.confidence;
+
+// Measured success rate of a model with its 95% interval
+const measuredSuccess = (modelId: string) => {
+  const cell = confidence?.models[modelId]?.overall;
+  if (!cell) return null;
+  const [low, high] = cell.bootstrap ?? cell.wilson;
+  return { pct: cell.pct, low, high };
+};
+
+// Paired bootstrap comparison of the measured success rates of a and b
+const compareModels = (pairwise: Pairwise | null, a: string, b: string) => {
+  if (!pairwise) return null;
+  const i = pairwise.models.indexOf(a);
+  const j = pairwise.models.indexOf(b);
+  if (i < 0 || j < 0) return null;
+  return {
+    diff: pairwise.diff[i][j],
+    low: pairwise.low[i][j],
+    high: pairwise.high[i][j],
+    pValue: pairwise.pValue[i][j],
+  };
+};
 
 const providerColors: Record<string, string> = {
   'qwen': '#10B981',
@@ -76,63 +127,24 @@ export default function ABTestSimulator({ onClose }: ABTestSimulatorProps) {
     L5: 15,
     L6: 10,
   });
-
-  // Calculate model statistics by level
-  const modelStats = useMemo(() => {
-    const stats: Record<string, {
-      name: string;
-      provider: string;
-      levels: Record<string, { success: number; total: number; avgTime: number }>;
-      overallSuccess: number;
-      avgTime: number;
-    }> = {};
-
-    benchmarkData.models.forEach(model => {
-      stats[model.model] = {
-        name: model.name,
-        provider: model.provider,
-        levels: {},
-        overallSuccess: 0,
-        avgTime: 0
-      };
-
-      let totalSuccess = 0;
-      let totalCount = 0;
-      let totalTime = 0;
-
-      model.examples.forEach(ex => {
-        if (!ex.info) return;
-        const level = ex.info.level;
-
-        if (!stats[model.model].levels[level]) {
-          stats[model.model].levels[level] = { success: 0, total: 0, avgTime: 0 };
-        }
-
-        stats[model.model].levels[level].total++;
-        stats[model.model].levels[level].avgTime += ex.generation_ms;
-
-        if (ex.score_correctness > 0.5) {
-          stats[model.model].levels[level].success++;
-          totalSuccess++;
-        }
-
-        totalCount++;
-        totalTime += ex.generation_ms;
-      });
-
-      // Calculate averages
-      Object.values(stats[model.model].levels).forEach(levelStats => {
-        if (levelStats.total > 0) {
-          levelStats.avgTime = levelStats.avgTime / levelStats.total;
-        }
-      });
-
-      stats[model.model].overallSuccess = totalCount > 0 ? (totalSuccess / totalCount) * 100 : 0;
-      stats[model.model].avgTime = totalCount > 0 ? totalTime / totalCount : 0;
-    });
-
-    return stats;
-  }, []);
+  const [pairwise, setPairwise] = useState<Pairwise | null>(null);
+  const bothSelected = modelA !== null && modelB !== null;
+
+  // The pairwise table grows with the square of the model count, so it is
+  // fetched once two models are picked rather than bundled with the page
+  useEffect(() => {
+    if (!bothSelected || pairwise) return;
+    let cancelled = false;
+    fetch('/data/benchmark-pairwise.json')
+      .then((res) => (res.ok ? res.json() : null))
+      .then((data: Pairwise | null) => {
+        if (!cancelled) setPairwise(data);
+      })
+      .catch(() => {});
+    return () => {
+      cancelled = true;
+    };
+  }, [bothSelected, pairwise]);
 
   // Calculate projected outcomes for a model
   const calculateProjection = (modelId: string | null) => {
@@ -143,6 +155,7 @@ export default function ABTestSimulator({ onClose }: ABTestSimulatorProps) {
     const stats = modelStats[modelId];
     let weightedSuccess = 0;
     let weightedTime = 0;
+    let timedWeight = 0;
     let totalWeight = 0;
 
     Object.entries(distribution).forEach(([level, weight]) => {
@@ -153,13 +166,16 @@ export default function ABTestSimulator({ onClose }: ABTestSimulatorProps) {
           : 50; // Default assumption
 
         weightedSuccess += successRate * weight;
-        weightedTime += levelStats.avgTime * weight;
+        if (levelStats.avgTime !== null) {
+          weightedTime += levelStats.avgTime * weight;
+          timedWeight += weight;
+        }
         totalWeight += weight;
       }
     });
 
     const successRate = totalWeight > 0 ? weightedSuccess / totalWeight : 0;
-    const avgLatency = totalWeight > 0 ? weightedTime / totalWeight : 0;
+    const avgLatency = timedWeight > 0 ? weightedTime / timedWeight : 0;
     const costPerMillion = modelCosts[modelId] || 1.0;
     const monthlyCost = (monthlyQueries * avgTokens * costPerMillion) / 1000000;
 
@@ -168,6 +184,9 @@ export default function ABTestSimulator({ onClose }: ABTestSimulatorProps) {
 
   const projectionA = calculateProjection(modelA);
   const projectionB = calculateProjection(modelB);
+  const measuredA = modelA ? measuredSuccess(modelA) : null;
+  const measuredB = modelB ? measuredSuccess(modelB) : null;
+  const comparison = modelA && modelB ? compareModels(pairwise, modelA, modelB) : null;
 
   // Normalize distribution to 100%
   const normalizeDistribution = () => {
@@ -351,10 +370,20 @@ export default function ABTestSimulator({ onClose }: ABTestSimulatorProps) {
                 <div className={`p-3 rounded-lg ${projectionA.successRate >= projectionB.successRate ? 'bg-emerald-500/20 border border-emerald-500/30' : 'bg-gray-800/50'}`}>
                   <div className="text-xs text-blue-400 mb-1">Model A</div>
                   <div className="text-xl font-bold text-white">{projectionA.successRate.toFixed(1)}%</div>
+                  {measuredA && (
+                    <div className="text-[10px] text-gray-500 mt-1">
+                      measured {measuredA.pct.toFixed(1)}% ({measuredA.low.toFixed(0)}–{measuredA.high.toFixed(0)}%)
+                    </div>
+                  )}
                 </div>
                 <div className={`p-3 rounded-lg ${projectionB.successRate >= projectionA.successRate ? 'bg-emerald-500/20 border border-emerald-500/30' : 'bg-gray-800/50'}`}>
                   <div className="text-xs text-orange-400 mb-1">Model B</div>
                   <div className="text-xl font-bold text-white">{projectionB.successRate.toFixed(1)}%</div>
+                  {measuredB && (
+                    <div className="text-[10px] text-gray-500 mt-1">
+                      measured {measuredB.pct.toFixed(1)}% ({measuredB.low.toFixed(0)}–{measuredB.high.toFixed(0)}%)
+                    </div>
+                  )}
                 </div>
               </div>
             </div>
@@ -396,6 +425,18 @@ export default function ABTestSimulator({ onClose }: ABTestSimulatorProps) {
             </div>
           </div>
 
+          {/* Significance */}
+          {comparison && (
+            <div className="mt-4 p-3 rounded-lg bg-gray-800/50 border border-white/10 text-xs text-gray-300">
+              <strong className="text-white">Measured success gap (A − B):</strong>{' '}
+              {comparison.diff >= 0 ? '+' : ''}{comparison.diff.toFixed(1)} pts
+              {' '}(95% CI {comparison.low.toFixed(1)} to {comparison.high.toFixed(1)}, p = {comparison.pValue.toFixed(3)}).{' '}
+              {comparison.pValue < 0.05
+                ? <span className="text-emerald-400">Significant at the 5% level.</span>
+                : <span className="text-yellow-400">Not significant; the benchmark cannot separate these models yet.</span>}
+            </div>
+          )}
+
           {/* Recommendation */}
           <div className="mt-4 p-3 rounded-lg bg-gradient-to-r from-emerald-500/10 to-blue-500/10 border border-emerald-500/20">
             <div className="text-sm text-white">
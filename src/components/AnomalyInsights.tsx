@@ -3,6 +3,7 @@
 import { useMemo } from 'react';
 import { AlertTriangle, TrendingUp, TrendingDown, Sparkles } from 'lucide-react';
 import final25DataRaw from '@/data/final25-data.json';
+import { resolveContent } from '@/lib/content';
 
 interface ModelData {
   model: string;
@@ -28,7 +29,7 @@ interface Final25Data {
   anomalies: Anomaly[];
 }
 
-const final25Data = final25DataRaw as Final25Data;
+const final25Data = resolveContent<Final25Data>(final25DataRaw);
 
 export default function AnomalyInsights() {
   // Compute additional anomalies
@@ -9,7 +9,9 @@ import {
   PolarRadiusAxis, Radar, Legend, Cell, LineChart, Line, ReferenceLine
 } from 'recharts';
 import { Trophy, TrendingUp, Zap, BarChart3, Target, Database, ArrowLeft, Play, ChevronDown, ChevronUp, Grid3X3, Layers, DollarSign, ArrowRight, Swords, ChevronLeft, ChevronRight, Filter, X, Share2, Sparkles } from 'lucide-react';
-import benchmarkDataRaw from '@/data/benchmark-data.json';
+import benchmarkDataRaw from '@/data/benchmark-summary.json';
+import { resolveContent } from '@/lib/content';
+import { fetchTrajectories, fetchTrajectoriesFor, type TrajectoryIndex } from '@/lib/trajectories';
 import ScenarioBuilder from './ScenarioBuilder';
 import FailureInsights from './FailureInsights';
 import ModelRace from './ModelRace';
@@ -38,11 +40,9 @@ interface ModelData {
     reward: number;
     answer: string;
     info: { expected: number; level: string; task_id: string; tolerance?: number };
-    prompt: Array<{ content: string; role: string }>;
-    completion: Array<{ content: string; role: string }>;
     score_correctness: number;
     score_efficiency: number;
-    generation_ms?: number;
+    generation_ms?: number | null;
   }>;
   rank?: number;
   color?: string;
@@ -54,7 +54,7 @@ interface BenchmarkData {
   models: ModelData[];
 }
 
-const benchmarkData = benchmarkDataRaw as BenchmarkData;
+const benchmarkData = resolveContent<BenchmarkData>(benchmarkDataRaw);
 
 // Provider colors
 const providerColors: Record<string, string> = {
@@ -131,6 +131,13 @@ export default function BenchmarkCharts() {
   const [arenaTaskIndex, setArenaTaskIndex] = useState(0);
   const [arenaRollout, setArenaRollout] = useState(0);
 
+  // Transcripts of the examples on screen, fetched from the models' shards
+  const [trajectories, setTrajectories] = useState<TrajectoryIndex>({});
+  const mergeTrajectories = (loaded: TrajectoryIndex) =>
+    setTrajectories(prev => ({ ...prev, ...loaded }));
+  const promptOf = (ex: { example_id: number }) => trajectories[ex.example_id]?.prompt ?? [];
+  const completionOf = (ex: { example_id: number }) => trajectories[ex.example_id]?.completion ?? [];
+
   // Filter state
   const searchParams = useSearchParams();
   const router = useRouter();
@@ -272,7 +279,14 @@ export default function BenchmarkCharts() {
       score_code_quality: 'Code Quality',
     };
 
-    return metrics.map(metric => {
+    // Rubric scores none of the selected models logged are left off
+    const logged = metrics.filter(metric =>
+      selectedModels.some(modelId =>
+        benchmarkData.models.find(m => m.model === modelId)?.metrics[metric] !== undefined
+      )
+    );
+
+    return logged.map(metric => {
       const point: Record<string, string | number> = { metric: metricLabels[metric] || metric };
       selectedModels.forEach(modelId => {
         const model = benchmarkData.models.find(m => m.model === modelId);
@@ -328,6 +342,26 @@ export default function BenchmarkCharts() {
     };
   }, [arenaModels]);
 
+  useEffect(() => {
+    if (arenaModels.length < 2) return;
+    let cancelled = false;
+    fetchTrajectoriesFor(arenaModels).then(loaded => {
+      if (!cancelled) mergeTrajectories(loaded);
+    });
+    return () => { cancelled = true; };
+  }, [arenaModels]);
+
+  useEffect(() => {
+    if (!selectedExample) return;
+    const owner = benchmarkData.models.find(m => m.examples.includes(selectedExample));
+    if (!owner) return;
+    let cancelled = false;
+    fetchTrajectories(owner.model).then(loaded => {
+      if (!cancelled) mergeTrajectories(loaded);
+    });
+    return () => { cancelled = true; };
+  }, [selectedExample]);
+
   const toggleArenaModel = (modelId: string) => {
     setArenaModels(prev => {
       if (prev.includes(modelId)) {
@@ -730,7 +764,7 @@ export default function BenchmarkCharts() {
                           <div key={metric} className={`p-3 rounded-lg ${isDark ? 'bg-black/30' : 'bg-gray-50'}`}>
                             <div className="text-xs text-gray-500 mb-1">{metric.replace('score_', '').replace(/_/g, ' ')}</div>
                             <div className={`text-lg font-mono ${isDark ? 'text-white' : 'text-gray-900'}`}>
-                              {((model.metrics[metric] || 0) * 100).toFixed(1)}%
+                              {model.metrics[metric] !== undefined ? `${(model.metrics[metric] * 100).toFixed(1)}%` : '—'}
                             </div>
                           </div>
                         ))}
@@ -900,8 +934,9 @@ export default function BenchmarkCharts() {
                 {(() => {
                   const taskExamples = arenaData.modelData[0]?.examples.filter(e => e.info?.task_id === arenaData.tasks[arenaTaskIndex]);
                   const example = taskExamples?.[arenaRollout] || taskExamples?.[0];
-                  const systemPrompt = example?.prompt.find(p => p.role === 'system')?.content;
-                  const userPrompt = example?.prompt.find(p => p.role === 'user')?.content;
+                  const prompt = example ? promptOf(example) : [];
+                  const systemPrompt = prompt.find(p => p.role === 'system')?.content;
+                  const userPrompt = prompt.find(p => p.role === 'user')?.content;
                   return (
                     <div className="bg-black/20 rounded-xl border border-white/10 overflow-hidden">
                       {/* Task Navigation Header */}
@@ -1011,7 +1046,7 @@ export default function BenchmarkCharts() {
                           </div>
                           <div className="bg-black/30 rounded p-2">
                             <div className="text-gray-500 text-xs">Time</div>
-                            <div className="text-white font-mono">{((example.generation_ms || 0) / 1000).toFixed(1)}s</div>
+                            <div className="text-white font-mono">{example.generation_ms != null ? `${(example.generation_ms / 1000).toFixed(1)}s` : '—'}</div>
                           </div>
                           <div className="bg-black/30 rounded p-2">
                             <div className="text-gray-500 text-xs">Answer</div>
@@ -1021,8 +1056,8 @@ export default function BenchmarkCharts() {
 
                         {/* Full Trace */}
                         <div className="p-4 max-h-96 overflow-y-auto">
-                          <div className="text-xs text-gray-500 mb-2">Full Trace ({example.completion.length} turns):</div>
-                          {example.completion.map((msg, idx) => (
+                          <div className="text-xs text-gray-500 mb-2">Full Trace ({completionOf(example).length} turns):</div>
+                          {completionOf(example).map((msg, idx) => (
                             <div key={idx} className={`text-xs p-2 rounded mb-2 ${
                               msg.role === 'assistant' ? 'bg-emerald-500/10 border-l-2 border-emerald-500' : 'bg-blue-500/10 border-l-2 border-blue-500'
                             }`}>
@@ -1262,7 +1297,7 @@ export default function BenchmarkCharts() {
                     </div>
                   </div>
 
-                  {selectedExample.prompt.map((msg, i) => (
+                  {promptOf(selectedExample).map((msg, i) => (
                     <div key={i} className={`p-4 rounded-lg ${
                       msg.role === 'system' ? 'bg-blue-500/10 border border-blue-500/20' :
                       msg.role === 'user' ? 'bg-purple-500/10 border border-purple-500/20' :
@@ -1275,7 +1310,7 @@ export default function BenchmarkCharts() {
                     </div>
                   ))}
 
-                  {selectedExample.completion.map((msg, i) => (
+                  {completionOf(selectedExample).map((msg, i) => (
                     <div key={i} className={`p-4 rounded-lg ${
                       msg.role === 'assistant' ? 'bg-emerald-500/10 border border-emerald-500/20' : 'bg-gray-500/10 border border-gray-500/20'
                     }`}>
@@ -1295,7 +1330,7 @@ export default function BenchmarkCharts() {
                     </div>
                     <div className="p-3 rounded-lg bg-black/30">
                       <div className="text-xs text-gray-500">Time</div>
-                      <div className="text-lg font-mono text-purple-400">{((selectedExample.generation_ms || 0) / 1000).toFixed(1)}s</div>
+                      <div className="text-lg font-mono text-purple-400">{selectedExample.generation_ms != null ? `${(selectedExample.generation_ms / 1000).toFixed(1)}s` : '—'}</div>
                     </div>
                   </div>
                 </div>
@@ -2,31 +2,38 @@
 
 import { useMemo, useState } from 'react';
 import { AlertTriangle, Target, TrendingDown, ChevronDown, ChevronUp, BarChart3 } from 'lucide-react';
-import benchmarkDataRaw from '@/data/benchmark-data.json';
-
-interface Example {
-  example_id: number;
-  task: string;
-  reward: number;
-  answer: string;
-  info: { expected: number; level: string; task_id: string } | null;
-  score_correctness: number;
-  score_efficiency: number;
-  generation_ms: number;
+import benchmarkDataRaw from '@/data/benchmark-summary.json';
+import { resolveContent } from '@/lib/content';
+
+interface TaskStats {
+  success: number;
+  fail: number;
+  total: number;
+  level: string;
+  models: { name: string; provider: string; succeeded: boolean }[];
 }
 
-interface ModelData {
-  model: string;
-  provider: string;
+interface ModelStats {
   name: string;
-  examples: Example[];
+  provider: string;
+  levels: Record<string, { success: number; total: number }>;
+  weakestLevel: string;
+  weakestRate: number;
 }
 
 interface BenchmarkData {
-  models: ModelData[];
+  aggregates: {
+    taskStats: Record<string, TaskStats>;
+    levelStats: Record<string, { success: number; total: number }>;
+    modelStats: Record<string, ModelStats>;
+  };
 }
 
-const benchmarkData = benchmarkDataRaw as BenchmarkData;
+const benchmarkData = resolveContent<BenchmarkData>(benchmarkDataRaw);
+
+// Task, level and per-model success tables are precomputed by
+// scripts/transform_to_benchmark_format.py
+const { taskStats: taskAnalysis, levelStats, modelStats } = benchmarkData.aggregates;
 
 const providerColors: Record<string, string> = {
   'qwen': '#10B981',
@@ -49,49 +56,6 @@ const levelColors: Record<string, string> = {
 export default function FailureInsights() {
   const [expandedSection, setExpandedSection] = useState<string | null>(null); // collapsed by default
 
-  // Analyze task difficulty
-  const taskAnalysis = useMemo(() => {
-    const taskStats: Record<string, {
-      success: number;
-      fail: number;
-      total: number;
-      level: string;
-      models: { name: string; provider: string; succeeded: boolean }[];
-    }> = {};
-
-    benchmarkData.models.forEach(model => {
-      model.examples.forEach(ex => {
-        if (!ex.info) return;
-        const taskId = ex.info.task_id;
-
-        if (!taskStats[taskId]) {
-          taskStats[taskId] = {
-            success: 0,
-            fail: 0,
-            total: 0,
-            level: ex.info.level,
-            models: []
-          };
-        }
-
-        const succeeded = ex.score_correctness > 0.5;
-        taskStats[taskId].total++;
-        if (succeeded) {
-          taskStats[taskId].success++;
-        } else {
-          taskStats[taskId].fail++;
-        }
-        taskStats[taskId].models.push({
-          name: model.name,
-          provider: model.provider,
-          succeeded
-        });
-      });
-    });
-
-    return taskStats;
-  }, []);
-
   // Hardest tasks (lowest success rate)
   const hardestTasks = useMemo(() => {
     return Object.entries(taskAnalysis)
@@ -103,77 +67,24 @@ export default function FailureInsights() {
       .filter(t => t.total >= 2) // At least 2 attempts
       .sort((a, b) => a.successRate - b.successRate)
       .slice(0, 10);
-  }, [taskAnalysis]);
+  }, []);
 
   // Model weaknesses by task level
   const modelWeaknesses = useMemo(() => {
-    const weaknesses: Record<string, {
-      model: string;
-      provider: string;
-      levels: Record<string, { success: number; total: number }>;
-      weakestLevel: string;
-      weakestRate: number;
-    }> = {};
-
-    benchmarkData.models.forEach(model => {
-      weaknesses[model.model] = {
-        model: model.name,
-        provider: model.provider,
-        levels: {},
-        weakestLevel: '',
-        weakestRate: 100
-      };
-
-      model.examples.forEach(ex => {
-        if (!ex.info) return;
-        const level = ex.info.level;
-
-        if (!weaknesses[model.model].levels[level]) {
-          weaknesses[model.model].levels[level] = { success: 0, total: 0 };
-        }
-
-        weaknesses[model.model].levels[level].total++;
-        if (ex.score_correctness > 0.5) {
-          weaknesses[model.model].levels[level].success++;
-        }
-      });
-
-      // Find weakest level
-      Object.entries(weaknesses[model.model].levels).forEach(([level, stats]) => {
-        if (stats.total >= 2) {
-          const rate = (stats.success / stats.total) * 100;
-          if (rate < weaknesses[model.model].weakestRate) {
-            weaknesses[model.model].weakestRate = rate;
-            weaknesses[model.model].weakestLevel = level;
-          }
-        }
-      });
-    });
-
-    return Object.values(weaknesses).filter(w => w.weakestLevel !== '');
+    return Object.values(modelStats)
+      .filter(w => w.weakestLevel !== '')
+      .map(w => ({
+        model: w.name,
+        provider: w.provider,
+        levels: w.levels,
+        weakestLevel: w.weakestLevel,
+        weakestRate: w.weakestRate
+      }));
   }, []);
 
   // Task level breakdown
   const levelBreakdown = useMemo(() => {
-    const levels: Record<string, { success: number; total: number }> = {};
-
-    benchmarkData.models.forEach(model => {
-      model.examples.forEach(ex => {
-        if (!ex.info) return;
-        const level = ex.info.level;
-
-        if (!levels[level]) {
-          levels[level] = { success: 0, total: 0 };
-        }
-
-        levels[level].total++;
-        if (ex.score_correctness > 0.5) {
-          levels[level].success++;
-        }
-      });
-    });
-
-    return Object.entries(levels)
+    return Object.entries(levelStats)
       .map(([level, stats]) => ({
         level,
         ...stats,
@@ -3,6 +3,7 @@
 import { useState, useMemo } from 'react';
 import { Trophy, Database, AlertTriangle, CheckCircle, XCircle, ChevronDown, ChevronUp } from 'lucide-react';
 import final25DataRaw from '@/data/final25-data.json';
+import { resolveContent } from '@/lib/content';
 
 interface ModelData {
   model: string;
@@ -25,6 +26,8 @@ interface ModelData {
     reward: number;
     answer: unknown;
     expected: unknown;
+    // Identical rollouts of the model, stored once
+    count: number;
   }>;
 }
 
@@ -63,7 +66,7 @@ interface Final25Data {
   }>;
 }
 
-const final25Data = final25DataRaw as Final25Data;
+const final25Data = resolveContent<Final25Data>(final25DataRaw);
 
 type SortKey = 'combined' | 'bank' | 'road' | 'avgReward';
 
@@ -314,7 +317,10 @@ function ModelCard({
                           : 'border-red-500/30 bg-red-500/10'
                     }`}
                   >
-                    <div className="text-white font-mono">{rollout.task_id}</div>
+                    <div className="text-white font-mono">
+                      {rollout.task_id}
+                      {rollout.count > 1 && <span className="text-gray-500"> ×{rollout.count}</span>}
+                    </div>
                     <div className="text-gray-500">{rollout.dataset}</div>
                     <div className={
                       rollout.score_correctness >= 0.8
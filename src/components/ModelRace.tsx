@@ -2,7 +2,9 @@
 
 import { useState, useMemo, useEffect, useRef } from 'react';
 import { Play, Pause, RotateCcw, Trophy, Clock, Check, X, Zap } from 'lucide-react';
-import benchmarkDataRaw from '@/data/benchmark-data.json';
+import benchmarkDataRaw from '@/data/benchmark-summary.json';
+import { resolveContent } from '@/lib/content';
+import { fetchTrajectoriesFor, type Message } from '@/lib/trajectories';
 
 interface Example {
   example_id: number;
@@ -10,11 +12,10 @@ interface Example {
   reward: number;
   answer: string;
   info: { expected: number; level: string; task_id: string } | null;
-  prompt: Array<{ content: string; role: string }>;
-  completion: Array<{ content: string; role: string }>;
   score_correctness: number;
   score_efficiency: number;
-  generation_ms: number;
+  // Only set when the rollout log recorded timing
+  generation_ms: number | null;
 }
 
 interface ModelData {
@@ -28,7 +29,7 @@ interface BenchmarkData {
   models: ModelData[];
 }
 
-const benchmarkData = benchmarkDataRaw as BenchmarkData;
+const benchmarkData = resolveContent<BenchmarkData>(benchmarkDataRaw);
 
 const providerColors: Record<string, string> = {
   'qwen': '#10B981',
@@ -39,9 +40,12 @@ const providerColors: Record<string, string> = {
   'ensemble': '#14B8A6',
 };
 
+// A racing example with its completion, fetched from the model's shard
+type RaceExample = Example & { completion: Message[] };
+
 interface RacerState {
   model: ModelData;
-  example: Example;
+  example: RaceExample;
   progress: number;
   finished: boolean;
   finishTime: number;
@@ -60,6 +64,7 @@ export default function ModelRace() {
   const [racers, setRacers] = useState<RacerState[]>([]);
   const [raceFinished, setRaceFinished] = useState(false);
   const [speed, setSpeed] = useState(1);
+  const [loading, setLoading] = useState(false);
 
   const intervalRef = useRef<NodeJS.Timeout | null>(null);
   const animationRef = useRef<number | null>(null);
@@ -114,28 +119,37 @@ export default function ModelRace() {
     if (animationRef.current) cancelAnimationFrame(animationRef.current);
   };
 
-  // Start the race
-  const startRace = () => {
+  // Start the race once the racing models' transcripts are loaded
+  const startRace = async () => {
     if (!selectedTask || selectedModels.length < 2) return;
 
     const models = selectedModels
       .map(id => benchmarkData.models.find(m => m.model === id))
       .filter(Boolean) as ModelData[];
 
-    const initialRacers: RacerState[] = models.map(model => {
-      // Get all examples for this task, pick the selected rollout
-      const taskExamples = model.examples.filter(e => e.info?.task_id === selectedTask);
+    setLoading(true);
+    const trajectories = await fetchTrajectoriesFor(models.map(m => m.model));
+    setLoading(false);
+
+    const initialRacers: RacerState[] = models.flatMap(model => {
+      // Get the timed examples for this task, pick the selected rollout;
+      // rollouts without a logged (positive) timing can't race
+      const taskExamples = model.examples.filter(
+        e => e.info?.task_id === selectedTask && (e.generation_ms ?? 0) > 0
+      );
       const example = taskExamples[selectedRollout] || taskExamples[0];
-      return {
+      if (!example) return [];
+      const completion = trajectories[example.example_id]?.completion ?? [];
+      return [{
         model,
-        example,
+        example: { ...example, completion },
         progress: 0,
         finished: false,
         finishTime: 0,
         rank: 0,
         displayedText: '',
         currentTurn: 0
-      };
+      }];
     });
 
     setRacers(initialRacers);
@@ -149,7 +163,7 @@ export default function ModelRace() {
   useEffect(() => {
     if (!isRacing || isPaused || raceFinished) return;
 
-    const maxTime = Math.max(...racers.map(r => r.example.generation_ms));
+    const maxTime = Math.max(...racers.map(r => r.example.generation_ms ?? 0));
     const tickInterval = 50; // 50ms ticks
     const timePerTick = tickInterval * speed; // Real time per tick
 
@@ -167,7 +181,8 @@ export default function ModelRace() {
               return racer;
             }
 
-            const targetTime = racer.example.generation_ms;
+            // Untimed rollouts are left out at the start; never divide by zero
+            const targetTime = Math.max(racer.example.generation_ms ?? 0, tickInterval);
             const progress = Math.min(100, (newTime / targetTime) * 100);
 
             // Calculate which turn to show
@@ -309,10 +324,13 @@ export default function ModelRace() {
               {!isRacing ? (
                 <button
                   onClick={startRace}
-                  className="flex items-center gap-2 px-6 py-2 bg-emerald-600 hover:bg-emerald-500 text-white rounded-lg font-medium transition-colors"
+                  disabled={loading}
+                  className={`flex items-center gap-2 px-6 py-2 bg-emerald-600 hover:bg-emerald-500 text-white rounded-lg font-medium transition-colors ${
+                    loading ? 'opacity-50 cursor-wait' : ''
+                  }`}
                 >
                   <Play className="w-4 h-4" />
-                  Start Race
+                  {loading ? 'Loading...' : 'Start Race'}
                 </button>
               ) : (
                 <>
@@ -0,0 +1,92 @@
+'use client';
+
+import { useEffect, useState } from 'react';
+import { ArrowDown, ArrowUp, Minus } from 'lucide-react';
+
+// Written by scripts/transform_final25.py from the recorded run snapshots
+// (build with --snapshot); absent until at least one run is recorded.
+interface TrendData {
+  suite: string;
+  runs: Array<{ run: string; created: string }>;
+  models: Record<string, { rank: Array<number | null>; total_pct: Array<number | null> }>;
+}
+
+function formatRun(created: string) {
+  return new Date(created).toLocaleDateString(undefined, { month: 'short', day: 'numeric' });
+}
+
+export default function RankTrend() {
+  const [trend, setTrend] = useState<TrendData | null>(null);
+
+  useEffect(() => {
+    let cancelled = false;
+    fetch('/data/final25-trend.json')
+      .then((res) => (res.ok ? res.json() : null))
+      .then((data: TrendData | null) => {
+        if (!cancelled) setTrend(data);
+      })
+      .catch(() => {});
+    return () => {
+      cancelled = true;
+    };
+  }, []);
+
+  if (!trend || trend.runs.length < 2) return null;
+
+  const last = trend.runs.length - 1;
+  const rows = Object.entries(trend.models)
+    .filter(([, m]) => m.rank[last] !== null)
+    .sort(([, a], [, b]) => (a.rank[last] as number) - (b.rank[last] as number));
+
+  return (
+    <div className="p-4 rounded-xl bg-black/30 border border-white/10">
+      <div className="text-sm text-gray-400 mb-3">
+        Rank movement over the last {trend.runs.length} runs
+      </div>
+      <div className="overflow-x-auto">
+        <table className="w-full text-xs">
+          <thead>
+            <tr className="text-gray-500">
+              <th className="text-left font-normal pb-2">Model</th>
+              {trend.runs.map((run) => (
+                <th key={run.run} className="font-normal pb-2 px-2">{formatRun(run.created)}</th>
+              ))}
+              <th className="font-normal pb-2 px-2">Change</th>
+            </tr>
+          </thead>
+          <tbody>
+            {rows.map(([model, m]) => {
+              const previous = m.rank[last - 1];
+              const change = previous !== null ? previous - (m.rank[last] as number) : null;
+              return (
+                <tr key={model} className="border-t border-white/5">
+                  <td className="py-1.5 text-white font-mono">{model.split('--').pop()}</td>
+                  {m.rank.map((rank, i) => (
+                    <td key={i} className="px-2 text-center text-gray-300" title={
+                      m.total_pct[i] !== null ? `${m.total_pct[i]}%` : undefined
+                    }>
+                      {rank ?? '—'}
+                    </td>
+                  ))}
+                  <td className="px-2">
+                    <div className="flex items-center justify-center">
+                      {change === null ? (
+                        <span className="text-purple-400">new</span>
+                      ) : change > 0 ? (
+                        <span className="flex items-center text-emerald-400"><ArrowUp className="w-3 h-3" />{change}</span>
+                      ) : change < 0 ? (
+                        <span className="flex items-center text-red-400"><ArrowDown className="w-3 h-3" />{-change}</span>
+                      ) : (
+                        <Minus className="w-3 h-3 text-gray-500" />
+                      )}
+                    </div>
+                  </td>
+                </tr>
+              );
+            })}
+          </tbody>
+        </table>
+      </div>
+    </div>
+  );
+}
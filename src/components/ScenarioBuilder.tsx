@@ -3,7 +3,8 @@
 import { useState, useMemo } from 'react';
 import { useRouter } from 'next/navigation';
 import { X, ChevronRight, ChevronLeft, Sparkles, DollarSign, Target, Zap, Database, Check } from 'lucide-react';
-import benchmarkDataRaw from '@/data/benchmark-data.json';
+import benchmarkDataRaw from '@/data/benchmark-summary.json';
+import { resolveContent } from '@/lib/content';
 
 interface ModelData {
   model: string;
@@ -16,7 +17,7 @@ interface ModelData {
   metrics: Record<string, number>;
 }
 
-const benchmarkData = benchmarkDataRaw as { models: ModelData[] };
+const benchmarkData = resolveContent<{ models: ModelData[] }>(benchmarkDataRaw);
 
 // Simulated cost tiers
 const modelCostTier: Record<string, 'low' | 'mid' | 'high'> = {
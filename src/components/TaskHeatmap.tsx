@@ -3,6 +3,7 @@
 import { useState, useMemo } from 'react';
 import { Grid3X3, Filter } from 'lucide-react';
 import final25DataRaw from '@/data/final25-data.json';
+import { resolveContent } from '@/lib/content';
 
 interface ModelData {
   model: string;
@@ -16,6 +17,7 @@ interface ModelData {
     dataset: string;
     score_correctness: number;
     reward: number;
+    count?: number;
   }>;
 }
 
@@ -27,12 +29,63 @@ interface TaskData {
   goal: string;
 }
 
+interface CellCounts {
+  correct: number;
+  partial: number;
+  wrong: number;
+  total: number;
+}
+
 interface Final25Data {
   models: ModelData[];
   tasks: TaskData[];
+  aggregates?: {
+    heatmap: Record<string, Record<string, CellCounts>>;
+    taskDifficulty: Record<string, number>;
+  };
+}
+
+const final25Data = resolveContent<Final25Data>(final25DataRaw);
+
+// Data written before the transform emitted aggregates: count the rollouts
+// each model entry shows (capped per model) instead of every sampled one
+function aggregatesFromShownRollouts(data: Final25Data): NonNullable<Final25Data['aggregates']> {
+  const heatmap: Record<string, Record<string, CellCounts>> = {};
+  const taskDifficulty: Record<string, number> = {};
+  for (const task of data.tasks) {
+    const cells: Record<string, CellCounts> = {};
+    let correctTotal = 0;
+    let attempts = 0;
+    for (const model of data.models) {
+      const cell = { correct: 0, partial: 0, wrong: 0, total: 0 };
+      for (const r of model.rollouts) {
+        if (r.task_id !== task.id) continue;
+        const n = r.count ?? 1;
+        if (r.score_correctness >= 0.8) cell.correct += n;
+        else if (r.score_correctness >= 0.2) cell.partial += n;
+        else cell.wrong += n;
+        cell.total += n;
+      }
+      if (!cell.total) continue;
+      cells[model.model] = cell;
+      if (model.complete) {
+        correctTotal += cell.correct;
+        attempts += cell.total;
+      }
+    }
+    heatmap[task.id] = cells;
+    taskDifficulty[task.id] = attempts ? (100 * correctTotal) / attempts : 0;
+  }
+  return { heatmap, taskDifficulty };
 }
 
-const final25Data = final25DataRaw as Final25Data;
+// Per-task-per-model performance and task difficulty (% of models that got
+// it right) over every sampled rollout, precomputed by
+// scripts/transform_final25.py
+const fromShownRollouts = !final25Data.aggregates;
+const { heatmap: heatmapData, taskDifficulty } =
+  final25Data.aggregates ?? aggregatesFromShownRollouts(final25Data);
+const EMPTY_CELL: CellCounts = { correct: 0, partial: 0, wrong: 0, total: 0 };
 
 type FilterLevel = 'all' | 'L4' | 'L5' | 'L6';
 type FilterDataset = 'all' | 'bank' | 'road';
@@ -56,46 +109,10 @@ export default function TaskHeatmap() {
     return final25Data.models.filter(m => m.complete);
   }, []);
 
-  // Compute per-task-per-model performance
-  const heatmapData = useMemo(() => {
-    const data: Record<string, Record<string, { correct: number; partial: number; wrong: number; total: number }>> = {};
-
-    for (const task of filteredTasks) {
-      data[task.id] = {};
-      for (const model of completeModels) {
-        const rollouts = model.rollouts.filter(r => r.task_id === task.id);
-        const correct = rollouts.filter(r => r.score_correctness >= 0.8).length;
-        const partial = rollouts.filter(r => r.score_correctness >= 0.2 && r.score_correctness < 0.8).length;
-        const wrong = rollouts.filter(r => r.score_correctness < 0.2).length;
-        data[task.id][model.model] = { correct, partial, wrong, total: rollouts.length };
-      }
-    }
-
-    return data;
-  }, [filteredTasks, completeModels]);
-
-  // Compute task difficulty (% of models that got it right)
-  const taskDifficulty = useMemo(() => {
-    const difficulty: Record<string, number> = {};
-    for (const task of filteredTasks) {
-      let totalCorrect = 0;
-      let totalAttempts = 0;
-      for (const model of completeModels) {
-        const perf = heatmapData[task.id]?.[model.model];
-        if (perf) {
-          totalCorrect += perf.correct;
-          totalAttempts += perf.total;
-        }
-      }
-      difficulty[task.id] = totalAttempts > 0 ? (totalCorrect / totalAttempts) * 100 : 0;
-    }
-    return difficulty;
-  }, [filteredTasks, completeModels, heatmapData]);
-
   // Sort tasks by difficulty (hardest first)
   const sortedTasks = useMemo(() => {
     return [...filteredTasks].sort((a, b) => taskDifficulty[a.id] - taskDifficulty[b.id]);
-  }, [filteredTasks, taskDifficulty]);
+  }, [filteredTasks]);
 
   const getCellColor = (perf: { correct: number; partial: number; total: number } | undefined) => {
     if (!perf || perf.total === 0) return 'bg-gray-800';
@@ -168,6 +185,9 @@ export default function TaskHeatmap() {
           <div className="w-4 h-4 rounded bg-red-500/40" />
           <span>0%</span>
         </div>
+        {fromShownRollouts && (
+          <span className="ml-auto text-gray-500">Counts from the shown rollouts of each model</span>
+        )}
       </div>
 
       {/* Heatmap Grid */}
@@ -213,7 +233,7 @@ export default function TaskHeatmap() {
                 </div>
               </div>
               {completeModels.map(model => {
-                const perf = heatmapData[task.id]?.[model.model];
+                const perf = heatmapData[task.id]?.[model.model] ?? EMPTY_CELL;
                 return (
                   <div
                     key={model.model}
@@ -4,6 +4,7 @@ import { useMemo } from 'react';
 import { BarChart, Bar, XAxis, YAxis, CartesianGrid, Tooltip, ResponsiveContainer, Cell } from 'recharts';
 import { Layers } from 'lucide-react';
 import final25DataRaw from '@/data/final25-data.json';
+import { resolveContent } from '@/lib/content';
 
 interface TemplateStats {
   template: string;
@@ -26,7 +27,7 @@ interface Final25Data {
   tasks: TaskData[];
 }
 
-const final25Data = final25DataRaw as Final25Data;
+const final25Data = resolveContent<Final25Data>(final25DataRaw);
 
 // Template descriptions
 const templateDescriptions: Record<string, string> = {
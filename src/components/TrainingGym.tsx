@@ -13,7 +13,9 @@ import {
     Play,
     Zap
 } from 'lucide-react';
-import benchmarkDataRaw from '@/data/benchmark-data.json';
+import benchmarkDataRaw from '@/data/benchmark-summary.json';
+import { resolveContent } from '@/lib/content';
+import { fetchTrajectoriesFor, type TrajectoryIndex } from '@/lib/trajectories';
 import ThemeToggle from '@/components/ThemeToggle';
 
 // --- Types ---
@@ -25,7 +27,7 @@ interface Example {
     info: { expected: number; level: string; task_id: string } | null;
     score_correctness: number;
     score_efficiency: number;
-    generation_ms: number;
+    generation_ms: number | null;
     prompt: Array<{ role: string; content: string }>;
     completion: Array<{ role: string; content: string }>;
 }
@@ -37,11 +39,30 @@ interface ModelData {
     examples: Example[];
 }
 
+// The summary carries no transcripts; the games get them from the models'
+// trajectory shards once one is opened
+type SummaryModel = Omit<ModelData, 'examples'> & {
+    examples: Omit<Example, 'prompt' | 'completion'>[];
+};
+
 interface BenchmarkData {
-    models: ModelData[];
+    models: SummaryModel[];
+}
+
+const benchmarkData = resolveContent<BenchmarkData>(benchmarkDataRaw);
+
+function withTranscripts(models: SummaryModel[], trajectories: TrajectoryIndex): ModelData[] {
+    return models.map(m => ({
+        ...m,
+        examples: m.examples.map(ex => ({
+            ...ex,
+            prompt: trajectories[ex.example_id]?.prompt ?? [],
+            completion: trajectories[ex.example_id]?.completion ?? [],
+        })),
+    }));
 }
 
-const benchmarkData = benchmarkDataRaw as BenchmarkData;
+type GameProps = { models: ModelData[]; onComplete: (score: number) => void };
 
 const providerColors: Record<string, string> = {
     'qwen': '#10B981',
@@ -54,7 +75,7 @@ const providerColors: Record<string, string> = {
 
 // --- Sub-Components ---
 
-function HumanVsMachine({ onComplete }: { onComplete: (score: number) => void }) {
+function HumanVsMachine({ models, onComplete }: GameProps) {
     const [round, setRound] = useState(1);
     const [score, setScore] = useState(0);
     const [task, setTask] = useState<any>(null);
@@ -66,7 +87,7 @@ function HumanVsMachine({ onComplete }: { onComplete: (score: number) => void })
     // Pre-calculate task map (Same as before)
     const taskMap = useMemo(() => {
         const map = new Map<string, { model: ModelData, example: Example }[]>();
-        benchmarkData.models.forEach(m => {
+        models.forEach(m => {
             m.examples.forEach(ex => {
                 if (!ex.info?.task_id) return;
                 const taskId = ex.info.task_id;
@@ -76,11 +97,11 @@ function HumanVsMachine({ onComplete }: { onComplete: (score: number) => void })
         });
         const validTaskIds: string[] = [];
         map.forEach((list, id) => {
-            const models = new Set(list.map(i => i.model.model));
-            if (models.size >= 2) validTaskIds.push(id);
+            const modelIds = new Set(list.map(i => i.model.model));
+            if (modelIds.size >= 2) validTaskIds.push(id);
         });
         return { map, validTaskIds };
-    }, []);
+    }, [models]);
 
     const prepareRound = () => {
         if (taskMap.validTaskIds.length === 0) return;
@@ -112,10 +133,10 @@ function HumanVsMachine({ onComplete }: { onComplete: (score: number) => void })
         let winner: 'A' | 'B' | 'Tie' = 'Tie';
         if (exA.score_correctness > exB.score_correctness) winner = 'A';
         else if (exB.score_correctness > exA.score_correctness) winner = 'B';
-        else {
+        else if (exA.generation_ms !== null && exB.generation_ms !== null) {
             if (exA.generation_ms < exB.generation_ms) winner = 'A';
             else if (exB.generation_ms < exA.generation_ms) winner = 'B';
-            // If times are equal, winner stays 'Tie'
+            // If times are equal or unlogged, winner stays 'Tie'
         }
         if (vote === winner || winner === 'Tie') setScore(s => s + 10);
     };
@@ -181,7 +202,7 @@ function HumanVsMachine({ onComplete }: { onComplete: (score: number) => void })
     );
 }
 
-function DebugChallenge({ onComplete }: { onComplete: (score: number) => void }) {
+function DebugChallenge({ models, onComplete }: GameProps) {
     const [round, setRound] = useState(1);
     const [score, setScore] = useState(0);
     const [task, setTask] = useState<any>(null);
@@ -189,7 +210,6 @@ function DebugChallenge({ onComplete }: { onComplete: (score: number) => void })
     const [userGuess, setUserGuess] = useState<'pass' | 'fail' | null>(null);
 
     const prepareRound = () => {
-        const models = benchmarkData.models;
         const m = models[Math.floor(Math.random() * models.length)];
         if (!m.examples.length) return prepareRound(); // retry
         const ex = m.examples[Math.floor(Math.random() * m.examples.length)];
@@ -292,7 +312,7 @@ function DebugChallenge({ onComplete }: { onComplete: (score: number) => void })
     );
 }
 
-function SpeedRun({ onComplete }: { onComplete: (score: number) => void }) {
+function SpeedRun({ models, onComplete }: GameProps) {
     const [timeLeft, setTimeLeft] = useState(30);
     const [score, setScore] = useState(0);
     const [streak, setStreak] = useState(0);
@@ -301,7 +321,6 @@ function SpeedRun({ onComplete }: { onComplete: (score: number) => void }) {
     const [feedback, setFeedback] = useState<'correct' | 'wrong' | null>(null);
 
     const nextTask = () => {
-        const models = benchmarkData.models;
         const m = models[Math.floor(Math.random() * models.length)];
         if (!m.examples.length) return nextTask();
         const ex = m.examples[Math.floor(Math.random() * m.examples.length)];
@@ -402,7 +421,7 @@ function SpeedRun({ onComplete }: { onComplete: (score: number) => void }) {
     );
 }
 
-function PromptDetective({ onComplete }: { onComplete: (score: number) => void }) {
+function PromptDetective({ models, onComplete }: GameProps) {
     const [round, setRound] = useState(1);
     const [score, setScore] = useState(0);
     const [task, setTask] = useState<any>(null);
@@ -411,7 +430,6 @@ function PromptDetective({ onComplete }: { onComplete: (score: number) => void }
     const [userChoice, setUserChoice] = useState<string | null>(null);
 
     const prepareRound = () => {
-        const models = benchmarkData.models;
         const m = models[Math.floor(Math.random() * models.length)];
         if (!m.examples.length) return prepareRound();
         const ex = m.examples[Math.floor(Math.random() * m.examples.length)];
@@ -519,7 +537,7 @@ function PromptDetective({ onComplete }: { onComplete: (score: number) => void }
     );
 }
 
-function PredictMode({ onComplete }: { onComplete: (score: number) => void }) {
+function PredictMode({ models, onComplete }: GameProps) {
     const [round, setRound] = useState(1);
     const [score, setScore] = useState(0);
     const [task, setTask] = useState<any>(null);
@@ -530,7 +548,6 @@ function PredictMode({ onComplete }: { onComplete: (score: number) => void }) {
     const [correctAnswer, setCorrectAnswer] = useState('');
 
     const prepareRound = () => {
-        const models = benchmarkData.models;
         let retries = 0;
 
         while (retries < 50) {
@@ -669,6 +686,19 @@ function PredictMode({ onComplete }: { onComplete: (score: number) => void }) {
 export default function TrainingGym() {
     const [mode, setMode] = useState<'menu' | 'human_vs_machine' | 'speed_run' | 'prompt_detective'>('menu');
     const [highScore, setHighScore] = useState(0);
+    const [models, setModels] = useState<ModelData[] | null>(null);
+
+    // Load every model's transcripts the first time a game is opened
+    useEffect(() => {
+        if (mode === 'menu' || models) return;
+        let cancelled = false;
+        fetchTrajectoriesFor(benchmarkData.models.map(m => m.model)).then(trajectories => {
+            if (!cancelled) setModels(withTranscripts(benchmarkData.models, trajectories));
+        });
+        return () => { cancelled = true; };
+    }, [mode, models]);
+
+    const loadingGame = <div className="p-10 text-center text-gray-400">Loading transcripts...</div>;
 
     const handleComplete = (score: number) => {
         setHighScore(Math.max(highScore, score));
@@ -764,7 +794,7 @@ export default function TrainingGym() {
                         <button onClick={() => setMode('menu')} className="mb-4 text-gray-400 hover:text-white flex items-center gap-1">
                             <ArrowRight className="w-4 h-4 rotate-180" /> Back to Menu
                         </button>
-                        <HumanVsMachine onComplete={handleComplete} />
+                        {models ? <HumanVsMachine models={models} onComplete={handleComplete} /> : loadingGame}
                     </div>
                 )}
 
@@ -773,7 +803,7 @@ export default function TrainingGym() {
                         <button onClick={() => setMode('menu')} className="mb-4 text-gray-400 hover:text-white flex items-center gap-1">
                             <ArrowRight className="w-4 h-4 rotate-180" /> Back to Menu
                         </button>
-                        <SpeedRun onComplete={handleComplete} />
+                        {models ? <SpeedRun models={models} onComplete={handleComplete} /> : loadingGame}
                     </div>
                 )}
 
@@ -782,7 +812,7 @@ export default function TrainingGym() {
                         <button onClick={() => setMode('menu')} className="mb-4 text-gray-400 hover:text-white flex items-center gap-1">
                             <ArrowRight className="w-4 h-4 rotate-180" /> Back to Menu
                         </button>
-                        <PromptDetective onComplete={handleComplete} />
+                        {models ? <PromptDetective models={models} onComplete={handleComplete} /> : loadingGame}
                     </div>
                 )}
 
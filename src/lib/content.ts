@@ -0,0 +1,49 @@
+// Resolver for payloads written with a content table by
+// scripts/codeblue_data/encoding.py. Bodies that repeat (transcript
+// messages, identical rollouts) are stored once in `content`, keyed by a
+// hash of their JSON, and referenced as { "$c": key }. A reference may
+// carry extra fields, such as a rollout's multiplicity `count`, which are
+// merged into the resolved body.
+
+type ContentTable = Record<string, unknown>;
+
+interface ContentPayload {
+  content: ContentTable;
+}
+
+function hasContent(payload: unknown): payload is ContentPayload {
+  return (
+    typeof payload === 'object' &&
+    payload !== null &&
+    typeof (payload as { content?: unknown }).content === 'object' &&
+    (payload as { content?: unknown }).content !== null
+  );
+}
+
+function resolve(value: unknown, content: ContentTable): unknown {
+  if (Array.isArray(value)) {
+    return value.map((v) => resolve(v, content));
+  }
+  if (typeof value === 'object' && value !== null) {
+    const obj = value as Record<string, unknown>;
+    if (typeof obj.$c === 'string') {
+      const { $c: key, ...extra } = obj;
+      const body = content[key as string];
+      // Bodies are shared, not copied, unless the reference adds fields
+      return Object.keys(extra).length ? { ...(body as object), ...extra } : body;
+    }
+    const out: Record<string, unknown> = {};
+    for (const [key, v] of Object.entries(obj)) {
+      out[key] = resolve(v, content);
+    }
+    return out;
+  }
+  return value;
+}
+
+// Returns the payload unchanged when it was written without a content table
+export function resolveContent<T>(payload: unknown): T {
+  if (!hasContent(payload)) return payload as T;
+  const { content, ...data } = payload as ContentPayload & Record<string, unknown>;
+  return resolve(data, content) as T;
+}
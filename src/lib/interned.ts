@@ -0,0 +1,41 @@
+// Decoder for payloads written with interned strings by
+// scripts/codeblue_data/encoding.py (compact mode). Repeated strings are
+// stored once in `strings` and referenced as { "$s": index }.
+
+interface InternedPayload {
+  encoding: 'interned-v1';
+  strings: string[];
+  data: unknown;
+}
+
+function isInterned(payload: unknown): payload is InternedPayload {
+  return (
+    typeof payload === 'object' &&
+    payload !== null &&
+    (payload as { encoding?: unknown }).encoding === 'interned-v1'
+  );
+}
+
+function resolve(value: unknown, strings: string[]): unknown {
+  if (Array.isArray(value)) {
+    return value.map((v) => resolve(v, strings));
+  }
+  if (typeof value === 'object' && value !== null) {
+    const obj = value as Record<string, unknown>;
+    if (typeof obj.$s === 'number' && Object.keys(obj).length === 1) {
+      return strings[obj.$s];
+    }
+    const out: Record<string, unknown> = {};
+    for (const [key, v] of Object.entries(obj)) {
+      out[key] = resolve(v, strings);
+    }
+    return out;
+  }
+  return value;
+}
+
+// Returns the payload unchanged when it was written without interning
+export function decodeInterned<T>(payload: unknown): T {
+  if (!isInterned(payload)) return payload as T;
+  return resolve(payload.data, payload.strings) as T;
+}
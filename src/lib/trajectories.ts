@@ -0,0 +1,64 @@
+// Loader for the per-model transcript shards written by
+// scripts/transform_to_benchmark_format.py to public/data/trajectories.
+// benchmark-summary.json carries every example without its prompt and
+// completion; components that replay transcripts fetch the shards of the
+// models they show, keyed by example_id. Each shard is fetched once.
+
+import { resolveContent } from './content';
+import { decodeInterned } from './interned';
+
+export interface Message {
+  content: string;
+  role: string;
+}
+
+export interface Trajectory {
+  example_id: number;
+  prompt: Message[];
+  completion: Message[];
+}
+
+interface TrajectoryShard {
+  model: string;
+  examples: Trajectory[];
+}
+
+export type TrajectoryIndex = Record<number, Trajectory>;
+
+// Same slug as trajectory_slug() in the transform: "provider/name" -> "provider--name"
+export function trajectoryUrl(model: string): string {
+  return `/data/trajectories/${model.split('/').join('--')}.json`;
+}
+
+const shards = new Map<string, Promise<TrajectoryIndex>>();
+
+export function fetchTrajectories(model: string): Promise<TrajectoryIndex> {
+  let pending = shards.get(model);
+  if (!pending) {
+    pending = fetch(trajectoryUrl(model))
+      .then((res) => (res.ok ? res.json() : { model, examples: [] }))
+      .then((payload: unknown) => {
+        const shard = resolveContent<TrajectoryShard>(decodeInterned<unknown>(payload));
+        const byId: TrajectoryIndex = {};
+        shard.examples.forEach((t) => {
+          byId[t.example_id] = t;
+        });
+        return byId;
+      })
+      .catch(() => {
+        // Let a later call retry instead of caching the failure
+        shards.delete(model);
+        return {};
+      });
+    shards.set(model, pending);
+  }
+  return pending;
+}
+
+// Transcripts of several models at once, merged into one index (example ids
+// are unique across models)
+export function fetchTrajectoriesFor(models: string[]): Promise<TrajectoryIndex> {
+  return Promise.all(models.map(fetchTrajectories)).then((indexes) =>
+    Object.assign({}, ...indexes)
+  );
+}